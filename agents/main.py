@@ -1,11 +1,13 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
+import asyncio
 import logging
 import os
+import gzip
 from .shared.data_expert import DataExpert
 
 # Import Agents
@@ -43,6 +45,28 @@ app.add_middleware(
 
 # Mount Static Files (Frontend)
 static_path = os.path.join(os.path.dirname(__file__), "static")
+
+# Compressed reports: NEXUS-7 writes report_<id>.html.gz / brief_<id>.html.gz; serve them under the .html URL.
+# Must be registered before the /dashboard mount so it takes precedence.
+@app.get("/dashboard/reports/{filename}", include_in_schema=False)
+async def serve_report_file(filename: str, request: Request):
+    reports_dir = os.path.join(static_path, "reports")
+    filepath = os.path.join(reports_dir, os.path.basename(filename))
+    if os.path.isfile(filepath):
+        return FileResponse(filepath)
+    gz_path = filepath + ".gz"
+    if not os.path.isfile(gz_path):
+        raise HTTPException(status_code=404, detail="Report not found")
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return FileResponse(gz_path, media_type="text/html", headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    # Clients without gzip: inflate in chunks so the full document is never held in memory
+    return StreamingResponse(_iter_gunzip(gz_path), media_type="text/html")
+
+def _iter_gunzip(path: str, chunk_size: int = 64 * 1024):
+    with gzip.open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
 app.mount("/dashboard", StaticFiles(directory=static_path, html=True), name="static")
 
 # Request Models
@@ -125,11 +149,11 @@ async def list_firebase_reports():
         logger.error(f"Error fetching Firebase reports: {e}")
         # Fallback: list local HTML files
         import glob
-        reports_path = os.path.join(static_path, "reports", "report_*.html")
+        reports_path = os.path.join(static_path, "reports", "report_*.html*")
         files = glob.glob(reports_path)
         reports = []
         for f in sorted(files, key=os.path.getmtime, reverse=True)[:50]:
-            filename = os.path.basename(f)
+            filename = os.path.basename(f).removesuffix(".gz")
             report_id = filename.replace("report_", "").replace(".html", "")
             reports.append({
                 "id": report_id,
@@ -272,8 +296,16 @@ async def run_folder_workflow(request: FolderIngestRequest):
             "guardian": guardian_audit
         }
         
+        # 8 + 10. ARCHITECT & INSPECTOR — ambos solo leen full_data: se generan en paralelo
+        # (el dossier se renderiza en un hilo mientras el blueprint corre en el loop)
         architect = Nexus7Architect()
-        report = await architect.generate_report_artifacts(full_data)
+        inspector = Nexus9Inspector()
+        report, blueprint_result = await asyncio.gather(
+            architect.generate_report_artifacts(full_data),
+            inspector.generate_blueprint(full_data),
+        )
+        if report.get("error"):
+            raise HTTPException(status_code=422, detail=f"Architect: {report['error']}")
         
         # 9. ARCHIVIST - Archive case for longitudinal studies
         archivist = Nexus8Archivist()
@@ -285,9 +317,6 @@ async def run_folder_workflow(request: FolderIngestRequest):
             verdict=strategy.get("dynamic_verdict", {}),
             metadata={"ingestion_mode": ingestion_mode, "files_count": len(ingested_ids)}
         )
-        # 10. INSPECTOR (BLUEPRINT)
-        inspector = Nexus9Inspector()
-        blueprint_result = await inspector.generate_blueprint(full_data)
         blueprint_url = blueprint_result["blueprint_url"]
         logger.info(f"[INSPECTOR] Blueprint generated: {blueprint_url}")
 
@@ -318,6 +347,9 @@ async def run_folder_workflow(request: FolderIngestRequest):
         }
 
 
+    except HTTPException:
+        # HTTPException ya tipadas (p. ej. 422 del Architect) llegan al cliente tal cual
+        raise
     except Exception as e:
         logger.error(f"Folder Workflow Failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -468,8 +500,9 @@ async def step_8_architect(payload: dict):
     full_data = payload.get("full_data") or payload
     
     architect = Nexus7Architect()
-    report = await architect.generate_report_artifacts(full_data)
-    return {"step": "architect", "data": report, "status": "success"}
+    # El cliente abre el dossier por pdf_url: no se devuelve el HTML completo en el JSON
+    report = await architect.generate_report_artifacts(full_data, include_html=False)
+    return {"step": "architect", "data": report, "status": "error" if report.get("error") else "success"}
 
 @app.post("/workflow/step/executive_brief")
 async def step_executive_brief(payload: dict):
@@ -578,8 +611,15 @@ async def run_full_cycle(request: IngestRequest):
             "senior_partner": summary
         }
         
+        # 8 + 10. ARCHITECT & INSPECTOR — independientes entre sí, se generan en paralelo
         architect = Nexus7Architect()
-        report = await architect.generate_report_artifacts(full_data)
+        inspector = Nexus9Inspector()
+        report, blueprint_result = await asyncio.gather(
+            architect.generate_report_artifacts(full_data),
+            inspector.generate_blueprint(full_data),
+        )
+        if report.get("error"):
+            raise HTTPException(status_code=422, detail=f"Architect: {report['error']}")
 
         # 9. ARCHIVIST (NEW)
         archivist = Nexus8Archivist()
@@ -592,9 +632,6 @@ async def run_full_cycle(request: IngestRequest):
             metadata={"ingestion_mode": "manual_entry", "files_count": 1}
         )
 
-        # 10. INSPECTOR (BLUEPRINT)
-        inspector = Nexus9Inspector()
-        blueprint_result = await inspector.generate_blueprint(full_data)
         blueprint_url = blueprint_result["blueprint_url"]
 
         return {
@@ -613,6 +650,9 @@ async def run_full_cycle(request: IngestRequest):
             },
             "steps_completed": ["Harvester", "Guardian", "Scout", "Integrator", "Strategist", "Mathematician", "Senior Partner", "Architect", "Archivist", "Inspector"]
         }
+    except HTTPException:
+        # HTTPException ya tipadas (p. ej. 422 del Architect) llegan al cliente tal cual
+        raise
     except Exception as e:
         logger.error(f"Workflow Failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
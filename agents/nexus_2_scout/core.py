@@ -17,6 +17,19 @@ from ..shared.google_trends import get_google_trends_data, extract_trend_keyword
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("NEXUS-2")
 
+_TRENDING_WORDS = ("viral", "crecimiento", "tendencia", "bolado", "hot")
+
+def _text_values(obj):
+    """Recorre un payload anidado (dict/list) y devuelve solo sus valores string."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _text_values(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            yield from _text_values(v)
+
 class Nexus2Scout:
     """
     NEXUS-2 Scout Agent - Market Intelligence
@@ -543,10 +556,12 @@ class Nexus2Scout:
         """
         Detecta si el interés social crece >20% mientras la oferta es vieja.
         """
-        is_trending = any(word in str(social_data).lower() for word in ["viral", "crecimiento", "tendencia", "bolado", "hot"])
-        velocity = str(social_data.get("tiktok_trends", ""))
+        # Solo los textos (sin claves ni repr del dict): "viral_elements" no debe contar como tendencia
+        social_blob = " ".join(_text_values(social_data)).lower()
+        is_trending = any(word in social_blob for word in _TRENDING_WORDS)
+        velocity = str(social_data.get("tiktok_trends", "")).lower()
         
-        if is_trending and ("vistas" in velocity.lower() or "millones" in velocity.lower()):
+        if is_trending and ("vistas" in velocity or "millones" in velocity):
             return {
                 "is_lightning": True,
                 "velocity_score": "ALTA (>25% interés social)",
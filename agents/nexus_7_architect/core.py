@@ -1,6 +1,21 @@
+import asyncio
 import logging
 import os
 import json
+import gzip
+import hashlib
+import math
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from html import escape as _esc
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from google.api_core import exceptions as gapi_exceptions, retry as gapi_retry
 from ..shared.utils import get_db, generate_id, timestamp_now, report_agent_activity
 from ..shared.nexus_rules import sanitize_product_name, validate_moat_for_low_tech
 
@@ -24,1030 +39,728 @@ def _clean_field(value, fallback: str = "Dato en validación") -> str:
         return fallback
     return val_str
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("NEXUS-7")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*", re.S)
 
-class Nexus7Architect:
-    task_description = "Synthesize all agent outputs into a premium HTML report"
-    def __init__(self):
-        self.db = get_db()
-        self.role = "NEXUS-7 (Architect)"
+def _md_bold(text) -> str:
+    """Escapa texto del LLM y convierte **negritas** markdown a <strong>."""
+    return _BOLD_RE.sub(r"<strong>\1</strong>", _esc(str(text or ""), quote=False))
 
-    @report_agent_activity
-    async def generate_report_artifacts(self, full_data: dict) -> dict:
-        """
-        Generates a premium, highly detailed HTML report.
-        Includes Scholar Audit, Stress Test, and Compliance Audit.
-        """
-        logger.info(f"[{self.role}] Generating Premium Detailed Report...")
-        
-        report_id = generate_id()
-        h_data = full_data.get("harvester", {})
-        s_data = full_data.get("scout", {})
-        i_data = full_data.get("integrator", {})
-        st_data = full_data.get("strategist", {})
-        m_data = full_data.get("mathematician", {})
-        p_data = full_data.get("senior_partner", {})
-        g_data = full_data.get("guardian", {})
-        gen_ctx = m_data.get("general_market_context", {})
-        
-        # Google Trends Data Extraction
-        gt_data = s_data.get("google_trends_raw", {})
-        gt_months = gt_data.get("months", [])
-        gt_series = gt_data.get("data", {})
-        
-        # v2.1 SAFETY GROUNDING: If live trends fail, simulate based on seasonality
-        if not gt_series:
-            sales_intel = s_data.get("sales_intelligence", {})
-            seasonality = sales_intel.get("seasonality", {})
-            monthly_demand = seasonality.get("monthly_demand", None)
-            if not monthly_demand:
-                # Generate flat simulated baseline instead of hardcoded values
-                import random
-                base = 70
-                months_es = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
-                             "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
-                monthly_demand = {m: max(40, base + random.randint(-10, 10)) for m in months_es}
-                logger.info(f"[{self.role}] Using simulated flat demand baseline (source: SIMULATED)")
-            gt_months = list(monthly_demand.keys())
-            
-            # v2.6: Build dynamic trend series from Scout keywords instead of generic label
-            scout_keywords = s_data.get("keywords", [])
-            anchor_text = s_data.get("scout_anchor", "Mercado")
-            
-            if scout_keywords and len(scout_keywords) >= 2:
-                # Use first 3 real keywords from Scout data
-                base_vals = list(monthly_demand.values())
-                gt_series = {}
-                for i, kw_obj in enumerate(scout_keywords[:3]):
-                    kw_name = kw_obj.get("term", f"Keyword {i+1}") if isinstance(kw_obj, dict) else str(kw_obj)
-                    # Add slight variation per keyword
-                    variation = 1.0 - (i * 0.12)  # Each subsequent keyword trends slightly lower
-                    gt_series[kw_name] = [int(v * variation) for v in base_vals]
-            else:
-                # Fallback: Use anchor as a single descriptive series
-                anchor_short = anchor_text[:25] if anchor_text else "Interés General"
-                gt_series = {f"📈 {anchor_short}": list(monthly_demand.values())}
-            
-            logger.info(f"[Architect] Using simulated trends data with {len(gt_series)} keyword series.")
+# ═══════════════════════════════════════════════════════════════════
+# DOSSIER SHELL — <head>/CSS y cierre son estáticos: se construyen una vez
+# al importar; por reporte solo se formatea el <body> dinámico.
+# ═══════════════════════════════════════════════════════════════════
+_REPORT_HEAD = """<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <title>NEXUS-360 DOSSIER</title>
+    <!-- Chart.js se carga al final del body: precargarlo desde el head solapa la descarga con el parseo -->
+    <link rel="preconnect" href="https://cdn.jsdelivr.net">
+    <link rel="preload" as="script" href="https://cdn.jsdelivr.net/npm/chart.js">
+    <link rel="preload" as="script" href="https://cdn.jsdelivr.net/npm/chartjs-plugin-datalabels@2">
+    <link href="https://fonts.googleapis.com/css2?family=Merriweather:wght@400;700&family=Inter:wght@400;700&display=swap" rel="stylesheet">
+    <style>
+        :root { 
+            --primary: #16213a; 
+            --accent: #28529a; 
+            --lime: #84cc16;
+            --serif: 'Montserrat', sans-serif; 
+            --sans: 'Inter', system-ui, -apple-system, sans-serif; 
+        }
+        body { font-family: var(--sans); background: #f9fafb; color: #333333; padding: 40px; line-height: 1.6; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 60px; border-radius: 12px; box-shadow: 0 4px 20px rgba(0,0,0,0.05); }
+        .section-title { font-family: var(--serif); font-size: 1.4rem; color: var(--primary); margin-top: 50px; background: #f5f8fc; padding: 15px; border-radius: 8px; display: flex; justify-content: space-between; align-items: center; border-left: 5px solid var(--lime); }
+        .agent-badge { background: var(--accent); color: white; padding: 3px 10px; border-radius: 4px; font-size: 0.7rem; font-weight: 800; text-transform: uppercase; }
+        table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        th { text-align: left; background: #f8fafc; padding: 15px; border-bottom: 2px solid #e2e8f0; font-size: 0.75rem; text-transform: uppercase; color: var(--accent); }
+        td { padding: 15px; border-bottom: 1px solid #f1f5f9; }
+        .source-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(250px, 1fr)); gap: 15px; margin-top: 20px; }
+        .source-card { background: #ffffff; border: 1px solid #e2e8f0; border-radius: 12px; padding: 15px; transition: transform 0.2s; }
+        .source-card:hover { transform: translateY(-3px); border-color: var(--lime); }
+        .verdict-banner { background: linear-gradient(135deg, var(--primary) 0%, var(--accent) 100%); color: white; padding: 40px; border-radius: 12px; margin-top: 40px; }
+        /* Filas/tarjetas repetidas: estilos aquí en vez de inline en cada elemento */
+        .source-head { display: flex; justify-content: space-between; margin-bottom: 10px; }
+        .source-icon { font-size: 1.2rem; }
+        .source-ext { padding: 2px 8px; border-radius: 4px; font-size: 0.6rem; font-weight: 800; }
+        .source-name { font-weight: 700; font-size: 0.85rem; color: var(--primary); word-wrap: break-word; }
+        .source-summary { font-size: 0.7rem; color: #64748b; margin-top: 5px; line-height: 1.4; }
+        .gap-card { background: white; border: 1px solid #e2e8f0; padding: 25px; border-radius: 16px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.03); }
+        .gap-card-niche { font-size: 0.65rem; color: var(--accent); font-weight: 800; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 10px; }
+        .gap-card h4 { margin: 0 0 10px 0; color: var(--primary); font-family: var(--serif); }
+        .gap-card p { font-size: 0.85rem; color: #475569; line-height: 1.6; border-top: 1px solid #f1f5f9; padding-top: 15px; margin-top: 10px; }
+        .fba-card { background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: white; padding: 25px; border-radius: 16px; box-shadow: 0 10px 20px rgba(0,0,0,0.1); }
+        .fba-card-kicker { font-size: 0.65rem; color: #94a3b8; font-weight: 800; text-transform: uppercase; letter-spacing: 2px; margin-bottom: 15px; }
+        .fba-card-name { font-size: 1.3rem; font-weight: 900; margin-bottom: 20px; }
+        .fba-card-grid { display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 10px; text-align: center; border-top: 1px solid rgba(255,255,255,0.1); padding-top: 15px; }
+        .fba-label { font-size: 0.6rem; color: #94a3b8; }
+        .fba-value { font-size: 1rem; font-weight: 700; }
+        .bench-row { background: white; border: 1px solid #e2e8f0; padding: 12px; border-radius: 10px; display: flex; justify-content: space-between; align-items: center; margin-bottom: 6px; }
+        .bench-name { font-weight: 700; font-size: 0.75rem; color: #334155; }
+        .bench-meta { display: flex; gap: 10px; align-items: center; }
+        .bench-total { font-size: 0.75rem; color: #64748b; }
+        .bench-pct { font-size: 0.7rem; font-weight: 900; padding: 2px 6px; border-radius: 3px; }
+        .roadmap-step { display: flex; gap: 30px; margin-bottom: 25px; background: white; padding: 25px; border-radius: 12px; border: 1px solid #e2e8f0; position: relative; }
+        .roadmap-num { width: 40px; height: 40px; background: var(--primary); color: white; border-radius: 8px; display: flex; align-items: center; justify-content: center; font-weight: bold; flex-shrink: 0; }
+        .roadmap-step h4 { margin: 0 0 10px 0; color: var(--primary); }
+        .roadmap-step p { margin: 0; font-size: 0.9rem; color: #475569; }
+        .compliance-std { font-weight: 800; }
+        .compliance-status { padding: 4px 10px; border-radius: 4px; font-size: 0.65rem; font-weight: 900; }
+        .compliance-desc { font-size: 0.85rem; color: #475569; }
+        @media print { 
+            @page { size: A4 portrait; margin: 15mm 12mm; } 
+            * { -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }
+            body { padding: 0; background: white; font-size: 10pt; }
+            .container { box-shadow: none; padding: 0; max-width: 100%; } 
+            .section-title { page-break-after: avoid; margin-top: 20px; padding: 10px; font-size: 12pt; }
+            .page-break { page-break-before: always; }
+            .keep-together { page-break-inside: avoid; }
+            table { font-size: 8pt; } th, td { padding: 8px; }
+            canvas { max-height: 180px !important; }
+            .print-btn { display: none; }
+        }
+    </style>
+</head>
+<body>
+"""
 
-        # ═══════════════════════════════════════════════════════════════════
-        # POE ENHANCEMENT v3.0: Extract new detailed sections
-        # ═══════════════════════════════════════════════════════════════════
-        buyer_personas = s_data.get("buyer_personas", [])
-        reviews_analysis = s_data.get("reviews_analysis", {})
-        price_tiers = s_data.get("price_tiers", {})
-        amazon_fees = s_data.get("amazon_fees_structure", {})
-        
-        # ═══════════════════════════════════════════════════════════════════
-        # POE v4.0: SEARCH TERMS INTELLIGENCE (Traffic & Demand Data)
-        # Fuente oficial de intención de usuario → Keywords vs. Conversión
-        # ═══════════════════════════════════════════════════════════════════
-        st_intel = full_data.get("search_terms_data", {}) or s_data.get("search_terms_intel", {})
-        has_search_intel = st_intel.get("has_search_data", False)
-        st_terms = st_intel.get("terms", [])[:15]  # Top 15 keywords
-        st_total_volume = st_intel.get("total_search_volume", 0)
-        st_avg_conversion = st_intel.get("avg_conversion_rate", 0.0)
-        st_top_keywords = st_intel.get("top_keywords", [])
-        st_source_file = st_intel.get("source_file", "NicheDetailsSearchTermsTab")
-        
-        # Build Search Terms & Traffic Section HTML (combines ProductsTab + SearchTermsTab)
-        # Extract product traffic data from top_10_products
-        traffic_products = s_data.get("top_10_products", [])
-        has_product_traffic = any(
-            p.get("sales", 0) > 0 or p.get("click_share", 0) > 0 or p.get("revenue", 0) > 0 
-            for p in traffic_products
-        )
-        
-        search_terms_section_html = ""
-        if has_search_intel or has_product_traffic:
-            # ── Aggregate product traffic KPIs ──
-            total_revenue = sum(p.get("revenue", 0) for p in traffic_products if isinstance(p.get("revenue"), (int, float)))
-            total_sales = sum(p.get("sales", 0) for p in traffic_products if isinstance(p.get("sales"), (int, float)))
-            click_shares = [p.get("click_share", 0) for p in traffic_products if isinstance(p.get("click_share"), (int, float)) and p.get("click_share", 0) > 0]
-            avg_product_click_share = round(sum(click_shares) / len(click_shares), 1) if click_shares else 0
-            
-            # Volume display
-            if has_search_intel and st_terms:
-                top_kw_name = st_terms[0].get("term", "N/A")
-                top_kw_vol = st_terms[0].get("volume", 0)
-                if st_total_volume >= 1_000_000:
-                    vol_display = f"{st_total_volume/1_000_000:.1f}M"
-                elif st_total_volume >= 1_000:
-                    vol_display = f"{st_total_volume/1_000:.0f}K"
-                else:
-                    vol_display = str(st_total_volume)
-            else:
-                top_kw_name = "N/A"
-                top_kw_vol = 0
-                vol_display = "—"
-            
-            # Revenue display
-            if total_revenue >= 1_000_000:
-                rev_display = f"${total_revenue/1_000_000:.1f}M"
-            elif total_revenue >= 1_000:
-                rev_display = f"${total_revenue/1_000:.0f}K"
-            elif total_revenue > 0:
-                rev_display = f"${total_revenue:,.0f}"
-            else:
-                rev_display = "—"
-            
-            # Sales display
-            if total_sales >= 1_000:
-                sales_display = f"{total_sales/1_000:.1f}K"
-            elif total_sales > 0:
-                sales_display = f"{total_sales:,}"
-            else:
-                sales_display = "—"
-            
-            # ── Build Product Traffic Rows ──
-            product_traffic_rows = ""
-            if has_product_traffic:
-                sorted_products = sorted(traffic_products, key=lambda x: x.get("revenue", 0) or x.get("sales", 0) or 0, reverse=True)
-                for i, p in enumerate(sorted_products[:15]):
-                    p_name = p.get("name", p.get("title", f"Product {i}"))[:55]
-                    p_asin = p.get("asin", "N/A")
-                    p_sales = p.get("sales", 0)
-                    p_revenue = p.get("revenue", 0)
-                    p_click = p.get("click_share", 0)
-                    p_price = p.get("price", 0)
-                    p_fees = p.get("fees", 0)
-                    p_brand = p.get("brand", "N/A")
-                    p_fulfillment = str(p.get("fulfillment", "N/A")).upper()
-                    p_country = str(p.get("seller_country", "N/A")).upper()
-                    p_rev_vel = int(p.get("review_velocity", 0))
-                    p_weight = p.get("weight", "N/A")
-                    p_sponsored = str(p.get("sponsored", "No"))
-                    p_seller_age = int(p.get("seller_age_months", 0))
-                    p_recent = int(p.get("recent_purchases", 0))
-                    
-                    # Revenue display
-                    if isinstance(p_revenue, (int, float)) and p_revenue >= 1000:
-                        p_rev_str = f"${p_revenue/1000:.1f}K"
-                    elif isinstance(p_revenue, (int, float)) and p_revenue > 0:
-                        p_rev_str = f"${p_revenue:,.0f}"
-                    else:
-                        p_rev_str = "—"
-                    
-                    # Sales display
-                    p_sales_str = f"{p_sales:,}" if isinstance(p_sales, (int, float)) and p_sales > 0 else "—"
-                    
-                    # Click share bar
-                    p_click_bar = min(100, p_click * 3) if isinstance(p_click, (int, float)) else 0
-                    p_click_str = f"{p_click:.1f}%" if isinstance(p_click, (int, float)) and p_click > 0 else "—"
-                    
-                    # Fees display
-                    p_fees_str = f"${p_fees:.2f}" if isinstance(p_fees, (int, float)) and p_fees > 0 else "—"
-                    
-                    # Fulfillment badge
-                    if "AMZ" in p_fulfillment:
-                        pf_bg = "#1e3a8a"; pf_label = "AMZ"
-                    elif "FBA" in p_fulfillment:
-                        pf_bg = "#059669"; pf_label = "FBA"
-                    elif "FBM" in p_fulfillment:
-                        pf_bg = "#d97706"; pf_label = "FBM"
-                    else:
-                        pf_bg = "#94a3b8"; pf_label = "—"
-                    
-                    # Country flag
-                    if "CN" in p_country:
-                        pf_flag = "🇨🇳"
-                    elif "US" in p_country:
-                        pf_flag = "🇺🇸"
-                    elif "AMZ" in p_country:
-                        pf_flag = "🏢"
-                    else:
-                        pf_flag = "🌐"
-                    
-                    # PPC badge
-                    ppc_html = ""
-                    if p_sponsored and p_sponsored not in ("No", "N/A", "", "nan"):
-                        ppc_html = '<span style="background:#ef4444; color:white; padding:1px 4px; border-radius:3px; font-size:0.45rem; font-weight:800;">PPC</span>'
-                    
-                    # Review velocity
-                    vel_str = f"{p_rev_vel}/mo" if p_rev_vel > 0 else "—"
-                    vel_color = "#059669" if p_rev_vel >= 100 else ("#d97706" if p_rev_vel >= 30 else "#64748b")
-                    
-                    product_traffic_rows += f'''
-                    <tr style="border-bottom:1px solid #f1f5f9;">
-                        <td style="padding:10px 12px; font-size:0.8rem;">
-                            <div style="display:flex; align-items:center; gap:8px;">
-                                <span style="background:#1e3a8a; color:white; width:22px; height:22px; border-radius:6px; display:flex; align-items:center; justify-content:center; font-size:0.6rem; font-weight:800;">{i+1}</span>
-                                <div>
-                                    <div style="font-weight:600; color:var(--primary); font-size:0.75rem;">{p_name}</div>
-                                    <div style="display:flex; gap:4px; align-items:center; margin-top:3px; flex-wrap:wrap;">
-                                        <span style="font-family:monospace; font-size:0.55rem; color:#64748b;">{p_asin}</span>
-                                        <span style="font-size:0.55rem; font-weight:700; color:#334155;">{p_brand}</span>
-                                        <span style="font-size:0.5rem;">{pf_flag}</span>
-                                        <span style="background:{pf_bg}; color:white; padding:0px 4px; border-radius:2px; font-size:0.45rem; font-weight:800;">{pf_label}</span>
-                                        {ppc_html}
-                                    </div>
-                                </div>
-                            </div>
-                        </td>
-                        <td style="padding:10px 8px; font-family:monospace; font-weight:700; color:#0f172a; font-size:0.85rem;">${p_price:.2f}</td>
-                        <td style="padding:10px 8px; font-family:monospace; font-weight:700; color:#0f172a; font-size:0.85rem;">{p_sales_str}</td>
-                        <td style="padding:10px 8px; font-family:monospace; font-weight:700; color:#059669; font-size:0.85rem;">{p_rev_str}</td>
-                        <td style="padding:10px 8px;">
-                            <div style="display:flex; align-items:center; gap:6px;">
-                                <div style="flex:1; background:#e2e8f0; border-radius:4px; height:8px; max-width:50px;">
-                                    <div style="width:{p_click_bar}%; background:linear-gradient(90deg, #f59e0b, #ef4444); height:100%; border-radius:4px;"></div>
-                                </div>
-                                <span style="font-size:0.7rem; color:#475569; font-weight:600;">{p_click_str}</span>
-                            </div>
-                        </td>
-                        <td style="padding:10px 8px; font-family:monospace; font-size:0.75rem; color:{vel_color}; font-weight:600;">{vel_str}</td>
-                        <td style="padding:10px 8px; font-family:monospace; font-size:0.75rem; color:#64748b;">{p_fees_str}</td>
-                    </tr>'''
-            
-            # ── Build Keyword Rows (existing logic) ──
-            kw_rows_html = ""
-            if has_search_intel and st_terms:
-                for i, term in enumerate(st_terms):
-                    t_name = term.get("term", "N/A")
-                    t_vol = term.get("volume", 0)
-                    t_growth = term.get("growth_90d", "N/A")
-                    t_click = term.get("click_share", 0)
-                    t_conv = term.get("conversion_rate", 0)
-                    
-                    growth_str = str(t_growth)
-                    if isinstance(t_growth, (int, float)):
-                        growth_color = "#166534" if t_growth > 0 else "#dc2626"
-                        growth_str = f"+{t_growth}%" if t_growth > 0 else f"{t_growth}%"
-                    else:
-                        growth_color = "#64748b"
-                    
-                    if isinstance(t_conv, (int, float)):
-                        conv_color = "#166534" if t_conv >= 15 else ("#f59e0b" if t_conv >= 8 else "#dc2626")
-                        conv_str = f"{t_conv:.1f}%"
-                    else:
-                        conv_color = "#64748b"
-                        conv_str = str(t_conv)
-                    
-                    click_bar_w = min(100, t_click * 3) if isinstance(t_click, (int, float)) else 10
-                    t_vol_display = f"{t_vol/1000:.1f}K" if isinstance(t_vol, (int, float)) and t_vol >= 1000 else str(t_vol)
-                    
-                    kw_rows_html += f'''
-                    <tr style="border-bottom:1px solid #f1f5f9;">
-                        <td style="padding:10px 12px; font-weight:600; color:var(--primary); font-size:0.85rem;">
-                            <div style="display:flex; align-items:center; gap:8px;">
-                                <span style="background:#6366f1; color:white; width:22px; height:22px; border-radius:6px; display:flex; align-items:center; justify-content:center; font-size:0.6rem; font-weight:800;">{i+1}</span>
-                                {t_name}
-                            </div>
-                        </td>
-                        <td style="padding:10px 12px; font-family:monospace; font-weight:700; color:#0f172a; font-size:0.9rem;">{t_vol_display}</td>
-                        <td style="padding:10px 12px;"><span style="color:{growth_color}; font-weight:700; font-size:0.8rem;">{growth_str}</span></td>
-                        <td style="padding:10px 12px;">
-                            <div style="display:flex; align-items:center; gap:8px;">
-                                <div style="flex:1; background:#e2e8f0; border-radius:4px; height:8px; max-width:80px;">
-                                    <div style="width:{click_bar_w}%; background:linear-gradient(90deg, #3b82f6, #6366f1); height:100%; border-radius:4px;"></div>
-                                </div>
-                                <span style="font-size:0.75rem; color:#475569; font-weight:600;">{t_click}%</span>
-                            </div>
-                        </td>
-                        <td style="padding:10px 12px; text-align:center;"><span style="background:{'#dcfce7' if conv_color == '#166534' else '#fef9c3' if conv_color == '#f59e0b' else '#fee2e2'}; color:{conv_color}; padding:3px 10px; border-radius:8px; font-size:0.75rem; font-weight:700;">{conv_str}</span></td>
-                    </tr>'''
-            
-            # ── Opportunity detection ──
-            opp_section_html = ""
-            if has_search_intel and st_terms:
-                opp_terms = [t for t in st_terms if isinstance(t.get("conversion_rate"), (int, float)) and t["conversion_rate"] >= 15 and isinstance(t.get("volume"), (int, float)) and t["volume"] < st_total_volume * 0.1]
-                if opp_terms:
-                    opp_chips = ""
-                    for ot in opp_terms[:3]:
-                        opp_chips += f'<span style="background:#ecfdf5; color:#065f46; padding:4px 12px; border-radius:8px; font-size:0.75rem; font-weight:600; margin:3px;">🎯 {ot["term"]} ({ot["conversion_rate"]:.1f}% conv)</span>'
-                    opp_section_html = f"""<div style="background:linear-gradient(135deg, #ecfdf5 0%, #f0fdf4 100%); border:2px solid #86efac; padding:20px; border-radius:16px; margin-bottom:20px;">
-                        <div style="display:flex; align-items:center; gap:10px; margin-bottom:12px;">
-                            <span style="font-size:1.2rem;">💡</span>
-                            <span style="font-weight:700; color:#065f46; font-size:0.9rem;">Oportunidades de Alta Conversión Detectadas</span>
-                        </div>
-                        <div style="font-size:0.8rem; color:#064e3b; margin-bottom:12px;">Keywords con conversión ≥15% representan oportunidades de nicho con demanda verificada:</div>
-                        <div style="display:flex; flex-wrap:wrap; gap:6px;">{opp_chips}</div>
-                    </div>"""
-            
-            # ── Build demand vs supply cross-reference ──
-            cross_ref_html = ""
-            if has_search_intel and has_product_traffic and st_total_volume > 0 and total_sales > 0:
-                demand_supply_ratio = round(st_total_volume / max(total_sales, 1), 1)
-                if demand_supply_ratio > 5:
-                    ds_verdict = "🟢 Alta Demanda Insatisfecha"
-                    ds_color = "#059669"
-                    ds_hint = "El volumen de búsqueda supera ampliamente las ventas actuales → oportunidad de captura."
-                elif demand_supply_ratio > 2:
-                    ds_verdict = "🟡 Demanda Moderada"
-                    ds_color = "#d97706"
-                    ds_hint = "Hay espacio en el mercado, pero la competencia ya captura una parte significativa."
-                else:
-                    ds_verdict = "🔴 Mercado Saturado"
-                    ds_color = "#dc2626"
-                    ds_hint = "Las ventas están cerca del techo de búsqueda → diferenciación crítica para entrar."
-                
-                cross_ref_html = f"""
-                <div style="background:linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%); border:2px solid #e2e8f0; padding:20px; border-radius:16px; margin-bottom:20px;">
-                    <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px;">
-                        <div style="display:flex; align-items:center; gap:10px;">
-                            <span style="font-size:1.3rem;">⚡</span>
-                            <span style="font-weight:700; color:var(--primary); font-size:0.9rem;">Cruce Demanda vs. Oferta (Keywords → Ventas)</span>
-                        </div>
-                        <span style="color:{ds_color}; font-weight:800; font-size:0.85rem;">{ds_verdict}</span>
-                    </div>
-                    <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:15px;">
-                        <div style="text-align:center; padding:12px; background:white; border-radius:10px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase;">BÚSQUEDAS/MES</div>
-                            <div style="font-size:1.4rem; font-weight:800; color:#6366f1;">{vol_display}</div>
-                        </div>
-                        <div style="text-align:center; padding:12px; background:white; border-radius:10px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase;">UNIDADES VENDIDAS/MES</div>
-                            <div style="font-size:1.4rem; font-weight:800; color:#059669;">{sales_display}</div>
-                        </div>
-                        <div style="text-align:center; padding:12px; background:white; border-radius:10px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase;">RATIO DEMANDA/OFERTA</div>
-                            <div style="font-size:1.4rem; font-weight:800; color:{ds_color};">{demand_supply_ratio}x</div>
-                        </div>
-                    </div>
-                    <div style="font-size:0.75rem; color:#475569; margin-top:12px; padding:10px; background:white; border-radius:8px; border-left:3px solid {ds_color};">{ds_hint}</div>
-                </div>"""
-            
-            # ── Build Logistics & Seller Intelligence Card ──
-            seller_intel_html = ""
-            if has_product_traffic and len(traffic_products) > 0:
-                # Seller origin distribution
-                origins = {"CN": 0, "US": 0, "AMZ": 0, "Other": 0}
-                ful_dist = {"AMZ": 0, "FBA": 0, "FBM": 0, "Other": 0}
-                total_weight = 0
-                weight_count = 0
-                total_seller_age = 0
-                age_count = 0
-                ppc_count = 0
-                total_images = 0
-                img_count = 0
-                for tp in traffic_products:
-                    sc = str(tp.get("seller_country", "N/A")).upper()
-                    sn = str(tp.get("seller_name", "")).upper()
-                    if "CN" in sc:
-                        origins["CN"] += 1
-                    elif "US" in sc:
-                        origins["US"] += 1
-                    elif "AMZ" in sc or "AMAZON" in sn:
-                        origins["AMZ"] += 1
-                    else:
-                        origins["Other"] += 1
-                    
-                    fl = str(tp.get("fulfillment", "N/A")).upper()
-                    if "AMZ" in fl:
-                        ful_dist["AMZ"] += 1
-                    elif "FBA" in fl:
-                        ful_dist["FBA"] += 1
-                    elif "FBM" in fl:
-                        ful_dist["FBM"] += 1
-                    else:
-                        ful_dist["Other"] += 1
-                    
-                    w = tp.get("weight_lbs", 0)
-                    if isinstance(w, (int, float)) and w > 0:
-                        total_weight += w
-                        weight_count += 1
-                    
-                    sa = int(tp.get("seller_age_months", 0))
-                    if sa > 0:
-                        total_seller_age += sa
-                        age_count += 1
-                    
-                    sp = str(tp.get("sponsored", "No"))
-                    if sp and sp not in ("No", "N/A", "", "nan"):
-                        ppc_count += 1
-                    
-                    im = int(tp.get("images_count", 0))
-                    if im > 0:
-                        total_images += im
-                        img_count += 1
-                
-                n_prods = len(traffic_products)
-                avg_weight = round(total_weight / weight_count, 2) if weight_count > 0 else 0
-                avg_age = round(total_seller_age / age_count) if age_count > 0 else 0
-                ppc_pct = round((ppc_count / n_prods) * 100) if n_prods > 0 else 0
-                avg_imgs = round(total_images / img_count, 1) if img_count > 0 else 0
-                
-                # Maturity verdict
-                if avg_age >= 48:
-                    mat_label = "Mercado Maduro"
-                    mat_color = "#059669"
-                elif avg_age >= 24:
-                    mat_label = "En Crecimiento"
-                    mat_color = "#d97706"
-                else:
-                    mat_label = "Mercado Joven"
-                    mat_color = "#3b82f6"
-                
-                # Origin bars
-                origin_items = ""
-                for okey, ocount in sorted(origins.items(), key=lambda x: x[1], reverse=True):
-                    if ocount == 0:
-                        continue
-                    opct = round((ocount / n_prods) * 100)
-                    oflags = {"CN": "🇨🇳", "US": "🇺🇸", "AMZ": "🏢", "Other": "🌐"}
-                    ocolors = {"CN": "#ef4444", "US": "#3b82f6", "AMZ": "#1e3a8a", "Other": "#94a3b8"}
-                    origin_items += f'<div style="display:flex; align-items:center; gap:6px; margin-bottom:4px;"><span style="font-size:0.7rem;">{oflags.get(okey, "🌐")}</span><span style="font-size:0.65rem; font-weight:700; min-width:35px;">{okey}</span><div style="flex:1; background:#e2e8f0; border-radius:3px; height:10px;"><div style="width:{opct}%; background:{ocolors.get(okey, "#94a3b8")}; height:100%; border-radius:3px;"></div></div><span style="font-size:0.65rem; font-weight:700; color:#334155;">{opct}%</span></div>'
-                
-                # Fulfillment distribution
-                ful_items = ""
-                for fkey, fcount in sorted(ful_dist.items(), key=lambda x: x[1], reverse=True):
-                    if fcount == 0:
-                        continue
-                    fpct = round((fcount / n_prods) * 100)
-                    fcolors = {"AMZ": "#1e3a8a", "FBA": "#059669", "FBM": "#d97706", "Other": "#94a3b8"}
-                    ful_items += f'<div style="display:flex; align-items:center; gap:6px; margin-bottom:4px;"><span style="background:{fcolors.get(fkey, "#94a3b8")}; color:white; padding:1px 6px; border-radius:3px; font-size:0.55rem; font-weight:800; min-width:30px; text-align:center;">{fkey}</span><div style="flex:1; background:#e2e8f0; border-radius:3px; height:10px;"><div style="width:{fpct}%; background:{fcolors.get(fkey, "#94a3b8")}; height:100%; border-radius:3px;"></div></div><span style="font-size:0.65rem; font-weight:700; color:#334155;">{fpct}%</span></div>'
-                
-                seller_intel_html = f"""
-                <div style="background:linear-gradient(135deg, #faf5ff 0%, #ede9fe 100%); border:2px solid #c4b5fd; padding:20px; border-radius:16px; margin-bottom:20px;">
-                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
-                        <span style="font-size:1.3rem;">🏭</span>
-                        <span style="font-weight:700; color:#5b21b6; font-size:0.9rem;">Logistics & Seller Intelligence</span>
-                        <span style="background:#ede9fe; color:#7c3aed; padding:2px 8px; border-radius:8px; font-size:0.55rem; font-weight:800;">H10 Deep Data · {n_prods} productos</span>
-                    </div>
-                    <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:15px;">
-                        <div style="background:white; padding:14px; border-radius:12px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">🌍 Origen Sellers</div>
-                            {origin_items}
-                        </div>
-                        <div style="background:white; padding:14px; border-radius:12px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">📦 Fulfillment</div>
-                            {ful_items}
-                        </div>
-                        <div style="background:white; padding:14px; border-radius:12px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">📊 Métricas Clave</div>
-                            <div style="margin-bottom:6px;"><span style="font-size:0.6rem; color:#64748b;">Peso Prom:</span> <span style="font-weight:700; font-size:0.8rem; color:#334155;">{avg_weight} lbs</span></div>
-                            <div style="margin-bottom:6px;"><span style="font-size:0.6rem; color:#64748b;">Seller Age Prom:</span> <span style="font-weight:700; font-size:0.8rem; color:{mat_color};">{avg_age} meses</span> <span style="font-size:0.55rem; color:{mat_color};">({mat_label})</span></div>
-                            <div style="margin-bottom:6px;"><span style="font-size:0.6rem; color:#64748b;">PPC Competition:</span> <span style="font-weight:700; font-size:0.8rem; color:{'#ef4444' if ppc_pct > 40 else '#d97706' if ppc_pct > 20 else '#059669'};">{ppc_pct}%</span> <span style="font-size:0.55rem; color:#64748b;">patrocinados</span></div>
-                            <div><span style="font-size:0.6rem; color:#64748b;">Imgs/Listing Prom:</span> <span style="font-weight:700; font-size:0.8rem; color:#334155;">{avg_imgs}</span></div>
-                        </div>
-                    </div>
-                </div>"""
+_REPORT_TAIL = """
+</body>
+</html>"""
+
+# ═══════════════════════════════════════════════════════════════════
+# DOSSIER — cuerpo del documento, parseado una vez al importar.
+# _render_report solo prepara el contexto (secciones ya renderizadas/escapadas).
+# ═══════════════════════════════════════════════════════════════════
+_TRAFFIC_SEO_CHIP = '<span style="background:#059669; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">II-B. Traffic & SEO</span>'
+_REPORT_BODY_TPL = Template("""    <!-- Print/PDF Button -->
+    <button class="print-btn" onclick="window.print()" style="position:fixed; top:20px; right:20px; background:var(--accent); color:white; border:none; padding:12px 24px; border-radius:8px; font-weight:700; cursor:pointer; box-shadow:0 4px 12px rgba(0,0,0,0.15); z-index:1000;">📄 Guardar PDF</button>
+    
+    <div class="container">
+        <header style="border-bottom: 2px solid #f1f5f9; padding-bottom: 30px; margin-bottom: 40px; display: flex; justify-content: space-between; align-items: flex-end;">
+            <div><span style="color:var(--accent); font-weight:bold; letter-spacing:2px;">NEXUS-360 // $report_id</span><h1>$niche_title</h1></div>
+            <div style="text-align:right;"><div style="color:#b91c1c; font-weight:bold;">CONFIDENCIAL</div><div style="font-size:0.8rem; color:#64748b;">GÉNESIS: $genesis_date</div></div>
+        </header>
+
+        <!-- SECTION: Quick Navigation Index -->
+        <div class="section-container" style="background:linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%); padding:20px; margin-bottom:30px;">
+            <div style="display:flex; justify-content:space-between; align-items:center; flex-wrap:wrap; gap:10px;">
+                <div style="font-size:0.7rem; color:#64748b; font-weight:700;">📋 TABLA DE CONTENIDO</div>
+                <div style="display:flex; gap:8px; flex-wrap:wrap;">
+                    <span style="background:#6366f1; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">I. Veredicto</span>
+                    <span style="background:#3b82f6; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">II. Competencia</span>
+                    $traffic_seo_chip
+                    <span style="background:#22c55e; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">III. Consumidor</span>
+                    <span style="background:#f59e0b; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">IV. Finanzas</span>
+                    <span style="background:#ef4444; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">V. Riesgos</span>
+                </div>
+            </div>
+        </div>
+
+        <!-- SECTION II: Análisis Competitivo (consolidado) -->
+        <div class="page-break section-container">
+            <h2 class="section-title">II. Análisis Competitivo & Brechas <span class="agent-badge">Scout + Strategist</span></h2>
+            <table><thead><tr><th>Rank</th><th>Producto</th><th>Precio</th><th>Rating</th><th>Fortaleza</th><th>Debilidad</th><th>Oportunidad</th></tr></thead><tbody>$top_10_rows</tbody></table>
+        </div>
+
+        $search_terms_section_html
+
+        <!-- SECTION III: Insights del Consumidor (consolidado) -->
+        <div class="page-break section-container">
+            <h2 class="section-title">III. Insights del Consumidor <span class="agent-badge">Consumer Intelligence</span></h2>
+            <h4 style="margin:0 0 15px 0; color:var(--primary);">📱 Social Listening & Tendencias</h4>
+            $sl_html
+        </div>
+
+        <!-- SECTION IV: Unit Economics (consolidado) -->
+        <div class="page-break section-container">
+            <h2 class="section-title">IV. Unit Economics & Viabilidad <span class="agent-badge">Mathematician</span></h2>
+            <h4 style="margin:0 0 15px 0; color:var(--primary);">📊 Estacionalidad & Demanda</h4>
+            $sales_section_html
+        </div>
+
+            <!-- Financial Stress Test -->
+            <h4 style="margin:30px 0 15px 0; color:var(--primary);">💰 Stress Test Financiero</h4>
+            $amz_context_html
+            <table><thead><tr><th>Escenario</th><th>MSRP</th><th>Landed</th><th>Net %</th><th>BEQ</th><th>Payback</th><th>Status</th><th>Notas</th></tr></thead><tbody>$math_table_rows</tbody></table>
+        </div>
+
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <!-- APÉNDICE: Fuentes, Metodología & Senior Partner                     -->
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <div class="page-break section-container">
+            <h2 class="section-title">📎 Apéndice: Fuentes & Metodología <span class="agent-badge">Harvester + Consultancy</span></h2>
             
-            # ── Build Demographic & Niche Profile Card ──
-            demographic_profile_html = ""
-            na = s_data.get("niche_analytics", {})
-            if na and na.get("demographics"):
-                demo = na.get("demographics", {})
-                segs = demo.get("segments", {})
-                dom_seg = demo.get("dominant_segment", "N/A")
-                cls_rate = demo.get("classification_rate", 0)
+            <!-- Sources Grid -->
+            <h4 style="margin:0 0 15px 0; color:var(--primary);">📁 Fuentes de Datos Analizadas</h4>
+            <div class="source-grid">$source_cards_html</div>
+            
+            <!-- Senior Partner Summary -->
+            <h4 style="margin:30px 0 15px 0; color:var(--primary);">👔 Informe del Senior Partner</h4>
+            <div style="background:#f1f5f9; padding:40px; border-radius:12px;">$formatted_summary</div>
+            
+            <!-- Strategic Grid (antes en Brechas) -->
+            <h4 style="margin:30px 0 15px 0; color:var(--primary);">🎯 Propuestas Estratégicas</h4>
+            <div style="display:grid; grid-template-columns: 1fr 1fr; gap:20px;">$strategist_grid_html</div>
+        </div>
+
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <!-- SECTION I: VEREDICTO EJECUTIVO (Ahora es lo primero)                -->
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <div class="section-container" style="margin-top:0;">
+            <!-- Main Verdict Banner -->
+            <div style="background: linear-gradient(135deg, #0f172a 0%, #1e3a8a 50%, #3730a3 100%); color: white; padding: 50px; border-radius: 16px; position:relative; overflow:hidden;">
+                <div style="position:absolute; top:0; right:0; width:200px; height:200px; background:rgba(255,255,255,0.05); border-radius:50%; transform:translate(30%, -30%);"></div>
+                <div style="position:absolute; bottom:0; left:0; width:150px; height:150px; background:rgba(255,255,255,0.03); border-radius:50%; transform:translate(-30%, 30%);"></div>
                 
-                seg_emojis = {"Infant": "🍼", "Toddler": "🧒", "Preschool": "📖", "Elementary": "📚", "Tween": "🎮", "Teen": "🧑", "Adult": "👔", "Family": "👨‍👩‍👧‍👦", "Unspecified": "❓"}
-                seg_colors = {"Infant": "#f472b6", "Toddler": "#fb923c", "Preschool": "#a78bfa", "Elementary": "#60a5fa", "Tween": "#34d399", "Teen": "#fbbf24", "Adult": "#6b7280", "Family": "#3b82f6", "Unspecified": "#94a3b8"}
+                <span style="letter-spacing:3px; font-weight:bold; font-size:0.75rem; color:#60a5fa; text-transform:uppercase;">🎯 VEREDICTO NEXUS</span>
+                <h2 style="font-family:var(--serif); margin:15px 0; font-size:2.2rem; line-height:1.2;">$verdict_title</h2>
+                <p style="font-size:1.1rem; opacity:0.9; max-width:800px; line-height:1.6;">$verdict_text</p>
+            </div>
+            
+            <!-- Propuesta Concreta Grid -->
+            <div style="display:grid; grid-template-columns: repeat(3, 1fr); gap:20px; margin-top:25px;">
                 
-                # Build segment bars
-                seg_bars = ""
-                total_p = sum(v.get("count", 0) for v in segs.values())
-                for seg_name, seg_data in sorted(segs.items(), key=lambda x: x[1].get("count", 0), reverse=True):
-                    if seg_data.get("count", 0) == 0:
-                        continue
-                    pct = seg_data.get("pct", 0)
-                    emoji = seg_emojis.get(seg_name, "📊")
-                    color = seg_colors.get(seg_name, "#64748b")
-                    is_dom = " ⭐" if seg_name == dom_seg else ""
-                    seg_bars += f'<div style="display:flex; align-items:center; gap:6px; margin-bottom:5px;"><span style="font-size:0.8rem; min-width:20px;">{emoji}</span><span style="font-size:0.6rem; font-weight:700; min-width:70px; color:#334155;">{seg_name}{is_dom}</span><div style="flex:1; background:#e2e8f0; border-radius:4px; height:12px;"><div style="width:{pct}%; background:{color}; height:100%; border-radius:4px; transition:width 0.3s;"></div></div><span style="font-size:0.65rem; font-weight:700; color:#334155; min-width:35px; text-align:right;">{pct}%</span></div>'
+                <!-- Producto Propuesto -->
+                <div style="background:linear-gradient(135deg, #f0fdf4 0%, #dcfce7 100%); border:2px solid #22c55e; border-radius:16px; padding:25px;">
+                    <div style="font-size:0.7rem; color:#15803d; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:10px;">📦 PRODUCTO PROPUESTO</div>
+                    <div style="font-size:1.3rem; font-weight:800; color:#166534; margin-bottom:15px;">$product_name</div>
+                    <div style="font-size:0.85rem; color:#166534; line-height:1.5;">$product_concept</div>
+                    <div style="margin-top:15px; padding-top:15px; border-top:1px dashed #22c55e;">
+                        <div style="font-size:0.7rem; color:#15803d; font-weight:700;">🏷️ POSICIONAMIENTO:</div>
+                        <div style="font-size:0.8rem; color:#166534; margin-top:5px;">$positioning</div>
+                    </div>
+                </div>
                 
-                # Price by segment
-                pbs = na.get("price_by_segment", {})
-                price_seg_items = ""
-                for ps_name, ps_data in sorted(pbs.items(), key=lambda x: x[1].get("avg_price", 0), reverse=True):
-                    if ps_name == "Unspecified":
-                        continue
-                    ps_emoji = seg_emojis.get(ps_name, "📊")
-                    price_seg_items += f'<div style="display:flex; justify-content:space-between; align-items:center; padding:4px 0; border-bottom:1px solid #f1f5f9;"><span style="font-size:0.65rem;">{ps_emoji} {ps_name} ({ps_data.get("count", 0)})</span><span style="font-weight:700; font-size:0.75rem; color:#334155;">${ps_data.get("avg_price", 0):.2f}</span></div>'
+                <!-- Diferenciadores Clave -->
+                <div style="background:linear-gradient(135deg, #eff6ff 0%, #dbeafe 100%); border:2px solid #3b82f6; border-radius:16px; padding:25px;">
+                    <div style="font-size:0.7rem; color:#1d4ed8; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:10px;">⚡ DIFERENCIADORES CLAVE</div>
+                    <ul style="margin:0; padding-left:18px; font-size:0.85rem; color:#1e40af; line-height:1.8;">
+                        $differentiators_html
+                    </ul>
+                    <div style="margin-top:15px; padding:12px; background:rgba(59,130,246,0.1); border-radius:8px;">
+                        <div style="font-size:0.7rem; color:#1d4ed8; font-weight:700;">🎯 MOAT DEFENSIVO:</div>
+                        <div style="font-size:0.8rem; color:#1e40af; margin-top:5px;">$verdict_moat</div>
+                    </div>
+                </div>
                 
-                # Brand concentration
-                bc = na.get("brand_concentration", {})
-                hhi_html = ""
-                if bc:
-                    hhi = bc.get("hhi_index", 0)
-                    hhi_pct = min(100, hhi / 100)  # Scale 0-10000 to 0-100
-                    hhi_html = f"""
-                        <div style="background:white; padding:14px; border-radius:12px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">🏢 Concentración de Marcas</div>
-                            <div style="display:flex; align-items:center; gap:8px; margin-bottom:8px;">
-                                <span style="font-size:1.3rem; font-weight:800; color:{bc.get('hhi_color', '#64748b')};">HHI {hhi}</span>
-                                <span style="font-size:0.6rem; font-weight:700; color:{bc.get('hhi_color', '#64748b')};">{bc.get('hhi_label', 'N/A')}</span>
+                <!-- Mercado Objetivo EXPANDIDO -->
+                <div style="background:linear-gradient(135deg, #fef3c7 0%, #fde68a 100%); border:2px solid #f59e0b; border-radius:16px; padding:25px;">
+                    <div style="font-size:0.7rem; color:#b45309; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:15px; display:flex; align-items:center; gap:8px;">
+                        👥 MERCADO OBJETIVO
+                        <span style="background:#92400e; color:white; padding:2px 8px; border-radius:10px; font-size:0.55rem;">3 SEGMENTOS VALIDADOS</span>
+                    </div>
+                    
+                    <!-- Segmentos en Mini Cards -->
+                    <div style="display:flex; flex-direction:column; gap:8px;">
+                        <!-- Segmento Primario -->
+                        <div style="background:white; border-radius:10px; padding:12px; border-left:4px solid #22c55e;">
+                            <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
+                                <span style="font-size:0.9rem; font-weight:700; color:#166534;">🎯 Early Adopters Premium</span>
+                                <span style="background:#dcfce7; color:#166534; padding:2px 8px; border-radius:8px; font-size:0.6rem; font-weight:700;">35% TAM</span>
                             </div>
-                            <div style="background:#e2e8f0; border-radius:4px; height:8px; margin-bottom:8px;">
-                                <div style="width:{hhi_pct}%; background:{bc.get('hhi_color', '#94a3b8')}; height:100%; border-radius:4px;"></div>
+                            <div style="font-size:0.75rem; color:#4b5563; line-height:1.4;">Tech-savvy, innovación sobre precio. Primeros en probar productos nuevos.</div>
+                            <div style="display:flex; gap:6px; margin-top:8px; flex-wrap:wrap;">
+                                <span style="background:#f0fdf4; color:#166534; padding:2px 6px; border-radius:4px; font-size:0.55rem;">25-38 años</span>
+                                <span style="background:#f0fdf4; color:#166534; padding:2px 6px; border-radius:4px; font-size:0.55rem;">$$75K-$$150K</span>
+                                <span style="background:#f0fdf4; color:#166534; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Urbano</span>
                             </div>
-                            <div style="font-size:0.6rem; color:#64748b;">{bc.get('unique_brands', 0)} marcas únicas</div>
-                            <div style="font-size:0.55rem; color:#475569; margin-top:4px;">Top: <strong>{bc.get('top_brand', 'N/A')}</strong> ({bc.get('top_brand_share', 0)}%)</div>
-                        </div>"""
-                
-                # Revenue Pareto + Price Sweet Spot + Review Velocity
-                rp = na.get("revenue_pareto", {})
-                price_a = na.get("price", {})
-                rv = na.get("review_velocity", {})
-                
-                metrics_html = f"""
-                        <div style="background:white; padding:14px; border-radius:12px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">📊 Métricas de Nicho</div>"""
-                
-                if rp:
-                    rp_color = "#ef4444" if rp.get("concentration") == "Alta" else ("#d97706" if rp.get("concentration") == "Media" else "#059669")
-                    metrics_html += f"""
-                            <div style="margin-bottom:6px;"><span style="font-size:0.55rem; color:#64748b;">Revenue Pareto:</span> <span style="font-weight:700; font-size:0.75rem; color:{rp_color};">Top 20% = {rp.get('top_20pct_share', 0)}%</span></div>"""
-                
-                if price_a:
-                    metrics_html += f"""
-                            <div style="margin-bottom:6px;"><span style="font-size:0.55rem; color:#64748b;">Price Sweet Spot:</span> <span style="font-weight:700; font-size:0.75rem; color:#059669;">{price_a.get('sweet_spot', 'N/A')}</span></div>"""
-                
-                if rv:
-                    metrics_html += f"""
-                            <div style="margin-bottom:6px;"><span style="font-size:0.55rem; color:#64748b;">Rev. Velocity P50:</span> <span style="font-weight:700; font-size:0.75rem;">{rv.get('p50', 0)}/mo</span></div>
-                            <div><span style="font-size:0.55rem; color:#64748b;">Rev. Velocity P90:</span> <span style="font-weight:700; font-size:0.75rem; color:#059669;">{rv.get('p90', 0)}/mo</span></div>"""
-                
-                metrics_html += "\n                        </div>"
-                
-                demographic_profile_html = f"""
-                <div style="background:linear-gradient(135deg, #fdf2f8 0%, #fce7f3 100%); border:2px solid #f9a8d4; padding:20px; border-radius:16px; margin-bottom:20px;">
-                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
-                        <span style="font-size:1.3rem;">🎯</span>
-                        <span style="font-weight:700; color:#9d174d; font-size:0.9rem;">Demographic & Niche Profile</span>
-                        <span style="background:#fce7f3; color:#be185d; padding:2px 8px; border-radius:8px; font-size:0.55rem; font-weight:800;">Target Age Analysis · {cls_rate}% clasificado</span>
-                        <span style="background:#fce7f3; color:#9d174d; padding:2px 8px; border-radius:8px; font-size:0.55rem; font-weight:800;">Dominante: {dom_seg}</span>
-                    </div>
-                    <div style="display:grid; grid-template-columns: 1fr 1fr 1fr 1fr; gap:15px;">
-                        <div style="background:white; padding:14px; border-radius:12px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">👥 Segmentos por Edad</div>
-                            {seg_bars}
-                        </div>
-                        <div style="background:white; padding:14px; border-radius:12px;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">💰 Precio por Segmento</div>
-                            {price_seg_items}
-                        </div>
-                        {hhi_html}
-                        {metrics_html}
-                    </div>
-                </div>"""
-
-            # ── Assemble source badges ──
-            source_badges = '<span style="background:#ecfdf5; color:#059669; padding:4px 12px; border-radius:20px; font-size:0.65rem; font-weight:800; border:1px solid #a7f3d0;">📁 DATOS POE</span>'
-            if has_search_intel:
-                source_badges += f' <span style="background:#f0fdf4; color:#166534; padding:4px 12px; border-radius:20px; font-size:0.6rem; font-weight:700; border:1px solid #bbf7d0;">📄 {st_source_file}</span>'
-            if has_product_traffic:
-                source_badges += ' <span style="background:#eff6ff; color:#1d4ed8; padding:4px 12px; border-radius:20px; font-size:0.6rem; font-weight:700; border:1px solid #bfdbfe;">📄 NicheDetailsProductsTab</span>'
-            
-            # ── Build product traffic table block ──
-            product_table_block = ""
-            if product_traffic_rows:
-                product_table_block = f'''
-                <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; overflow:hidden; margin-bottom:25px;">
-                    <div style="background:linear-gradient(135deg, #1e3a8a 0%, #1e40af 100%); padding:15px 20px;">
-                        <div style="display:flex; justify-content:space-between; align-items:center;">
-                            <span style="color:white; font-weight:700; font-size:0.9rem;">📊 Tráfico & Revenue por Producto (Click Share, Ventas, Ingresos)</span>
-                            <span style="color:#93c5fd; font-size:0.65rem;">Fuente: NicheDetailsProductsTab · Datos POE Verificados</span>
                         </div>
-                    </div>
-                    <table style="width:100%; border-collapse:collapse;">
-                        <thead>
-                            <tr style="background:#f8fafc;">
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">PRODUCTO</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">PRECIO</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">VENTAS/MES</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">REVENUE</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">CLICK SHARE</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">REV. VEL</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">FBA FEES</th>
-                            </tr>
-                        </thead>
-                        <tbody>{product_traffic_rows}</tbody>
-                    </table>
-                </div>'''
-            
-            # ── Build keyword table block ──
-            keyword_table_block = ""
-            if kw_rows_html:
-                keyword_table_block = f'''
-                <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; overflow:hidden; margin-bottom:25px;">
-                    <div style="background:linear-gradient(135deg, #0f172a 0%, #1e293b 100%); padding:15px 20px;">
-                        <div style="display:flex; justify-content:space-between; align-items:center;">
-                            <span style="color:white; font-weight:700; font-size:0.9rem;">🔑 Ranking de Keywords por Demanda</span>
-                            <span style="color:#94a3b8; font-size:0.65rem;">Prioridad Alta para SEO · Fuente: NicheDetailsSearchTermsTab</span>
+                        
+                        <!-- Segmento Secundario -->
+                        <div style="background:white; border-radius:10px; padding:12px; border-left:4px solid #3b82f6;">
+                            <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
+                                <span style="font-size:0.9rem; font-weight:700; color:#1d4ed8;">💼 Quality-First Professionals</span>
+                                <span style="background:#dbeafe; color:#1d4ed8; padding:2px 8px; border-radius:8px; font-size:0.6rem; font-weight:700;">40% TAM</span>
+                            </div>
+                            <div style="font-size:0.75rem; color:#4b5563; line-height:1.4;">Compran calidad para evitar recompras. Valoran durabilidad y garantía.</div>
+                            <div style="display:flex; gap:6px; margin-top:8px; flex-wrap:wrap;">
+                                <span style="background:#eff6ff; color:#1d4ed8; padding:2px 6px; border-radius:4px; font-size:0.55rem;">35-50 años</span>
+                                <span style="background:#eff6ff; color:#1d4ed8; padding:2px 6px; border-radius:4px; font-size:0.55rem;">$$100K-$$200K</span>
+                                <span style="background:#eff6ff; color:#1d4ed8; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Suburbano</span>
+                            </div>
                         </div>
-                    </div>
-                    <table style="width:100%; border-collapse:collapse;">
-                        <thead>
-                            <tr style="background:#f8fafc;">
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">KEYWORD</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">VOLUMEN</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">GROWTH 90D</th>
-                                <th style="text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">CLICK SHARE</th>
-                                <th style="text-align:center; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">CONVERSIÓN</th>
-                            </tr>
-                        </thead>
-                        <tbody>{kw_rows_html}</tbody>
-                    </table>
-                </div>'''
-            
-            # ── Assemble full section ──
-            search_terms_section_html = f'''
-            <div class="page-break section-container">
-                <h2 class="section-title">II-B. Traffic, Clicks & Search Intelligence <span class="agent-badge" style="background:#059669;">POE Data · Harvester</span></h2>
-                
-                <!-- Source Header -->
-                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:20px;">
-                    <div style="display:flex; align-items:center; gap:10px;">
-                        <div style="width:40px; height:40px; background:linear-gradient(135deg, #059669, #10b981); border-radius:10px; display:flex; align-items:center; justify-content:center; font-size:1.2rem;">📈</div>
-                        <div>
-                            <div style="font-size:0.65rem; color:#047857; font-weight:800; text-transform:uppercase; letter-spacing:1px;">TRÁFICO, IMPRESIONES & DEMANDA REAL</div>
-                            <div style="font-size:1rem; font-weight:700; color:#065f46;">Clicks, Revenue por Producto + Keywords vs. Conversión</div>
+                        
+                        <!-- Segmento Terciario -->
+                        <div style="background:white; border-radius:10px; padding:12px; border-left:4px solid #d946ef;">
+                            <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
+                                <span style="font-size:0.9rem; font-weight:700; color:#a21caf;">🎁 Gift Buyers Ocasionales</span>
+                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 8px; border-radius:8px; font-size:0.6rem; font-weight:700;">25% TAM</span>
+                            </div>
+                            <div style="font-size:0.75rem; color:#4b5563; line-height:1.4;">Buscan regalos especiales. Priorizan presentación y valor percibido.</div>
+                            <div style="display:flex; gap:6px; margin-top:8px; flex-wrap:wrap;">
+                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 6px; border-radius:4px; font-size:0.55rem;">30-55 años</span>
+                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Estacional</span>
+                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Nacional</span>
+                            </div>
                         </div>
                     </div>
-                    <div style="display:flex; gap:8px; align-items:center; flex-wrap:wrap;">
-                        {source_badges}
-                    </div>
                 </div>
-                
-                <!-- KPI Cards Row -->
-                <div style="display:grid; grid-template-columns: repeat(6, 1fr); gap:12px; margin-bottom:25px;">
-                    <div style="background:linear-gradient(135deg, #eff6ff 0%, #dbeafe 100%); padding:16px 12px; border-radius:14px; border:2px solid #93c5fd; text-align:center;">
-                        <div style="font-size:0.55rem; color:#1d4ed8; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">REVENUE TOTAL</div>
-                        <div style="font-size:1.5rem; font-weight:800; color:#1e40af;">{rev_display}</div>
-                        <div style="font-size:0.6rem; color:#3b82f6; margin-top:3px;">ingresos/mes nicho</div>
+            </div>
+            
+            <!-- v2.6: Multiple Buyer Personas Section -->
+            <div style="margin-top:25px;">
+                <div style="font-size:0.75rem; color:#64748b; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:15px;">🧑‍🤝‍🧑 BUYER PERSONAS ESTRATÉGICOS ($personas_count SEGMENTOS)</div>
+                <div style="display:flex; gap:15px; flex-wrap:wrap;">
+                    $personas_html
+                </div>
+            </div>
+            
+            <!-- TAM/SAM/SOM Section -->
+            <div style="display:grid; grid-template-columns: 1fr; gap:20px; margin-top:20px;">
+
+                <div style="background:linear-gradient(180deg, #0f172a 0%, #1e293b 100%); border-radius:16px; padding:25px; color:white;">
+                    <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px;">
+                        <div style="font-size:0.7rem; color:#94a3b8; font-weight:800; text-transform:uppercase; letter-spacing:1px;">📊 DIMENSIONAMIENTO DE MERCADO</div>
+                        <span style="background:$market_color; color:white; padding:2px 8px; border-radius:8px; font-size:0.5rem;">$market_badge</span>
                     </div>
-                    <div style="background:linear-gradient(135deg, #ecfdf5 0%, #d1fae5 100%); padding:16px 12px; border-radius:14px; border:2px solid #a7f3d0; text-align:center;">
-                        <div style="font-size:0.55rem; color:#047857; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">UNIDADES VENDIDAS</div>
-                        <div style="font-size:1.5rem; font-weight:800; color:#065f46;">{sales_display}</div>
-                        <div style="font-size:0.6rem; color:#059669; margin-top:3px;">ventas/mes total</div>
+                    
+                    <!-- TAM with source -->
+                    <div style="margin-bottom:12px;">
+                        <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:3px;">
+                            <span style="font-size:0.65rem; color:#94a3b8;">TAM (Mercado Total)</span>
+                            <span style="font-size:0.95rem; font-weight:800; color:#22c55e;">$tam_display</span>
+                        </div>
+                        <div style="background:#334155; border-radius:4px; height:6px; overflow:hidden;">
+                            <div style="background:#22c55e; width:100%; height:100%;"></div>
+                        </div>
                     </div>
-                    <div style="background:linear-gradient(135deg, #faf5ff 0%, #ede9fe 100%); padding:16px 12px; border-radius:14px; border:2px solid #c4b5fd; text-align:center;">
-                        <div style="font-size:0.55rem; color:#6d28d9; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">VOL. BÚSQUEDA</div>
-                        <div style="font-size:1.5rem; font-weight:800; color:#5b21b6;">{vol_display}</div>
-                        <div style="font-size:0.6rem; color:#7c3aed; margin-top:3px;">búsquedas/mes</div>
+                    
+                    <!-- SAM with source -->
+                    <div style="margin-bottom:12px;">
+                        <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:3px;">
+                            <span style="font-size:0.65rem; color:#94a3b8;">SAM (Alcanzable)</span>
+                            <span style="font-size:0.95rem; font-weight:800; color:#3b82f6;">$sam_display</span>
+                        </div>
+                        <div style="background:#334155; border-radius:4px; height:6px; overflow:hidden;">
+                            <div style="background:#3b82f6; width:30%; height:100%;"></div>
+                        </div>
                     </div>
-                    <div style="background:linear-gradient(135deg, #fff7ed 0%, #ffedd5 100%); padding:16px 12px; border-radius:14px; border:2px solid #fdba74; text-align:center;">
-                        <div style="font-size:0.55rem; color:#c2410c; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">AVG CLICK SHARE</div>
-                        <div style="font-size:1.5rem; font-weight:800; color:#9a3412;">{avg_product_click_share}%</div>
-                        <div style="font-size:0.6rem; color:#ea580c; margin-top:3px;">cuota de clics prom.</div>
+                    
+                    <!-- SOM with source -->
+                    <div style="margin-bottom:12px;">
+                        <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:3px;">
+                            <span style="font-size:0.65rem; color:#94a3b8;">SOM (Meta Año 1)</span>
+                            <span style="font-size:0.95rem; font-weight:800; color:#f59e0b;">$som_display</span>
+                        </div>
+                        <div style="background:#334155; border-radius:4px; height:6px; overflow:hidden;">
+                            <div style="background:#f59e0b; width:5%; height:100%;"></div>
+                        </div>
                     </div>
-                    <div style="background:linear-gradient(135deg, #fef2f2 0%, #fecaca 100%); padding:16px 12px; border-radius:14px; border:2px solid #fca5a5; text-align:center;">
-                        <div style="font-size:0.55rem; color:#991b1b; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">CONVERSIÓN</div>
-                        <div style="font-size:1.5rem; font-weight:800; color:#b91c1c;">{st_avg_conversion:.1f}%</div>
-                        <div style="font-size:0.6rem; color:#dc2626; margin-top:3px;">tasa promedio nicho</div>
+                    
+                    <!-- Methodology Note -->
+                    <div style="background:#1e293b; border:1px dashed #475569; padding:8px; border-radius:6px; margin-top:10px;">
+                        <div style="font-size:0.55rem; color:#94a3b8; line-height:1.4;">
+                            <strong style="color:#f59e0b;">📐 FUENTE:</strong> $market_source
+                        </div>
                     </div>
-                    <div style="background:linear-gradient(135deg, #f0fdf4 0%, #dcfce7 100%); padding:16px 12px; border-radius:14px; border:2px solid #86efac; text-align:center;">
-                        <div style="font-size:0.55rem; color:#166534; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">PRODUCTOS</div>
-                        <div style="font-size:1.5rem; font-weight:800; color:#15803d;">{len(traffic_products)}</div>
-                        <div style="font-size:0.6rem; color:#16a34a; margin-top:3px;">competidores activos</div>
+                </div>
+            
+            <!-- Pricing & ROI with Sources -->
+            <div style="display:grid; grid-template-columns: 1fr 1fr; gap:20px; margin-top:20px;">
+                <div style="background:#0f172a; color:white; border-radius:16px; padding:30px;">
+                    <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px;">
+                        <div style="font-size:0.7rem; color:#94a3b8; font-weight:800; text-transform:uppercase; letter-spacing:1px;">💰 PRICING STRATEGY</div>
+                        <span style="background:$pricing_color; color:white; padding:2px 8px; border-radius:8px; font-size:0.5rem;">$pricing_badge</span>
+                    </div>
+                    <div style="display:grid; grid-template-columns: repeat(3, 1fr); gap:15px; text-align:center;">
+                        <div>
+                            <div style="font-size:0.65rem; color:#94a3b8;">MSRP SUGERIDO</div>
+                            <div style="font-size:1.5rem; font-weight:900; color:#22c55e;">$price_msrp</div>
+                        </div>
+                        <div>
+                            <div style="font-size:0.65rem; color:#94a3b8;">COSTO EST.</div>
+                            <div style="font-size:1.5rem; font-weight:900; color:#f97316;">$price_cost</div>
+                        </div>
+                        <div>
+                            <div style="font-size:0.65rem; color:#94a3b8;">MARGEN BRUTO</div>
+                            <div style="font-size:1.5rem; font-weight:900; color:#3b82f6;">$margin_display</div>
+                        </div>
+                    </div>
+                    <!-- Pricing Methodology -->
+                    <div style="background:#1e293b; border:1px dashed #475569; padding:8px; border-radius:6px; margin-top:15px;">
+                        <div style="font-size:0.55rem; color:#94a3b8; line-height:1.4;">
+                            <strong style="color:#22c55e;">📐 FUENTE:</strong> $pricing_source<br>
+                            <strong style="color:#3b82f6;">📊 FÓRMULA:</strong> $pricing_formula
+                        </div>
                     </div>
                 </div>
                 
-                <!-- Product Traffic Table -->
-                {product_table_block}
-                
-                <!-- Keywords Table -->
-                {keyword_table_block}
-                
-                <!-- Demand vs Supply Cross-Reference -->
-                {cross_ref_html}
-                
-                <!-- Opportunity Insights -->
-                {opp_section_html}
-                
-                <!-- Logistics & Seller Intelligence -->
-                {seller_intel_html}
-                
-                <!-- Demographic & Niche Profile -->
-                {demographic_profile_html}
-                
-                <!-- Methodology Note -->
-                <div style="background:#f8fafc; padding:12px 16px; border-radius:10px; border-left:4px solid #059669;">
-                    <div style="font-size:0.7rem; color:#475569; line-height:1.5;">
-                        <strong style="color:#059669;">📋 Metodología:</strong> Datos extraídos de <strong>NicheDetailsProductsTab</strong> (ventas, revenue, click share, fees) y <strong>NicheDetailsSearchTermsTab</strong> (keywords, volumen, conversión).
-                        Revenue = ingresos mensuales por producto. Click Share = % de clics capturados del nicho. Conversión = tasa de compra tras búsqueda.
-                        <strong>Uso recomendado:</strong> Cruzar Click Share de productos vs. Keywords de alta conversión para priorización de listing y SEO.
+                <div style="background:linear-gradient(135deg, #fdf4ff 0%, #f5d0fe 100%); border:2px solid #d946ef; border-radius:16px; padding:30px;">
+                    <div style="font-size:0.7rem; color:#a21caf; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:15px;">🚀 ACCIONES INMEDIATAS</div>
+                    <div style="display:flex; flex-direction:column; gap:10px;">
+                        <div style="display:flex; align-items:center; gap:10px;">
+                            <span style="background:#d946ef; color:white; padding:4px 10px; border-radius:20px; font-size:0.7rem; font-weight:800;">1</span>
+                            <span style="font-size:0.85rem; color:#7e22ce;">$action_1</span>
+                        </div>
+                        <div style="display:flex; align-items:center; gap:10px;">
+                            <span style="background:#d946ef; color:white; padding:4px 10px; border-radius:20px; font-size:0.7rem; font-weight:800;">2</span>
+                            <span style="font-size:0.85rem; color:#7e22ce;">$action_2</span>
+                        </div>
+                        <div style="display:flex; align-items:center; gap:10px;">
+                            <span style="background:#d946ef; color:white; padding:4px 10px; border-radius:20px; font-size:0.7rem; font-weight:800;">3</span>
+                            <span style="font-size:0.85rem; color:#7e22ce;">$action_3</span>
+                        </div>
                     </div>
                 </div>
             </div>
-            '''
-        else:
-            search_terms_section_html = ""
-        
-        # Calculate price range from top_10 if not in price_tiers
-        top_10_list_for_pricing = s_data.get("top_10_products", [])
-        prices_list = [p.get("price", 0) for p in top_10_list_for_pricing if p.get("price", 0) > 0]
-        
-        if prices_list:
-            price_min = min(prices_list)
-            price_max = max(prices_list)
-            price_median = sorted(prices_list)[len(prices_list)//2]
-            price_range_display = f"${price_min:.2f} - ${price_max:.2f}"
-            price_median_display = f"${price_median:.2f}"
-        else:
-            price_min, price_max, price_median = 0, 0, 0
-            price_range_display = "N/A"
-            price_median_display = "N/A"
-
-
-        raw_summary = p_data.get("executive_summary", "Sin resumen disponible.")
-        summary = ""
-        parts = raw_summary.split("**")
-        for i, part in enumerate(parts):
-            summary += f"<strong>{part}</strong>" if i % 2 == 1 else part
-
-        scenarios = m_data.get("scenarios", {})
-        amz_base = m_data.get("amazon_baseline", {})
-        
-
-        
-        # Dynamic Title Generation based on Product Anchor
-        anchor_raw = s_data.get("product_anchor") or s_data.get("scout_anchor") or i_data.get("scout_anchor")
-        if not anchor_raw:
-             # Try keywords as fallback
-             kws = s_data.get("keywords", [])
-             if kws:
-                 anchor_raw = kws[0].get("term") if isinstance(kws[0], dict) else str(kws[0])
-        
-        final_anchor = anchor_raw if anchor_raw else "Producto Analizado"
-        # REGLA 1: Sanitizar el anchor — elimina paréntesis, traducciones y ruido
-        final_anchor = sanitize_product_name(final_anchor)
-        
-        niche_title = f"Dossier de Viabilidad: {final_anchor}"
-
-        # Section I: Source Cards
-        source_metadata = i_data.get("source_metadata", [])
-        source_cards_html = ""
-        for s in source_metadata:
-            fname = s['name']
-            summary_str = s.get("summary", "Metadatos, Estructura")
-            ext = fname.split('.')[-1].upper() if '.' in fname else "INTEL"
-            bg_color = "#eff6ff"; text_color = "#1e40af"; icon = "📄"
-            if ext == "PDF": bg_color = "#fef2f2"; text_color = "#991b1b"; icon = "📕"
-            elif ext in ["CSV", "XLSX"]: bg_color = "#f0fdf4"; text_color = "#166534"; icon = "📊"
-            elif ext in ["PNG", "JPG", "JPEG"]: bg_color = "#faf5ff"; text_color = "#6b21a8"; icon = "🖼️"
-            elif s.get("type") == "scout_intelligence" or ext == "INTEL": bg_color = "#fff7ed"; text_color = "#9a3412"; icon = "🧠"
-
-            source_cards_html += f"""
-            <div class="source-card">
-                <div style="display:flex; justify-content:space-between; margin-bottom:10px;">
-                    <span style="font-size:1.2rem;">{icon}</span>
-                    <span style="background:{bg_color}; color:{text_color}; padding:2px 8px; border-radius:4px; font-size:0.6rem; font-weight:800;">{ext}</span>
-                </div>
-                <div style="font-weight:700; font-size:0.85rem; color:var(--primary); word-wrap:break-word;">{fname}</div>
-                <div style="font-size:0.7rem; color:#64748b; margin-top:5px; line-height:1.4;">{summary_str}</div>
-            </div>"""
+        </div>
 
-        # Section II: Competitive Matrix
-        top_10_rows = ""
-        top_10_list = s_data.get("top_10_products", [])
-        for p in top_10_list:
-            rating = p.get('rating', 0)
-            reviews = p.get('reviews', 0)
-            price = p.get('price', 0)
-            brand = p.get('brand', 'N/A')
-            seller_country = str(p.get('seller_country', 'N/A')).upper()
-            fulfillment = str(p.get('fulfillment', 'N/A')).upper()
-            seller_age = int(p.get('seller_age_months', 0))
-            rev_velocity = int(p.get('review_velocity', 0))
-            images_ct = int(p.get('images_count', 0))
-            sponsored = str(p.get('sponsored', 'No'))
-            recent_purch = int(p.get('recent_purchases', 0))
-            seller_name = p.get('seller_name', 'N/A')
-            
-            # Format reviews count
-            if reviews >= 1000:
-                reviews_display = f"{reviews/1000:.1f}K"
-            else:
-                reviews_display = str(reviews)
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <!-- SECCIÓN V: RIESGOS & COMPLIANCE (Consolidado)                       -->
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <div class="page-break section-container">
+            <h2 class="section-title">V. Riesgos, Compliance & Gobernanza <span class="agent-badge">Guardian</span></h2>
             
-            # Rating color based on value
-            if rating >= 4.5:
-                rating_color = "#166534"
-                rating_bg = "#dcfce7"
-                rating_badge = "EXCELENTE"
-            elif rating >= 4.0:
-                rating_color = "#854d0e"
-                rating_bg = "#fef9c3"
-                rating_badge = "MUY BUENO"
-            elif rating >= 3.5:
-                rating_color = "#c2410c"
-                rating_bg = "#ffedd5"
-                rating_badge = "BUENO"
-            else:
-                rating_color = "#991b1b"
-                rating_bg = "#fee2e2"
-                rating_badge = "REGULAR"
+            <!-- Risk Matrix -->
+            <div style="margin-bottom:30px;">
+                $risk_matrix_html
+            </div>
             
-            # Price tier indicator
-            if price >= 50:
-                price_tier = "💎 Premium"
-                price_color = "#7c3aed"
-            elif price >= 25:
-                price_tier = "⭐ Mid-Range"
-                price_color = "#0369a1"
-            else:
-                price_tier = "💰 Value"
-                price_color = "#166534"
+            <!-- Compliance Summary -->
+            <div style="display:grid; grid-template-columns: 2fr 1fr; gap:30px;">
+                <div>
+                    <div style="display:flex; gap:15px; margin-bottom:20px;">
+                        <div style="background:#fee2e2; color:#991b1b; padding:8px 15px; border-radius:8px; font-weight:bold; font-size:0.75rem;">RIESGO: $risk_level</div>
+                        <div style="background:#dbeafe; color:#1e40af; padding:8px 15px; border-radius:8px; font-weight:bold; font-size:0.75rem;">COMPLIANCE: $compliance_score%</div>
+                    </div>
+                    <table><thead><tr><th>Estándar</th><th>Estatus</th><th>Descripción</th></tr></thead><tbody>$compliance_rows</tbody></table>
+                </div>
+                <div style="background:var(--primary); color:white; padding:25px; border-radius:12px; height:fit-content;">
+                    <div style="font-size:0.6rem; color:#60a5fa; letter-spacing:2px; margin-bottom:10px;">SECURITY PROTOCOL</div>
+                    <h4 style="margin:0 0 10px 0;">$security_protocol</h4>
+                    <p style="font-size:0.8rem; color:#94a3b8;">Cifrado de extremo a extremo activo.</p>
+                </div>
+            </div>
+        </div>
+
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <!-- SECCIÓN VI: ESTRATEGIA & ROADMAP (Consolidado)                      -->
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <div class="page-break section-container">
+            <h2 class="section-title">VI. Estrategia Comercial & Roadmap <span class="agent-badge">Strategist</span></h2>
             
-            # Seller country flag
-            if "CN" in seller_country:
-                country_flag = "🇨🇳"
-                country_label = "China"
-            elif "US" in seller_country:
-                country_flag = "🇺🇸"
-                country_label = "USA"
-            elif "AMZ" in seller_country or "AMAZON" in seller_name.upper():
-                country_flag = "🏢"
-                country_label = "Amazon"
-            elif "AE" in seller_country:
-                country_flag = "🇦🇪"
-                country_label = "UAE"
-            elif "LV" in seller_country:
-                country_flag = "🇱🇻"
-                country_label = "Latvia"
-            else:
-                country_flag = "🌐"
-                country_label = seller_country if seller_country != "N/A" else "Global"
+            <!-- Price Tiers -->
+            <h4 style="margin:0 0 15px 0; color:var(--primary);">💰 Rangos de Precio & Sweet Spot</h4>
+            <div style="margin-bottom:30px;">
+                $price_tiers_html
+            </div>
             
-            # Fulfillment badge
-            if "AMZ" in fulfillment:
-                ful_bg = "#1e3a8a"; ful_color = "white"; ful_label = "AMZ"
-            elif "FBA" in fulfillment:
-                ful_bg = "#059669"; ful_color = "white"; ful_label = "FBA"
-            elif "FBM" in fulfillment:
-                ful_bg = "#d97706"; ful_color = "white"; ful_label = "FBM"
-            else:
-                ful_bg = "#94a3b8"; ful_color = "white"; ful_label = "N/A"
+            <!-- Pain Points & USP -->
+            <h4 style="margin:0 0 15px 0; color:var(--primary);">😤 Pain Points & USP Proposals</h4>
+            <div style="margin-bottom:30px;">
+                $pain_points_html
+            </div>
             
-            # Sponsored badge
-            sponsored_badge = ""
-            if sponsored and sponsored not in ("No", "N/A", "", "nan"):
-                sponsored_badge = f'<span style="background:#ef4444; color:white; padding:1px 5px; border-radius:3px; font-size:0.5rem; font-weight:800;">PPC</span>'
+            <!-- Roadmap -->
+            <h4 style="margin:0 0 15px 0; color:var(--primary);">🗺️ Plan de Ejecución</h4>
+            $roadmap_html
+        </div>
+
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <!-- SECCIÓN VII: BUYER PERSONAS & CONSUMER DEEP DIVE                    -->
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <div class="page-break section-container">
+            <h2 class="section-title">VII. Buyer Personas Detallados <span class="agent-badge">Consumer Intel</span></h2>
             
-            # Review velocity indicator
-            vel_html = ""
-            if rev_velocity > 0:
-                if rev_velocity >= 200:
-                    vel_html = f'<span style="color:#059669; font-size:0.6rem; font-weight:700;">🔥 {rev_velocity}/mo</span>'
-                elif rev_velocity >= 50:
-                    vel_html = f'<span style="color:#d97706; font-size:0.6rem; font-weight:700;">📈 {rev_velocity}/mo</span>'
-                else:
-                    vel_html = f'<span style="color:#64748b; font-size:0.6rem;">{rev_velocity}/mo</span>'
+            <!-- Detailed Personas -->
+            $buyer_personas_html
             
-            top_10_rows += f"""
-            <tr>
-                <td style="text-align:center; font-weight:bold; color:var(--accent); font-size:1.2rem;">#{p.get('rank', 'N/A')}</td>
-                <td style="min-width:220px;">
-                    <strong style="color:var(--primary); font-size:0.95rem;">{p.get('name', 'Product Name N/A')}</strong>
-                    <div style="display:flex; gap:6px; margin-top:6px; flex-wrap:wrap; align-items:center;">
-                        <span style="background:#1e3a8a; color:white; padding:3px 8px; border-radius:4px; font-size:0.65rem; font-weight:700; font-family:monospace;">{p.get('asin', 'N/A')}</span>
-                        <span style="background:#f1f5f9; color:#475569; padding:3px 8px; border-radius:4px; font-size:0.7rem; font-weight:600;">${price:.2f}</span>
-                        <span style="color:{price_color}; font-size:0.65rem; font-weight:700;">{price_tier}</span>
-                        {sponsored_badge}
-                    </div>
-                    <div style="display:flex; gap:6px; margin-top:5px; flex-wrap:wrap; align-items:center;">
-                        <span style="font-size:0.6rem; font-weight:700; color:#334155;">{brand}</span>
-                        <span style="font-size:0.6rem;">{country_flag} {country_label}</span>
-                        <span style="background:{ful_bg}; color:{ful_color}; padding:1px 5px; border-radius:3px; font-size:0.5rem; font-weight:800;">{ful_label}</span>
-                        <span style="font-size:0.55rem; color:#64748b;">{seller_age}mo</span>
-                        {vel_html}
-                    </div>
-                </td>
-                <td style="min-width:140px;">
-                    <div style="display:flex; flex-direction:column; gap:6px;">
-                        <div style="display:flex; align-items:center; gap:6px;">
-                            <span style="color:#f59e0b; font-size:1.1rem;">{'★' * int(min(5, rating))}{'☆' * (5-int(min(5, rating)))}</span>
-                            <span style="font-weight:800; color:{rating_color}; font-size:0.95rem;">{rating:.1f}</span>
-                        </div>
-                        <div style="display:flex; align-items:center; gap:8px;">
-                            <span style="font-size:0.7rem; color:#64748b;">📊 {reviews_display} reseñas</span>
-                        </div>
-                        <span style="background:{rating_bg}; color:{rating_color}; padding:2px 6px; border-radius:3px; font-size:0.55rem; font-weight:800; width:fit-content;">{rating_badge}</span>
-                    </div>
-                </td>
-                <td style="font-size:0.8rem; color:#166534; background: #f0fdf4; max-width:200px;">{p.get('adv', 'N/A')}</td>
-                <td style="font-size:0.8rem; color:#991b1b; background: #fef2f2; max-width:200px;">{p.get('vuln', 'N/A')}</td>
-                <td style="font-size:0.8rem; color:#1e40af; background: #eff6ff; font-weight:600; max-width:180px;">{p.get('gap', 'N/A')}</td>
-            </tr>"""
+            <!-- Reviews Analysis -->
+            <h4 style="margin:30px 0 15px 0; color:var(--primary);">⭐ Análisis de Reviews & Sentiment</h4>
+            $reviews_analysis_html
+        </div>
 
-        # Section III: Social & Scholar
-        sl = s_data.get("social_listening", {})
-        pros_html = "".join([f'<li style="color:#166534; margin-bottom:4px;">✔ {p}</li>' for p in sl.get('pros', [])])
-        cons_html = "".join([f'<li style="color:#991b1b; margin-bottom:4px;">✖ {c}</li>' for c in sl.get('cons', [])])
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <!-- SECCIÓN VIII: UNIT ECONOMICS DEEP DIVE                              -->
+        <!-- ═══════════════════════════════════════════════════════════════════ -->
+        <div class="page-break section-container">
+            <h2 class="section-title">VIII. Unit Economics Detallado <span class="agent-badge">Mathematician</span></h2>
+            
+            <!-- Amazon FBA Fees -->
+            <h4 style="margin:0 0 15px 0; color:var(--primary);">📦 Amazon FBA Fees Structure</h4>
+            $amazon_fees_html
+            
+            <!-- 3 Scenarios -->
+            <h4 style="margin:30px 0 15px 0; color:var(--primary);">📊 Proyección de 3 Escenarios</h4>
+            $three_scenarios_html
+        </div>
+
+        <footer style="margin-top:50px; text-align:center; font-size:0.7rem; color:#94a3b8; border-top:1px solid #e2e8f0; padding-top:20px;">NEXUS-360 EXECUTIVE DOSSIER v3.1 | Estructura Optimizada | $year</footer>
+    </div>
+    $script_html""")
+
+def _split_template(tpl: Template) -> tuple:
+    """Parte un Template en ((literal, placeholder), ...) + literal final, resolviendo los $$."""
+    text, parts, literal, pos = tpl.template, [], [], 0
+    for m in tpl.pattern.finditer(text):
+        literal.append(text[pos:m.start()])
+        pos = m.end()
+        if m.group("escaped") is not None:
+            literal.append(tpl.delimiter)
+            continue
+        name = m.group("named") or m.group("braced")
+        if name is None:
+            raise ValueError(f"Placeholder inválido en la posición {m.start()}")
+        parts.append(("".join(literal), name))
+        literal = []
+    literal.append(text[pos:])
+    return tuple(parts), "".join(literal)
+
+# Cuerpo del dossier pre-partido: se emite por fragmentos (literal + sección) sin unirlo en un string
+_REPORT_BODY_PARTS, _REPORT_BODY_END = _split_template(_REPORT_BODY_TPL)
+
+def _report_chunks(sections: dict) -> list:
+    """Documento completo como lista de fragmentos: head, literales del cuerpo intercalados con cada sección, tail."""
+    chunks = [_REPORT_HEAD]
+    for literal, name in _REPORT_BODY_PARTS:
+        chunks.append(literal)
+        chunks.append(str(sections[name]))
+    chunks.append(_REPORT_BODY_END)
+    chunks.append(_REPORT_TAIL)
+    return chunks
+
+# ═══════════════════════════════════════════════════════════════════
+# EXECUTIVE BRIEF — <head> (CSS A4) y script de PDF, parseados una vez
+# ═══════════════════════════════════════════════════════════════════
+_BRIEF_HEAD = Template("""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Executive Brief: $anchor</title>
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap" rel="stylesheet">
+    <style>
+        :root { --primary: #0f172a; --accent: #3b82f6; }
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { font-family: 'Inter', sans-serif; background: #f1f5f9; padding: 20px; color: var(--primary); -webkit-font-smoothing: antialiased; }
         
-        scholar = s_data.get("scholar_audit", [])
+        /* Container setup for A4 at 96dpi (approx 794px) */
+        .brief { width: 794px; margin: 0 auto; background: none; }
         
-        # v2.6 GUARANTEED FALLBACK: Scholar Audit will NEVER be empty
-        if not scholar:
-            niche_title_fallback = niche_title if niche_title else "mercado analizado"
-            scholar = [
-                {
-                    "source": f"Industry Trends Report: {niche_title_fallback[:30]}",
-                    "finding": f"El segmento de {niche_title_fallback} muestra una tendencia hacia la 'premiumización', donde los consumidores están dispuestos a pagar más por productos con transparencia de materiales y garantías extendidas.",
-                    "relevance": "Estrategia de Posicionamiento"
-                },
-                {
-                    "source": "E-commerce Consumer Behavior Study",
-                    "finding": "El 73% de los compradores en esta categoría leen al menos 5 reseñas antes de comprar. La velocidad de respuesta a quejas impacta directamente en la tasa de recompra.",
-                    "relevance": "Optimización de Conversión"
-                }
-            ]
-            logger.info(f"[Architect] ⚠️ Scholar Audit was empty - using fallback content for: {niche_title_fallback}")
+        .page { 
+            width: 794px;
+            min-height: 1122px; /* A4 Height */
+            background: white; 
+            border-radius: 0; 
+            box-shadow: 0 10px 40px -10px rgba(0,0,0,0.1); 
+            overflow: visible; 
+            margin-bottom: 30px; 
+            position: relative;
+        }
         
-        scholar_html = ""
-        for item in scholar:
-            scholar_html += f"""
-            <div style="background:#f0f9ff; border:1px solid #bae6fd; padding:15px; border-radius:12px; margin-bottom:12px; border-left:4px solid #0284c7;">
-                <div style="font-size:0.65rem; color:#0369a1; font-weight:800; text-transform:uppercase;">{item['source']} // {item['relevance']}</div>
-                <div style="font-size:0.9rem; color:#0c4a6e; font-style:italic; margin-top:5px;">"{item['finding']}"</div>
-            </div>"""
-
-
-        # Build emotional analysis section
-        emotional = sl.get("emotional_analysis", {})
-        emotional_html = ""
-        if emotional:
-            emotions = [
-                ("😤 Frustración", emotional.get("frustration", "N/A"), "#dc2626", "#fef2f2"),
-                ("💭 Nostalgia", emotional.get("nostalgia", "N/A"), "#7c3aed", "#f5f3ff"),
-                ("😂 Humor", emotional.get("humor", "N/A"), "#0891b2", "#ecfeff"),
-                ("✨ Deseo", emotional.get("desire", "N/A"), "#059669", "#ecfdf5"),
-                ("🤨 Escepticismo", emotional.get("skepticism", "N/A"), "#d97706", "#fffbeb")
-            ]
-            for label, text, color, bg in emotions:
-                emotional_html += f'<div style="background:{bg}; padding:12px; border-radius:8px; margin-bottom:8px; border-left:3px solid {color};"><span style="font-weight:700; color:{color}; font-size:0.75rem;">{label}</span><p style="margin:5px 0 0 0; font-size:0.8rem; color:#374151; font-style:italic;">"{text}"</p></div>'
+        .header { background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: white; padding: 20px 30px; position: relative; }
+        .header::after { content: ''; position: absolute; bottom: 0; left: 0; right: 0; height: 3px; background: linear-gradient(90deg, #3b82f6, #8b5cf6, #ec4899); }
         
-        # Build pain keywords table
-        pain_keywords = sl.get("pain_keywords", [])
-        pain_html = ""
-        for pk in pain_keywords[:5]:
-            if isinstance(pk, dict):
-                pain_html += f'<tr><td style="font-weight:600; color:#dc2626;">{pk.get("keyword", "")}</td><td style="font-size:0.75rem;">{pk.get("search_intent", "")}</td><td><span style="background:#fee2e2; color:#991b1b; padding:2px 6px; border-radius:3px; font-size:0.65rem; font-weight:700;">{pk.get("volume", "")}</span></td><td style="font-size:0.75rem; color:#475569;">{pk.get("opportunity", "")}</td></tr>'
+        .content { padding: 25px 30px; }
         
-        # Build competitor gaps
-        comp_gaps = sl.get("competitor_gaps", [])
-        comp_gaps_html = ""
-        for cg in comp_gaps[:3]:
-            if isinstance(cg, dict):
-                comp_gaps_html += f'<div style="background:#fff7ed; padding:15px; border-radius:8px; margin-bottom:10px; border-left:3px solid #ea580c;"><div style="font-weight:700; color:#c2410c; font-size:0.85rem;">{cg.get("competitor", "")}</div><div style="font-size:0.8rem; color:#78350f; margin-top:5px;"><strong>Ignoran:</strong> {cg.get("ignored_issue", "")}</div><div style="font-size:0.75rem; color:#9a3412; font-style:italic; margin-top:5px;">"{cg.get("user_frustration", "")}"</div></div>'
+        /* Layout Utilities */
+        .section { margin-bottom: 25px; page-break-inside: avoid; }
+        .section-title { font-size: 0.7rem; font-weight: 800; color: #64748b; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 12px; display: flex; align-items: center; gap: 6px; border-bottom: 2px solid #f1f5f9; padding-bottom: 6px; }
+        .two-col { display: grid; grid-template-columns: 1.25fr 1fr; gap: 25px; }
+        .three-col { display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px; }
         
-        # Build content opportunities (GaryVee + Patel)
-        content_opps = s_data.get("content_opportunities", {})
-        gv_ideas = content_opps.get("garyvee_style", [])
-        patel_ideas = content_opps.get("patel_style", [])
+        /* Components */
+        .card { background: #f8fafc; border: 1px solid #e2e8f0; border-radius: 12px; padding: 16px; page-break-inside: avoid; }
         
-        gv_html = ""
-        for idea in gv_ideas[:3]:
-            if isinstance(idea, dict):
-                gv_html += f'<div style="background:#fdf4ff; padding:12px; border-radius:8px; margin-bottom:8px; border-left:3px solid #a855f7;"><div style="font-weight:700; color:#7e22ce; font-size:0.85rem;">🔥 {idea.get("idea", "")}</div><div style="font-size:0.75rem; color:#6b21a8; margin-top:5px;">Formato: {idea.get("format", "")} | Hook: "{idea.get("hook", "")}" | Emoción: {idea.get("emotional_trigger", "")}</div></div>'
+        .verdict-card { background: $verdict_bg; border: 2px solid $verdict_border; border-radius: 12px; padding: 20px; display: flex; align-items: center; gap: 20px; margin-bottom: 25px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.05); page-break-inside: avoid; }
+        .verdict-icon { font-size: 2.5rem; }
+        .verdict-status { font-size: 1.5rem; font-weight: 800; color: $verdict_color; letter-spacing: -0.5px; }
+        .verdict-summary { font-size: 0.85rem; color: #475569; margin-top: 4px; line-height: 1.4; }
         
-        patel_html = ""
-        for idea in patel_ideas[:3]:
-            if isinstance(idea, dict):
-                patel_html += f'<div style="background:#f0fdf4; padding:12px; border-radius:8px; margin-bottom:8px; border-left:3px solid #22c55e;"><div style="font-weight:700; color:#15803d; font-size:0.85rem;">📊 {idea.get("idea", "")}</div><div style="font-size:0.75rem; color:#166534; margin-top:5px;">Keyword: {idea.get("target_keyword", "")} | Intent: {idea.get("search_intent", "")} | Gap: {idea.get("content_gap", "")}</div></div>'
+        .confidence { background: white; border: 1px solid #e2e8f0; border-radius: 8px; padding: 10px 18px; text-align: center; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }
+        .confidence-value { font-size: 1.4rem; font-weight: 800; color: var(--accent); }
+        .confidence-label { font-size: 0.6rem; color: #64748b; text-transform: uppercase; font-weight: 700; }
         
-        # Build attention formats section
-        attention = sl.get("attention_formats", {})
-        attention_html = ""
-        if attention:
-            attention_html = f'''
-            <div style="background:#eff6ff; padding:15px; border-radius:8px;">
-                <div style="font-size:0.7rem; color:#1e40af; font-weight:800; text-transform:uppercase; margin-bottom:8px;">🎯 FORMATOS QUE RETIENEN ATENCIÓN</div>
-                <div style="font-size:0.85rem; color:#1e3a8a; margin-bottom:8px;"><strong>Qué funciona:</strong> {attention.get("what_works", "N/A")}</div>
-                <div style="font-size:0.85rem; color:#1e3a8a; margin-bottom:8px;"><strong>Tono:</strong> {attention.get("tone", "N/A")}</div>
-                <div style="font-size:0.85rem; color:#1e3a8a;"><strong>Elementos virales:</strong> {attention.get("viral_elements", "N/A")}</div>
-            </div>'''
+        .stat-card { text-align: center; padding: 15px; background: white; border: 1px solid #e2e8f0; border-radius: 12px; box-shadow: 0 2px 4px rgba(0,0,0,0.02); page-break-inside: avoid; }
+        .stat-value { font-size: 1.6rem; font-weight: 800; letter-spacing: -0.5px; }
+        .stat-label { font-size: 0.6rem; color: #64748b; text-transform: uppercase; font-weight: 700; margin-top: 4px; }
+    
+        .consumer-quote { background: linear-gradient(135deg, #fef3c7 0%, #fef9c3 100%); border-left: 4px solid #f59e0b; padding: 12px 16px; border-radius: 0 8px 8px 0; font-style: italic; font-size: 0.85rem; color: #92400e; margin: 12px 0; line-height: 1.5; page-break-inside: avoid; }
+        .lightning { background: linear-gradient(135deg, #fff7ed 0%, #ffedd5 100%); border: 1px solid #fed7aa; border-radius: 12px; padding: 14px; margin-top: 15px; page-break-inside: avoid; }
+        .lightning-title { font-size: 0.75rem; font-weight: 800; color: #ea580c; display: flex; align-items: center; gap: 6px; }
         
-        # White space topics
-        white_space = sl.get("white_space_topics", [])
-        white_space_html = "".join([f'<span style="background:#fef3c7; color:#92400e; padding:4px 10px; border-radius:12px; font-size:0.75rem; font-weight:600; margin:3px;">{t}</span>' for t in white_space[:5]])
+        .table { width: 100%; border-collapse: separate; border-spacing: 0; font-size: 0.8rem; }
+        .table th { background: #f8fafc; padding: 10px; text-align: left; font-size: 0.65rem; font-weight: 700; color: #64748b; text-transform: uppercase; border-bottom: 2px solid #e2e8f0; }
+        .table td { padding: 10px; border-bottom: 1px solid #f1f5f9; vertical-align: middle; }
+        .table tr:last-child td { border-bottom: none; }
+        
+        .page-break { page-break-before: always; }
         
-        # Cultural vibe
-        cultural_vibe = sl.get("cultural_vibe", "Analizando el tono de la comunidad...")
+        .footer { background: #f8fafc; border-top: 1px solid #e2e8f0; padding: 15px 30px; display: flex; justify-content: space-between; align-items: center; height: 60px; }
+        .footer-link { display: inline-flex; align-items: center; gap: 6px; background: var(--accent); color: white; padding: 8px 16px; border-radius: 8px; text-decoration: none; font-size: 0.8rem; font-weight: 600; transition: all 0.2s; box-shadow: 0 4px 6px -1px rgba(59, 130, 246, 0.3); }
+        .footer-link:hover { transform: translateY(-1px); box-shadow: 0 6px 8px -1px rgba(59, 130, 246, 0.4); }
+
+        /* Print Override */
+        @media print { 
+            body { padding: 0; background: white; -webkit-print-color-adjust: exact; print-color-adjust: exact; } 
+            .brief { width: 100%; margin: 0; box-shadow: none; }
+            .page { 
+                box-shadow: none; 
+                margin: 0; 
+                border: none;
+                border-radius: 0;
+                width: 100%; 
+                min-height: 297mm; 
+                height: 297mm;
+                page-break-after: always;
+            }
+            .page:last-child { page-break-after: avoid; }
+            .footer-link { display: none !important; }
+            ::-webkit-scrollbar { display: none; }
+        }
+    </style>
+</head>
+""")
+
+_BRIEF_TAIL = """    <!-- PDF Generation Script -->
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.10.1/html2pdf.bundle.min.js"></script>
+    <script>
+        async function downloadPDF() {
+            const btn = document.querySelector('#pdfDownloadBtn');
+            if (!btn) return;
+            const originalText = btn.innerHTML;
+            btn.innerHTML = '⏳ Generando PDF...';
+            btn.disabled = true;
+            btn.style.opacity = '0.7';
+            
+            const element = document.querySelector('.brief');
+            const briefTitle = document.title.replace('Executive Brief: ', '').trim();
+            // Sanitize title: remove special chars, replace spaces with underscores
+            const safeTitle = briefTitle.replace(/[^a-zA-Z0-9 ]/g, '').replace(/ +/g, '_').substring(0, 50) || 'Reporte';
+            const timestamp = new Date().toISOString().slice(0,10);
+            const filename = 'Executive_Brief_' + safeTitle + '_' + timestamp + '.pdf';
+            
+            // Hide buttons during PDF generation
+            const buttons = document.querySelectorAll('.footer-link');
+            buttons.forEach(b => b.style.visibility = 'hidden');
+            
+            try {
+                const opt = {
+                    margin: 0,
+                    filename: filename,
+                    image: { type: 'jpeg', quality: 0.98 },
+                    html2canvas: { 
+                        scale: 2,
+                        useCORS: true, 
+                        logging: false,
+                        letterRendering: true,
+                        scrollY: 0
+                    },
+                    jsPDF: { 
+                        unit: 'mm', 
+                        format: 'a4', 
+                        orientation: 'portrait',
+                        compress: true
+                    },
+                    pagebreak: { 
+                        mode: ['css', 'legacy'],
+                        before: '.page-break'
+                    }
+                };
+                
+                await html2pdf().set(opt).from(element).save();
+                
+                btn.innerHTML = '✅ Descargado!';
+                setTimeout(() => { btn.innerHTML = originalText; }, 2000);
+            } catch (error) {
+                console.error('PDF Error:', error);
+                btn.innerHTML = '❌ Error - Usa Ctrl+P';
+                alert('Error al generar PDF automáticamente. Usa Ctrl+P (o Cmd+P en Mac) para imprimir a PDF.');
+                setTimeout(() => { btn.innerHTML = originalText; }, 3000);
+            } finally {
+                buttons.forEach(b => b.style.visibility = 'visible');
+                btn.disabled = false;
+                btn.style.opacity = '1';
+            }
+        }
+    </script>
+</body>
+</html>"""
+
+# ═══════════════════════════════════════════════════════════════════
+# PLANTILLAS DE FILAS — parseadas una vez al importar el módulo
+# Los valores se escapan antes de sustituir (texto de LLM / agentes).
+# ═══════════════════════════════════════════════════════════════════
+_GAP_CARD_TPL = Template("""
+            <div class="gap-card">
+                <div class="gap-card-niche">Gap Detectado: $niche</div>
+                <h4>$gap</h4>
+                <p><strong>Propuesta NEXUS:</strong> $proposal</p>
+            </div>""")
+
+_SCENARIO_ROW_TPL = Template("""
+            <tr>
+                <td><strong>$name</strong><br><span style="font-size:0.75rem; color:#64748b;">$composition</span></td>
+                <td>$price</td>
+                <td>$landed</td>
+                <td style="font-weight:bold; color:#059669;">$margin_pct%</td>
+                <td>$break_even_qty u</td>
+                <td>$payback_months m</td>
+                <td><span class="tag tag-recommended">VIABLE</span></td>
+                <td style="font-size:0.8rem; line-height:1.4;">$notes</td>
+            </tr>""")
+
+_ROADMAP_STEP_TPL = Template("""
+            <div class="roadmap-step">
+                <div class="roadmap-num">$n</div>
+                <div><h4>$title</h4><p>$content</p></div>
+            </div>""")
+
+_BENCH_ROW_TPL = Template("""
+            <div class="bench-row">
+                <div class="bench-name">#$rank $name</div>
+                <div class="bench-meta">
+                    <div class="bench-total">$total</div>
+                    <div class="bench-pct" style="color:$color; background:${color}20;">$pct%</div>
+                </div>
+            </div>""")
+
+_COMPLIANCE_ROW_TPL = Template("""
+            <tr>
+                <td class="compliance-std">$std</td>
+                <td><span class="compliance-status" style="background:$bg; color:$color;">$status</span></td>
+                <td class="compliance-desc">$desc</td>
+            </tr>""")
+# status -> (color, bg) del badge en la auditoría de compliance; lo no obligatorio usa el estilo advisory
+_STATUS_COLORS = {
+    "MANDATORY": ("#15803d", "#dcfce7"),
+    "RECOMMENDED": ("#c2410c", "#ffedd5"),
+}
+_ADVISORY_STYLE = _STATUS_COLORS["RECOMMENDED"]
 
-        sl_html = f"""
+_EMO_ROW_TPL = Template('<div style="background:$bg; padding:12px; border-radius:8px; margin-bottom:8px; border-left:3px solid $color;"><span style="font-weight:700; color:$color; font-size:0.75rem;">$label</span><p style="margin:5px 0 0 0; font-size:0.8rem; color:#374151; font-style:italic;">"$text"</p></div>')
+_PRO_ITEM_TPL = Template('<li style="color:#166534; margin-bottom:4px;">✔ $text</li>')
+_CON_ITEM_TPL = Template('<li style="color:#991b1b; margin-bottom:4px;">✖ $text</li>')
+# Sección III (social listening + Intelligence Hub): marcado estático parseado una vez
+_SL_SECTION_TPL = Template("""
         <div style="margin-top:30px;">
             <!-- Row 1: Emotional Analysis + Competitor Gaps -->
             <div style="display:grid; grid-template-columns: 1.5fr 1fr; gap:25px; margin-bottom:25px;">
                 <div style="background:#ffffff; border:1px solid #e2e8f0; padding:25px; border-radius:16px;">
                     <h4 style="margin-top:0; color:var(--primary); font-family:var(--serif); display:flex; align-items:center; gap:10px; border-bottom:1px solid #f1f5f9; padding-bottom:15px;">🎭 Análisis Emocional del Mercado (GaryVee Method)</h4>
-                    {emotional_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectó análisis emocional específico.</p>'}
+                    $emotional_html
                 </div>
                 <div style="background:#ffffff; border:1px solid #e2e8f0; padding:25px; border-radius:16px;">
                     <h4 style="margin-top:0; color:#ea580c; font-family:var(--serif); display:flex; align-items:center; gap:10px; border-bottom:1px solid #fed7aa; padding-bottom:15px;">🎯 Gaps de Competidores</h4>
-                    {comp_gaps_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectaron gaps específicos.</p>'}
+                    $comp_gaps_html
                 </div>
             </div>
             
             <!-- Row 2: Pain Keywords Table -->
             <div style="background:#ffffff; border:1px solid #e2e8f0; padding:25px; border-radius:16px; margin-bottom:25px;">
                 <h4 style="margin-top:0; color:#dc2626; font-family:var(--serif); display:flex; align-items:center; gap:10px; border-bottom:1px solid #fecaca; padding-bottom:15px;">🔑 Keywords de Dolor (Neil Patel Method)</h4>
-                <table style="width:100%; margin-top:15px;"><thead><tr><th style="text-align:left; font-size:0.7rem; color:#991b1b;">KEYWORD</th><th style="text-align:left; font-size:0.7rem; color:#991b1b;">INTENT</th><th style="text-align:left; font-size:0.7rem; color:#991b1b;">VOLUMEN</th><th style="text-align:left; font-size:0.7rem; color:#991b1b;">OPORTUNIDAD</th></tr></thead><tbody>{pain_html or '<tr><td colspan="4" style="color:#64748b; font-size:0.8rem;">No se detectaron pain keywords.</td></tr>'}</tbody></table>
+                <table style="width:100%; margin-top:15px;"><thead><tr><th style="text-align:left; font-size:0.7rem; color:#991b1b;">KEYWORD</th><th style="text-align:left; font-size:0.7rem; color:#991b1b;">INTENT</th><th style="text-align:left; font-size:0.7rem; color:#991b1b;">VOLUMEN</th><th style="text-align:left; font-size:0.7rem; color:#991b1b;">OPORTUNIDAD</th></tr></thead><tbody>$pain_html</tbody></table>
             </div>
             
             <!-- Row 3: Content Opportunities -->
             <div style="display:grid; grid-template-columns: 1fr 1fr; gap:25px; margin-bottom:25px;">
                 <div style="background:#faf5ff; border:1px solid #e9d5ff; padding:25px; border-radius:16px;">
                     <h4 style="margin-top:0; color:#7c3aed; font-family:var(--serif); display:flex; align-items:center; gap:10px; border-bottom:1px solid #ddd6fe; padding-bottom:15px;">🔥 Contenido Estilo GaryVee (Alto Impacto)</h4>
-                    {gv_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectaron oportunidades GaryVee.</p>'}
+                    $gv_html
                 </div>
                 <div style="background:#f0fdf4; border:1px solid #bbf7d0; padding:25px; border-radius:16px;">
                     <h4 style="margin-top:0; color:#15803d; font-family:var(--serif); display:flex; align-items:center; gap:10px; border-bottom:1px solid #86efac; padding-bottom:15px;">📊 Contenido Estilo Patel (SEO/Educativo)</h4>
-                    {patel_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectaron oportunidades Patel.</p>'}
+                    $patel_html
                 </div>
             </div>
             
@@ -1055,13 +768,13 @@ class Nexus7Architect:
             <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:25px; margin-bottom:25px;">
                 <div style="background:#fef3c7; border:1px solid #fcd34d; padding:20px; border-radius:16px;">
                     <h4 style="margin-top:0; color:#92400e; font-family:var(--serif); font-size:0.9rem;">🌡️ Cultural Vibe Check</h4>
-                    <p style="font-size:0.85rem; color:#78350f; margin:10px 0 0 0; font-style:italic;">"{cultural_vibe}"</p>
+                    <p style="font-size:0.85rem; color:#78350f; margin:10px 0 0 0; font-style:italic;">"$cultural_vibe"</p>
                 </div>
                 <div style="background:#fefce8; border:1px solid #fef08a; padding:20px; border-radius:16px;">
                     <h4 style="margin-top:0; color:#854d0e; font-family:var(--serif); font-size:0.9rem;">⚪ White Space Topics</h4>
-                    <div style="display:flex; flex-wrap:wrap; gap:5px; margin-top:10px;">{white_space_html or '<span style="color:#64748b; font-size:0.8rem;">N/A</span>'}</div>
+                    <div style="display:flex; flex-wrap:wrap; gap:5px; margin-top:10px;">$white_space_html</div>
                 </div>
-                {attention_html}
+                $attention_html
             </div>
             
             <!-- ═══════════════════════════════════════════════════════════════ -->
@@ -1091,7 +804,7 @@ class Nexus7Architect:
                             <div style="margin-left:auto; background:#f59e0b; color:white; padding:3px 10px; border-radius:20px; font-size:0.65rem; font-weight:700;">PEER REVIEWED</div>
                         </div>
                         <div style="font-size:0.85rem; color:#78350f; line-height:1.6;">
-                            {scholar_html or '<p style="margin:0; font-style:italic;">No se detectaron hallazgos académicos específicos para esta categoría.</p>'}
+                            $scholar_html
                         </div>
                         <div style="margin-top:15px; padding-top:15px; border-top:1px dashed #fbbf24;">
                             <div style="display:flex; gap:8px; flex-wrap:wrap;">
@@ -1114,11 +827,11 @@ class Nexus7Architect:
                             <div style="margin-left:auto; background:#059669; color:white; padding:3px 10px; border-radius:20px; font-size:0.65rem; font-weight:700;">LIVE DATA</div>
                         </div>
                         <div style="font-size:0.85rem; color:#064e3b; line-height:1.6; margin-bottom:15px;">
-                            {sl.get('google_search_insights', 'Analizando tendencias de búsqueda...')}
+                            $google_search_insights
                         </div>
                         <div style="background:rgba(16,185,129,0.1); padding:12px; border-radius:10px; margin-top:10px;">
                             <div style="font-size:0.7rem; color:#047857; font-weight:800; margin-bottom:8px; display:flex; align-items:center; gap:5px;">📺 YOUTUBE SEARCH GAPS</div>
-                            <div style="font-size:0.8rem; color:#065f46; line-height:1.5;">{sl.get('youtube_search_gaps', 'N/A')}</div>
+                            <div style="font-size:0.8rem; color:#065f46; line-height:1.5;">$youtube_search_gaps</div>
                         </div>
                         <div style="margin-top:15px; background:white; padding:10px; border-radius:12px; border:1px solid #10b981;">
                             <div id="gt-loader" style="text-align:center; font-size:0.7rem; color:#64748b; padding:20px;">Analizando Tendencias...</div>
@@ -1145,7 +858,7 @@ class Nexus7Architect:
                                     <span style="font-size:0.7rem; font-weight:900; color:#15803d; text-transform:uppercase; letter-spacing:0.5px;">Fortalezas Validadas</span>
                                 </div>
                                 <ul style="padding-left:0; list-style:none; font-size:0.8rem; color:#166534; line-height:1.5; margin:0;">
-                                    {pros_html or '<li style="opacity:0.6;">Sin datos de fortalezas</li>'}
+                                    $pros_html
                                 </ul>
                             </div>
                             
@@ -1156,7 +869,7 @@ class Nexus7Architect:
                                     <span style="font-size:0.7rem; font-weight:900; color:#b91c1c; text-transform:uppercase; letter-spacing:0.5px;">Pain Points Críticos</span>
                                 </div>
                                 <ul style="padding-left:0; list-style:none; font-size:0.8rem; color:#991b1b; line-height:1.5; margin:0;">
-                                    {cons_html or '<li style="opacity:0.6;">Sin datos de debilidades</li>'}
+                                    $cons_html
                                 </ul>
                             </div>
                         </div>
@@ -1180,7 +893,7 @@ class Nexus7Architect:
                                 <span style="font-size:1rem;">🔴</span>
                                 <span style="font-size:0.75rem; font-weight:800; color:#ff4500;">REDDIT</span>
                             </div>
-                            <div style="font-size:0.8rem; color:#7c2d12; line-height:1.5;">{sl.get('reddit_insights', 'Analizando comunidades de Reddit...')}</div>
+                            <div style="font-size:0.8rem; color:#7c2d12; line-height:1.5;">$reddit_insights</div>
                         </div>
                         
                         <!-- TikTok Section -->
@@ -1189,7 +902,7 @@ class Nexus7Architect:
                                 <span style="font-size:1rem;">📱</span>
                                 <span style="font-size:0.75rem; font-weight:800; color:#0891b2;">TIKTOK</span>
                             </div>
-                            <div style="font-size:0.8rem; color:#164e63; line-height:1.5;">{sl.get('tiktok_trends', 'Monitoreando hashtags virales...')}</div>
+                            <div style="font-size:0.8rem; color:#164e63; line-height:1.5;">$tiktok_trends</div>
                         </div>
                     </div>
                     
@@ -1236,1136 +949,2026 @@ class Nexus7Architect:
                     </div>
                 </div>
             </div>
-        </div>"""
+        </div>""")
+# Textos por defecto del social listening mientras el scout no entrega el campo
+_SL_TEXT_DEFAULTS = {
+    "cultural_vibe": "Analizando el tono de la comunidad...",
+    "google_search_insights": "Analizando tendencias de búsqueda...",
+    "youtube_search_gaps": "N/A",
+    "reddit_insights": "Analizando comunidades de Reddit...",
+    "tiktok_trends": "Monitoreando hashtags virales...",
+}
+_DIFFERENTIATOR_DEFAULTS = ("Calidad superior validada", "Precio competitivo", "Experiencia de usuario única")
+_WHITE_SPACE_CHIP_TPL = Template('<span style="background:#fef3c7; color:#92400e; padding:4px 10px; border-radius:12px; font-size:0.75rem; font-weight:600; margin:3px;">$text</span>')
+_BRIEF_WHITE_SPACE_CHIP_TPL = Template('''
+            <span style="background:#fef3c7; color:#92400e; padding:5px 10px; border-radius:12px; font-size:0.7rem; font-weight:600; margin:3px; display:inline-block;">🔍 $text</span>''')
+
+# Fragmentos de estilo repetidos (cabeceras de tabla y badges emitidos por fila)
+_TH_STYLE = "text-align:left; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;"
+_PPC_BADGE = '<span style="background:#ef4444; color:white; padding:1px 5px; border-radius:3px; font-size:0.5rem; font-weight:800;">PPC</span>'
+_PPC_BADGE_SM = '<span style="background:#ef4444; color:white; padding:1px 4px; border-radius:3px; font-size:0.45rem; font-weight:800;">PPC</span>'
+_AI_DETECTED_BADGE = '<div style="margin-top:6px; font-size:0.55rem; color:#dc2626; font-weight:700;">⭐ DETECTADO POR IA</div>'
+_NO_PEAKS_HTML = '<div style="padding:20px; text-align:center; color:#64748b;">No se detectaron eventos de alto impacto.</div>'
+
+# ═══════════════════════════════════════════════════════════════════
+# TABLAS DE CLASIFICACIÓN — Matriz competitiva (Top 10)
+# ═══════════════════════════════════════════════════════════════════
+# (color, bg, badge) indexado por min(int(rating * 2), 10): <3.5 / 3.5 / 4.0 / 4.5+
+_RATING_TIERS = (
+    (("#991b1b", "#fee2e2", "REGULAR"),) * 7
+    + (("#c2410c", "#ffedd5", "BUENO"),)
+    + (("#854d0e", "#fef9c3", "MUY BUENO"),)
+    + (("#166534", "#dcfce7", "EXCELENTE"),) * 2
+)
+# (tier, color) indexado por min(int(price / 25), 2): <$25 / $25-50 / $50+
+_PRICE_TIERS = (
+    ("💰 Value", "#166534"),
+    ("⭐ Mid-Range", "#0369a1"),
+    ("💎 Premium", "#7c3aed"),
+)
+_STARS = tuple("★" * n + "☆" * (5 - n) for n in range(6))
+# Fila de la matriz competitiva (Top 10); los campos de texto llegan ya escapados
+_TOP10_ROW_TPL = Template("""
+            <tr>
+                <td style="text-align:center; font-weight:bold; color:var(--accent); font-size:1.2rem;">#$rank</td>
+                <td style="min-width:220px;">
+                    <strong style="color:var(--primary); font-size:0.95rem;">$name</strong>
+                    <div style="display:flex; gap:6px; margin-top:6px; flex-wrap:wrap; align-items:center;">
+                        <span style="background:#1e3a8a; color:white; padding:3px 8px; border-radius:4px; font-size:0.65rem; font-weight:700; font-family:monospace;">$asin</span>
+                        <span style="background:#f1f5f9; color:#475569; padding:3px 8px; border-radius:4px; font-size:0.7rem; font-weight:600;">$$$price</span>
+                        <span style="color:$price_color; font-size:0.65rem; font-weight:700;">$price_tier</span>
+                        $sponsored_badge
+                    </div>
+                    <div style="display:flex; gap:6px; margin-top:5px; flex-wrap:wrap; align-items:center;">
+                        <span style="font-size:0.6rem; font-weight:700; color:#334155;">$brand</span>
+                        <span style="font-size:0.6rem;">$country_flag $country_label</span>
+                        <span style="background:$ful_bg; color:$ful_color; padding:1px 5px; border-radius:3px; font-size:0.5rem; font-weight:800;">$ful_label</span>
+                        <span style="font-size:0.55rem; color:#64748b;">${seller_age}mo</span>
+                        $vel_html
+                    </div>
+                </td>
+                <td style="min-width:140px;">
+                    <div style="display:flex; flex-direction:column; gap:6px;">
+                        <div style="display:flex; align-items:center; gap:6px;">
+                            <span style="color:#f59e0b; font-size:1.1rem;">$stars</span>
+                            <span style="font-weight:800; color:$rating_color; font-size:0.95rem;">$rating</span>
+                        </div>
+                        <div style="display:flex; align-items:center; gap:8px;">
+                            <span style="font-size:0.7rem; color:#64748b;">📊 $reviews_display reseñas</span>
+                        </div>
+                        <span style="background:$rating_bg; color:$rating_color; padding:2px 6px; border-radius:3px; font-size:0.55rem; font-weight:800; width:fit-content;">$rating_badge</span>
+                    </div>
+                </td>
+                <td style="font-size:0.8rem; color:#166534; background: #f0fdf4; max-width:200px;">$adv</td>
+                <td style="font-size:0.8rem; color:#991b1b; background: #fef2f2; max-width:200px;">$vuln</td>
+                <td style="font-size:0.8rem; color:#1e40af; background: #eff6ff; font-weight:600; max-width:180px;">$gap</td>
+            </tr>""")
+# Colores por nivel para las filas de riesgo / pain points / escenarios (el resto usa el default azul)
+_RISK_IMPACT_COLORS = {"CRÍTICO": "#dc2626", "ALTO": "#f59e0b"}
+_PAIN_SEVERITY_COLORS = {"ALTO": "#dc2626", "MEDIO": "#f59e0b"}
+_SCENARIO_STYLE = {"conservative": ("#fef2f2", "#fca5a5"), "aggressive": ("#f0fdf4", "#86efac")}
+_SCENARIO_STYLE_DEFAULT = ("#eff6ff", "#93c5fd")
+
+# Detectores de fulfillment / origen del seller (orden = prioridad de match)
+_FULFILLMENT_CODES = ("AMZ", "FBA", "FBM")
+_FULFILLMENT_BG = {"AMZ": "#1e3a8a", "FBA": "#059669", "FBM": "#d97706"}
+_ORIGIN_BADGES = {
+    "CN": ("🇨🇳", "China"), "US": ("🇺🇸", "USA"), "AMZ": ("🏢", "Amazon"),
+    "AE": ("🇦🇪", "UAE"), "LV": ("🇱🇻", "Latvia"),
+}
+
+def _fulfillment_code(fulfillment) -> str:
+    """Devuelve AMZ / FBA / FBM según el campo fulfillment, o '' si no se reconoce."""
+    fl = str(fulfillment).upper()
+    for code in _FULFILLMENT_CODES:
+        if code in fl:
+            return code
+    return ""
+
+def _origin_code(seller_country, seller_name="") -> str:
+    """Devuelve CN / US / AMZ / AE / LV según el país (y nombre) del seller, o ''."""
+    sc = str(seller_country).upper()
+    if "CN" in sc:
+        return "CN"
+    if "US" in sc:
+        return "US"
+    if "AMZ" in sc or "AMAZON" in str(seller_name).upper():
+        return "AMZ"
+    if "AE" in sc:
+        return "AE"
+    if "LV" in sc:
+        return "LV"
+    return ""
+
+def _top10_row_vars(p: dict) -> dict:
+    """Prepara los valores (ya escapados/formateados) de una fila de _TOP10_ROW_TPL."""
+    get = p.get  # método ligado una vez por fila (~15 lookups)
+    rating = get('rating', 0)
+    reviews = get('reviews', 0)
+    price = get('price', 0)
+    seller_country = str(get('seller_country', 'N/A')).upper()
+    rev_velocity = int(get('review_velocity', 0))
+    sponsored = str(get('sponsored', 'No'))
+
+    # Rating color / price tier / stars: lookup en tablas de módulo
+    # half_stars ∈ 0..10 indexa ambas tablas: floor(rating) == half_stars // 2 para rating >= 0
+    # Se acota en float antes de int() (±inf no revienta); NaN (celdas vacías de POE) cae al tier 0
+    half_stars = 0 if math.isnan(rating) else int(max(0, min(rating * 2, 10)))
+    rating_color, rating_bg, rating_badge = _RATING_TIERS[half_stars]
+    price_tier, price_color = _PRICE_TIERS[0 if math.isnan(price) else int(max(0, min(price / 25, 2)))]
+
+    country_flag, country_label = _ORIGIN_BADGES.get(
+        _origin_code(seller_country, get('seller_name', 'N/A')),
+        ("🌐", seller_country if seller_country != "N/A" else "Global"),
+    )
+    ful_code = _fulfillment_code(get('fulfillment', 'N/A'))
+
+    # Review velocity indicator
+    vel_html = ""
+    if rev_velocity > 0:
+        if rev_velocity >= 200:
+            vel_html = f'<span style="color:#059669; font-size:0.6rem; font-weight:700;">🔥 {rev_velocity}/mo</span>'
+        elif rev_velocity >= 50:
+            vel_html = f'<span style="color:#d97706; font-size:0.6rem; font-weight:700;">📈 {rev_velocity}/mo</span>'
+        else:
+            vel_html = f'<span style="color:#64748b; font-size:0.6rem;">{rev_velocity}/mo</span>'
+
+    return {
+        "rank": get('rank', 'N/A'),
+        "name": _t(get('name', 'Product Name N/A')),
+        "asin": get('asin', 'N/A'),
+        "price": _fmt_price(price),
+        "price_color": price_color,
+        "price_tier": price_tier,
+        "sponsored_badge": _PPC_BADGE if sponsored and sponsored not in ("No", "N/A", "", "nan") else "",
+        "brand": _t(get('brand', 'N/A')),
+        "country_flag": country_flag,
+        "country_label": country_label,
+        "ful_bg": _FULFILLMENT_BG.get(ful_code, "#94a3b8"),
+        "ful_color": "white",
+        "ful_label": ful_code or "N/A",
+        "seller_age": int(get('seller_age_months', 0)),
+        "vel_html": vel_html,
+        "stars": _STARS[half_stars >> 1],
+        "rating_color": rating_color,
+        "rating": _fmt_rating(rating),
+        "reviews_display": _fmt_reviews(reviews),
+        "rating_bg": rating_bg,
+        "rating_badge": rating_badge,
+        "adv": _t(get('adv', 'N/A')),
+        "vuln": _t(get('vuln', 'N/A')),
+        "gap": _t(get('gap', 'N/A')),
+    }
+
+# Orden fijo de meses (calendario comercial, curva de demanda, fallback de trends)
+_MONTHS_ES = ("Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+              "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre")
+
+# Calendario comercial base (12 meses, siempre visible); el render lo trata como solo lectura
+_BASE_CALENDAR = {
+    "Enero": {"demand": 55, "commercial_date": "Año Nuevo / Rebajas", "opportunity": "Propósitos de año nuevo, productos de mejora personal", "icon": "🎯"},
+    "Febrero": {"demand": 65, "commercial_date": "San Valentín (14)", "opportunity": "Regalos, sets premium, productos para parejas", "icon": "💝"},
+    "Marzo": {"demand": 50, "commercial_date": "Primavera / Equinoccio", "opportunity": "Renovación, lanzamientos de temporada primavera", "icon": "🌸"},
+    "Abril": {"demand": 55, "commercial_date": "Semana Santa / Pascua", "opportunity": "Regalos familiares, productos estacionales", "icon": "✨"},
+    "Mayo": {"demand": 75, "commercial_date": "Día de la Madre (2do Dom)", "opportunity": "Sets regalo premium, productos de cuidado personal", "icon": "🌹"},
+    "Junio": {"demand": 70, "commercial_date": "Día del Padre (3er Dom)", "opportunity": "Productos masculinos, tecnología, herramientas", "icon": "👔"},
+    "Julio": {"demand": 85, "commercial_date": "Prime Day / Mid-Year Sales", "opportunity": "Deals agresivos, liquidaciones, ofertas flash", "icon": "⚡"},
+    "Agosto": {"demand": 70, "commercial_date": "Back to School", "opportunity": "Vuelta al cole, productos escolares, oficina", "icon": "📚"},
+    "Septiembre": {"demand": 65, "commercial_date": "Regreso / Labor Day", "opportunity": "Rutinas de otoño, productos de organización", "icon": "🎒"},
+    "Octubre": {"demand": 75, "commercial_date": "Halloween (31) / Pre-Q4", "opportunity": "Preparación para Q4, temáticos de temporada", "icon": "🎃"},
+    "Noviembre": {"demand": 100, "commercial_date": "Black Friday (4to Vie) / Cyber Monday", "opportunity": "MÁXIMO INVENTARIO - Deals más agresivos del año", "icon": "🔥"},
+    "Diciembre": {"demand": 95, "commercial_date": "Navidad / Holiday Season", "opportunity": "Regalos, bundles navideños, peak de ventas", "icon": "🎁"}
+}
+
+# Paleta de marcas (pie de market share, series de Google Trends, leyenda)
+_PIE_COLORS = ("#3b82f6", "#8b5cf6", "#06b6d4", "#10b981", "#f59e0b", "#ef4444", "#ec4899", "#6366f1")
+
+# Tarjetas de eventos pico por impacto: ((bg, borde, badge), (táctica, budget, inventario, promo) por defecto)
+_PEAK_IMPACT_STYLE = {
+    "Extreme": (("#fef2f2", "#fecaca", "#dc2626"),
+                ("Influencer UGC + Email blast", "40-50% del Q", "+200% vs promedio", "Bundle + 25% OFF")),
+    "High": (("#fff7ed", "#fed7aa", "#f97316"),
+             ("Social ads + Retargeting", "25-35% del Q", "+100% vs promedio", "15% OFF + Free Ship")),
+    "Medium": (("#f0fdf4", "#bbf7d0", "#22c55e"),
+               ("Contenido orgánico", "15-20% del Q", "+50% vs promedio", "10% cupón")),
+}
+
+# Demanda del calendario cuando el LLM marca un pico (Medium conserva la base)
+_PEAK_DEMAND = {"Extreme": 100, "High": 85}
+
+# Colores de la tarjeta mensual por nivel de demanda: (umbral, (bg, borde, badge)), de mayor a menor
+_DEMAND_TIERS = (
+    (95, ("#fef2f2", "#fecaca", "#dc2626")),
+    (80, ("#fff7ed", "#fed7aa", "#f97316")),
+    (65, ("#f0fdf4", "#bbf7d0", "#22c55e")),
+)
+_DEMAND_TIER_LOW = ("#f8fafc", "#e2e8f0", "#64748b")
+
+# Tarjeta mensual del calendario comercial (sección de estacionalidad)
+_CALENDAR_CARD_TPL = Template("""
+            <div style="background:$bg; padding:12px; border-radius:10px; border:1px solid $border; $shadow">
+                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
+                    <span style="font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">$icon $month</span>
+                    <span style="background:$badge; color:white; padding:2px 6px; border-radius:8px; font-size:0.55rem; font-weight:800;">$demand%</span>
+                </div>
+                <div style="font-size:0.75rem; color:var(--primary); font-weight:700; margin-bottom:4px;">$event</div>
+                <div style="font-size:0.6rem; color:#475569; line-height:1.3;">$strategy</div>
+                $ai_badge
+            </div>""")
+_PEAK_MONTH_SHADOW = "box-shadow: 0 4px 12px rgba(220,38,38,0.2);"
+
+def _calendar_card(month: str, data: dict) -> str:
+    """Una tarjeta del calendario; el evento/estrategia del LLM tienen prioridad sobre la base."""
+    demand = data["demand"]
+    bg, border, badge = next((style for threshold, style in _DEMAND_TIERS if demand >= threshold), _DEMAND_TIER_LOW)
+    return _CALENDAR_CARD_TPL.substitute(
+        bg=bg,
+        border=border,
+        badge=badge,
+        shadow=_PEAK_MONTH_SHADOW if demand >= 85 else "",
+        icon=data["icon"],
+        month=month,
+        demand=demand,
+        event=_t(data.get("llm_event", data["commercial_date"])),
+        strategy=_t(data.get("llm_strategy", data["opportunity"])),
+        ai_badge=_AI_DETECTED_BADGE if "llm_event" in data else "",
+    )
+
+# Estilo de las source cards por extensión: (bg, color de texto, icono)
+_EXT_STYLE = {
+    "PDF": ("#fef2f2", "#991b1b", "📕"),
+    "CSV": ("#f0fdf4", "#166534", "📊"),
+    "XLSX": ("#f0fdf4", "#166534", "📊"),
+    "PNG": ("#faf5ff", "#6b21a8", "🖼️"),
+    "JPG": ("#faf5ff", "#6b21a8", "🖼️"),
+    "JPEG": ("#faf5ff", "#6b21a8", "🖼️"),
+    "INTEL": ("#fff7ed", "#9a3412", "🧠"),
+}
+_EXT_STYLE_DEFAULT = ("#eff6ff", "#1e40af", "📄")
+
+_SOURCE_CARD_TPL = Template("""
+            <div class="source-card">
+                <div class="source-head">
+                    <span class="source-icon">$icon</span>
+                    <span class="source-ext" style="background:$bg; color:$color;">$ext</span>
+                </div>
+                <div class="source-name">$name</div>
+                <div class="source-summary">$summary</div>
+            </div>""")
+
+def _money(value) -> str:
+    """Formatea un importe como $1,234.56; valores no numéricos ('N/A', None) pasan tal cual."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"${value:,.2f}"
+    return f"${value}"
+
+def _js_json(obj) -> str:
+    """Serializa datos para Chart.js: JSON válido, compacto y sin escapar acentos."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+# Bloque Chart.js del dossier: los datos llegan como una isla JSON ($chart_data), el JS es fijo
+_CHART_JS_TPL = Template("""
+        <script id="nexus-chart-data" type="application/json">$chart_data</script>
+        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+        <script src="https://cdn.jsdelivr.net/npm/chartjs-plugin-datalabels@2"></script>
+        <script>
+            document.addEventListener("DOMContentLoaded", function() {
+                try {
+                    const D = JSON.parse(document.getElementById('nexus-chart-data').textContent);
+                    
+                    // Register datalabels plugin
+                    if (typeof ChartDataLabels !== 'undefined') {
+                        Chart.register(ChartDataLabels);
+                    }
+                    
+                    // Formatters compartidos por los tres gráficos (una sola instancia de cada función)
+                    const pct = function(value) { return value + '%'; };
+                    const pctIfLarge = function(value) { return value >= 10 ? value + '%' : ''; };
+                    const pieTooltip = function(context) { return context.label + ': ' + context.raw + '%'; };
+                    
+                    // Pie Chart: Market Share
+                    const pieEl = document.getElementById('pieChart');
+                    if (pieEl) {
+                        new Chart(pieEl, {
+                            type: 'doughnut',
+                            data: {
+                                labels: D.pie.labels,
+                                datasets: [{
+                                    data: D.pie.values,
+                                    backgroundColor: D.pie.colors,
+                                    borderWidth: 3,
+                                    borderColor: '#ffffff',
+                                    hoverBorderWidth: 4,
+                                    hoverOffset: 8
+                                }]
+                            },
+                            options: {
+                                responsive: true,
+                                maintainAspectRatio: false,
+                                cutout: '55%',
+                                plugins: {
+                                    legend: { display: false },
+                                    tooltip: {
+                                        callbacks: { label: pieTooltip },
+                                        backgroundColor: '#1e293b',
+                                        padding: 12,
+                                        cornerRadius: 8
+                                    },
+                                    datalabels: {
+                                        color: '#1e293b',
+                                        font: { weight: 'bold', size: 12 },
+                                        formatter: pctIfLarge,
+                                        anchor: 'end',
+                                        align: 'end',
+                                        offset: 5
+                                    }
+                                }
+                            }
+                        });
+                    }
+                    
+                    // Bar Chart: Seasonality
+                    const barEl = document.getElementById('lineChart');
+                    if (barEl) {
+                        new Chart(barEl, {
+                            type: 'bar',
+                            data: {
+                                labels: D.bar.labels,
+                                datasets: [{
+                                    label: 'Índice de Demanda',
+                                    data: D.bar.values,
+                                    backgroundColor: '#3b82f6',
+                                    borderWidth: 2,
+                                    borderRadius: 8
+                                }]
+                            },
+                            options: {
+                                responsive: true,
+                                maintainAspectRatio: false,
+                                scales: {
+                                    y: {
+                                        beginAtZero: true,
+                                        max: 110,
+                                        ticks: { callback: pct }
+                                    }
+                                },
+                                plugins: {
+                                    legend: { display: false },
+                                    datalabels: {
+                                        color: '#1e293b',
+                                        font: { weight: 'bold', size: 10 },
+                                        anchor: 'end',
+                                        align: 'top',
+                                        offset: 2,
+                                        formatter: pct
+                                    }
+                                }
+                            }
+                        });
+                    }
+                    
+                    // Google Trends Chart
+                    const gtEl = document.getElementById('googleTrendChart');
+                    if (gtEl) {
+                        new Chart(gtEl, {
+                            type: 'line',
+                            data: {
+                                labels: D.gt.labels,
+                                datasets: D.gt.datasets
+                            },
+                            options: {
+                                responsive: true,
+                                maintainAspectRatio: false,
+                                plugins: {
+                                    legend: { 
+                                        display: true,
+                                        position: 'bottom',
+                                        labels: { boxWidth: 12, font: { size: 10 } }
+                                    },
+                                    datalabels: { display: false }
+                                },
+                                scales: {
+                                    y: { beginAtZero: true, grid: { color: '#f1f5f9' } },
+                                    x: { grid: { display: false } }
+                                }
+                            }
+                        });
+                    }
+                } catch (e) {
+                    console.error("NEXUS Chart Error:", e);
+                } finally {
+                    const loader = document.getElementById('gt-loader');
+                    if (loader) loader.style.display = 'none';
+                }
+            });
+        </script>""")
 
-        # Section IV: Sales & Seasonality with Charts
-        sales_intel = s_data.get("sales_intelligence", {})
-        mkt_share = sales_intel.get("market_share_by_brand", [])
-        
-        # v2.6 GUARANTEED FALLBACK: Market Share will NEVER be empty
-        if not mkt_share:
-            top_products = s_data.get("top_10_products", [])
-            if top_products:
-                # Extract brands from top products and estimate market share
-                brand_counts = {}
-                for prod in top_products[:10]:
-                    brand = prod.get("brand", "").strip()
-                    if not brand or brand.lower() in ["n/a", "unknown", ""]:
-                        brand = prod.get("name", "Marca Genérica")[:20]
-                    brand_counts[brand] = brand_counts.get(brand, 0) + 1
-                
-                # Convert counts to percentages
-                total = sum(brand_counts.values())
-                mkt_share = [
-                    {"brand": b, "share": round((c / total) * 100)}
-                    for b, c in sorted(brand_counts.items(), key=lambda x: -x[1])
-                ][:5]
-            else:
-                # Ultimate fallback with realistic placeholder brands
-                anchor = s_data.get("scout_anchor", "Mercado")
-                mkt_share = [
-                    {"brand": "Líder de Mercado", "share": 35},
-                    {"brand": "Challenger #1", "share": 25},
-                    {"brand": "Challenger #2", "share": 20},
-                    {"brand": "Nicho Premium", "share": 12},
-                    {"brand": "Otros", "share": 8}
-                ]
-            logger.info(f"[Architect] ⚠️ Market Share was empty - generated {len(mkt_share)} brand entries.")
-        
-        # Build pie chart data - PRE-SERIALIZE FOR JS
-        pie_labels = [b.get("brand", "Unknown") for b in mkt_share]
-        pie_values = [b.get("share", 0) for b in mkt_share]
-        pie_colors = ["#3b82f6", "#8b5cf6", "#06b6d4", "#10b981", "#f59e0b", "#ef4444", "#ec4899", "#6366f1"]
+@lru_cache(maxsize=4096)
+def _esc_text(text: str) -> str:
+    """html.escape memoizado: marcas, nombres y hallazgos se repiten entre secciones y renders."""
+    return _esc(text, quote=False)
+
+def _t(value) -> str:
+    """Escapa un valor arbitrario para interpolarlo como texto HTML."""
+    return _esc_text(str(value))
+
+# Precio/rating del Top 10: pocos valores distintos ($19.99, 4.5...) y float->str no es barato
+@lru_cache(maxsize=256)
+def _fmt_price(price) -> str:
+    return f"{price:.2f}"
+
+@lru_cache(maxsize=256)
+def _fmt_rating(rating) -> str:
+    return f"{rating:.1f}"
+
+# Conteos de reseñas < 1000: tabla precalculada en vez de int->str por fila
+_SMALL_COUNTS = tuple(str(i) for i in range(1000))
+
+def _fmt_reviews(reviews) -> str:
+    """1234 -> '1.2K'; conteos pequeños enteros salen de _SMALL_COUNTS."""
+    if reviews >= 1000:
+        return f"{reviews/1000:.1f}K"
+    if type(reviews) is int and reviews >= 0:
+        return _SMALL_COUNTS[reviews]
+    return str(reviews)
+
+# Secciones de full_data por agente, en el orden en que se desempaquetan
+_AGENT_KEYS = ("scout", "integrator", "strategist", "mathematician", "senior_partner", "guardian")
+
+def _agent_sections(full_data: dict) -> tuple:
+    """Datos de cada agente en una sola pasada; una sección ausente o None cuenta como {}."""
+    get = full_data.get
+    return tuple(get(k) or {} for k in _AGENT_KEYS)
+
+# La configuración de logging la hace el entrypoint (main.py), no este módulo
+logger = logging.getLogger("NEXUS-7")
+
+# Pool de I/O compartido: la persistencia en Firestore no bloquea la respuesta del reporte
+_io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="nexus7-io")
+
+# Reintento con backoff exponencial solo para fallos transitorios de Firestore
+_FIRESTORE_RETRY = gapi_retry.Retry(
+    predicate=gapi_retry.if_exception_type(
+        gapi_exceptions.ServiceUnavailable,
+        gapi_exceptions.DeadlineExceeded,
+        gapi_exceptions.InternalServerError,
+        gapi_exceptions.TooManyRequests,
+    ),
+    initial=0.1, maximum=2.0, multiplier=2.0, timeout=10.0,
+)
+
+# Directorio de salida de dossiers y briefs: se resuelve y crea una sola vez al importar
+_STATIC_REPORTS_DIR = Path(__file__).resolve().parent.parent / "static" / "reports"
+_STATIC_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+
+# ═══════════════════════════════════════════════════════════════════
+# CACHE DE DOSSIERS — el HTML es determinista en full_data: re-vistas del
+# mismo análisis devuelven el reporte ya renderizado (LRU en memoria + TTL).
+# ═══════════════════════════════════════════════════════════════════
+_REPORT_CACHE_TTL = 3600  # segundos
+_REPORT_CACHE_MAX = 32
+_report_cache = OrderedDict()  # key -> (stored_at, gz_path, result)
+_report_cache_lock = threading.Lock()
+
+def _report_cache_key(full_data: dict):
+    """Hash estable de full_data (claves ordenadas); None si no es serializable."""
+    try:
+        payload = json.dumps(full_data, sort_keys=True, default=str, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+def _report_cache_get(key):
+    if key is None:
+        return None
+    with _report_cache_lock:
+        entry = _report_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, gz_path, result = entry
+        if time.monotonic() - stored_at > _REPORT_CACHE_TTL or not os.path.exists(gz_path):
+            del _report_cache[key]
+            return None
+        _report_cache.move_to_end(key)
+        return gz_path, dict(result)
+
+def _report_cache_put(key, gz_path: str, result: dict):
+    if key is None:
+        return
+    with _report_cache_lock:
+        _report_cache[key] = (time.monotonic(), gz_path, dict(result))
+        _report_cache.move_to_end(key)
+        while len(_report_cache) > _REPORT_CACHE_MAX:
+            _report_cache.popitem(last=False)
+
+def _write_gz_atomic(path, chunks):
+    """Comprime los bloques (str) a un temporal oculto y lo publica con os.replace.
+
+    El dashboard nunca ve un .gz a medio escribir, y dos escrituras del mismo
+    id (reintentos) no se intercalan: gana la última en terminar.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=".nexus7_", suffix=".tmp", dir=_STATIC_REPORTS_DIR)
+    try:
+        os.chmod(tmp, 0o644)  # mkstemp crea 0600; el servidor estático debe poder leerlo
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1) as f:
+            f.writelines(chunk.encode("utf-8") for chunk in chunks)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+class Nexus7Architect:
+    task_description = "Synthesize all agent outputs into a premium HTML report"
+    def __init__(self):
+        self.db = get_db()
+        self.role = "NEXUS-7 (Architect)"
+
+    @report_agent_activity
+    async def generate_report_artifacts(self, full_data: dict, include_html: bool = True, render_html: bool = True) -> dict:
+        """
+        Generates a premium, highly detailed HTML report.
+        Includes Scholar Audit, Stress Test, and Compliance Audit.
+        With include_html=False the dossier is only written to disk and html_content is None.
+        With render_html=False (dry run) only the Firestore record is persisted: no HTML, no file.
+        """
+        # El render es CPU-bound (miles de operaciones de string) + escritura a disco:
+        # se ejecuta en un hilo para no bloquear el event loop del gateway.
+        return await asyncio.to_thread(self._render_report, full_data, include_html, render_html)
+
+    def _render_report(self, full_data: dict, include_html: bool = True, render_html: bool = True) -> dict:
+        """Synchronous body of generate_report_artifacts (runs in a worker thread)."""
+        logger.info("[%s] Generating Premium Detailed Report...", self.role)
+
+        cache_key = _report_cache_key(full_data) if render_html else None
+        cached = _report_cache_get(cache_key)
+        if cached is not None:
+            gz_path, result = cached
+            logger.info("[%s] Cache hit — reutilizando dossier %s", self.role, result['id'])
+            if include_html:
+                with gzip.open(gz_path, "rb") as f:
+                    result["html_content"] = f.read().decode("utf-8")
+            return result
         
-        js_pie_labels = json.dumps(pie_labels)
-        js_pie_values = json.dumps(pie_values)
-        js_pie_colors = json.dumps(pie_colors[:len(pie_values)])
+        report_id = generate_id()
+        # Un único instante para todo el documento (cabecera, footer y registro)
+        now = timestamp_now()
+        genesis_date = now.strftime('%d %B, %Y')
+        s_data, i_data, st_data, m_data, p_data, g_data = _agent_sections(full_data)
 
+        # Fast-path: sin roadmap ni síntesis del strategist no hay dossier que construir
+        # (corrida upstream fallida) — evita renderizar y guardar un esqueleto vacío.
+        if not st_data.get("dynamic_roadmap") and not st_data.get("partner_summary"):
+            logger.warning("[%s] Strategist sin roadmap ni partner_summary — reporte omitido (insufficient_intel)", self.role)
+            return {"id": None, "type": "final_report", "error": "insufficient_intel"}
+
+        # Dynamic Title Generation based on Product Anchor
+        anchor_raw = s_data.get("product_anchor") or s_data.get("scout_anchor") or i_data.get("scout_anchor")
+        if not anchor_raw:
+             # Try keywords as fallback
+             kws = s_data.get("keywords", [])
+             if kws:
+                 anchor_raw = kws[0].get("term") if isinstance(kws[0], dict) else str(kws[0])
         
-        # Google Trends Serialization
-        js_gt_months = json.dumps(gt_months)
-        js_gt_datasets = json.dumps([
-            {
-                "label": k,
-                "data": v,
-                "borderColor": pie_colors[i % len(pie_colors)],
-                "backgroundColor": f"{pie_colors[i % len(pie_colors)]}22",
-                "borderWidth": 3,
-                "tension": 0.4,
-                "fill": True,
-                "pointRadius": 4,
-                "pointBackgroundColor": "#ffffff",
-                "pointBorderWidth": 2
-            } for i, (k, v) in enumerate(gt_series.items())
-        ])
+        final_anchor = anchor_raw if anchor_raw else "Producto Analizado"
+        # REGLA 1: Sanitizar el anchor — elimina paréntesis, traducciones y ruido
+        final_anchor = sanitize_product_name(final_anchor)
         
-        # Get seasonality data from LLM
-        seasonality = sales_intel.get("seasonality", {})
-        peaks = seasonality.get("peaks", [])
-        low_points = seasonality.get("low_points", [])
-        strategy_insight = seasonality.get("strategy_insight", "Análisis en progreso...")
+        niche_title = f"Dossier de Viabilidad: {final_anchor}"
+
+        if not render_html:
+            # Dry run: solo el registro en Firestore (verdict para inteligencia recursiva), sin HTML ni archivo
+            if self.db:
+                record = self._report_record(report_id, niche_title, st_data.get("dynamic_verdict", {}), now, None)
+                _io_pool.submit(self._save_report, record)
+            return {"id": report_id, "pdf_url": None, "html_content": None}
+
+        # Google Trends Data Extraction
+        gt_data = s_data.get("google_trends_raw", {})
+        gt_months = gt_data.get("months", [])
+        gt_series = gt_data.get("data", {})
         
-        # Build dynamic months data ONLY from LLM peaks
-        # Start with baseline, then adjust based on actual LLM data
-        months_data = {}
-        peak_events = {}
-        peak_strategies = {}
-        
-        # Process peaks from LLM
-        for peak in peaks:
-            month = peak.get("month", "")
-            event = peak.get("event", "")
-            impact = peak.get("impact", "Medium")
-            strategy = peak.get("strategy", "Optimizar inventario")
+        # v2.1 SAFETY GROUNDING: If live trends fail, simulate based on seasonality
+        if not gt_series:
+            sales_intel = s_data.get("sales_intelligence", {})
+            seasonality = sales_intel.get("seasonality", {})
+            monthly_demand = seasonality.get("monthly_demand", None)
+            if not monthly_demand:
+                # Generate flat simulated baseline instead of hardcoded values
+                import random
+                base = 70
+                monthly_demand = {m: max(40, base + random.randint(-10, 10)) for m in _MONTHS_ES}
+                logger.info("[%s] Using simulated flat demand baseline (source: SIMULATED)", self.role)
+            gt_months = list(monthly_demand.keys())
             
-            if month:
-                peak_events[month] = event
-                peak_strategies[month] = strategy
-                if impact == "Extreme":
-                    months_data[month] = 100
-                elif impact == "High":
-                    months_data[month] = 85
-                elif impact == "Medium":
-                    months_data[month] = 70
-                else:
-                    months_data[month] = 55
-        
-        # FULL 12-MONTH COMMERCIAL CALENDAR
-        # Base calendar with all commercial dates (always displayed)
-        full_year_calendar = {
-            "Enero": {"demand": 55, "commercial_date": "Año Nuevo / Rebajas", "opportunity": "Propósitos de año nuevo, productos de mejora personal", "icon": "🎯"},
-            "Febrero": {"demand": 65, "commercial_date": "San Valentín (14)", "opportunity": "Regalos, sets premium, productos para parejas", "icon": "💝"},
-            "Marzo": {"demand": 50, "commercial_date": "Primavera / Equinoccio", "opportunity": "Renovación, lanzamientos de temporada primavera", "icon": "🌸"},
-            "Abril": {"demand": 55, "commercial_date": "Semana Santa / Pascua", "opportunity": "Regalos familiares, productos estacionales", "icon": "✨"},
-            "Mayo": {"demand": 75, "commercial_date": "Día de la Madre (2do Dom)", "opportunity": "Sets regalo premium, productos de cuidado personal", "icon": "🌹"},
-            "Junio": {"demand": 70, "commercial_date": "Día del Padre (3er Dom)", "opportunity": "Productos masculinos, tecnología, herramientas", "icon": "👔"},
-            "Julio": {"demand": 85, "commercial_date": "Prime Day / Mid-Year Sales", "opportunity": "Deals agresivos, liquidaciones, ofertas flash", "icon": "⚡"},
-            "Agosto": {"demand": 70, "commercial_date": "Back to School", "opportunity": "Vuelta al cole, productos escolares, oficina", "icon": "📚"},
-            "Septiembre": {"demand": 65, "commercial_date": "Regreso / Labor Day", "opportunity": "Rutinas de otoño, productos de organización", "icon": "🎒"},
-            "Octubre": {"demand": 75, "commercial_date": "Halloween (31) / Pre-Q4", "opportunity": "Preparación para Q4, temáticos de temporada", "icon": "🎃"},
-            "Noviembre": {"demand": 100, "commercial_date": "Black Friday (4to Vie) / Cyber Monday", "opportunity": "MÁXIMO INVENTARIO - Deals más agresivos del año", "icon": "🔥"},
-            "Diciembre": {"demand": 95, "commercial_date": "Navidad / Holiday Season", "opportunity": "Regalos, bundles navideños, peak de ventas", "icon": "🎁"}
-        }
-        
-        # Merge LLM data into base calendar
-        for peak in peaks:
-            month = peak.get("month", "")
-            if month in full_year_calendar:
-                # LLM-detected event takes priority
-                full_year_calendar[month]["llm_event"] = peak.get("event", "")
-                full_year_calendar[month]["llm_strategy"] = peak.get("strategy", "")
-                full_year_calendar[month]["impact"] = peak.get("impact", "Medium")
-                # Adjust demand based on LLM impact
-                impact = peak.get("impact", "Medium")
-                if impact == "Extreme":
-                    full_year_calendar[month]["demand"] = 100
-                elif impact == "High":
-                    full_year_calendar[month]["demand"] = 85
+            # v2.6: Build dynamic trend series from Scout keywords instead of generic label
+            scout_keywords = s_data.get("keywords", [])
+            anchor_text = s_data.get("scout_anchor", "Mercado")
+            
+            if scout_keywords and len(scout_keywords) >= 2:
+                # Use first 3 real keywords from Scout data
+                base_vals = list(monthly_demand.values())
+                gt_series = {}
+                for i, kw_obj in enumerate(scout_keywords[:3]):
+                    kw_name = kw_obj.get("term", f"Keyword {i+1}") if isinstance(kw_obj, dict) else str(kw_obj)
+                    # Add slight variation per keyword
+                    variation = 1.0 - (i * 0.12)  # Each subsequent keyword trends slightly lower
+                    gt_series[kw_name] = [int(v * variation) for v in base_vals]
+            else:
+                # Fallback: Use anchor as a single descriptive series
+                anchor_short = anchor_text[:25] if anchor_text else "Interés General"
+                gt_series = {f"📈 {anchor_short}": list(monthly_demand.values())}
+            
+            logger.info("[Architect] Using simulated trends data with %d keyword series.", len(gt_series))
+
+        # ═══════════════════════════════════════════════════════════════════
+        # POE ENHANCEMENT v3.0: Extract new detailed sections
+        # ═══════════════════════════════════════════════════════════════════
+        buyer_personas = s_data.get("buyer_personas", [])
+        reviews_analysis = s_data.get("reviews_analysis", {})
+        price_tiers = s_data.get("price_tiers", {})
+        amazon_fees = s_data.get("amazon_fees_structure", {})
         
-        # Line chart data - all 12 months
-        line_labels = list(full_year_calendar.keys())
-        line_values = [full_year_calendar[m]["demand"] for m in line_labels]
+        # ═══════════════════════════════════════════════════════════════════
+        # POE v4.0: SEARCH TERMS INTELLIGENCE (Traffic & Demand Data)
+        # Fuente oficial de intención de usuario → Keywords vs. Conversión
+        # ═══════════════════════════════════════════════════════════════════
+        st_intel = full_data.get("search_terms_data", {}) or s_data.get("search_terms_intel", {})
+        has_search_intel = st_intel.get("has_search_data", False)
+        st_terms = st_intel.get("terms", [])[:15]  # Top 15 keywords
+        st_total_volume = st_intel.get("total_search_volume", 0)
+        st_avg_conversion = st_intel.get("avg_conversion_rate", 0.0)
+        st_top_keywords = st_intel.get("top_keywords", [])
+        st_source_file = st_intel.get("source_file", "NicheDetailsSearchTermsTab")
         
-        js_line_labels = json.dumps(line_labels)
-        js_line_values = json.dumps(line_values)
+        # Build Search Terms & Traffic Section HTML (combines ProductsTab + SearchTermsTab)
+        # Extract product traffic data from top_10_products
+        traffic_products = s_data.get("top_10_products", [])
+        has_product_traffic = any(
+            p.get("sales", 0) > 0 or p.get("click_share", 0) > 0 or p.get("revenue", 0) > 0 
+            for p in traffic_products
+        )
         
-        # Build FULL 12-month calendar HTML
-        calendar_html = ""
-        for month, data in full_year_calendar.items():
-            demand = data["demand"]
-            is_peak = demand >= 85
-            is_high = demand >= 70
-            is_medium = demand >= 55
-            has_llm = "llm_event" in data
+        search_terms_section_html = ""
+        if has_search_intel or has_product_traffic:
+            # ── Aggregate product traffic KPIs ──
+            # Una sola pasada: cada campo se lee una vez por producto
+            total_revenue = total_sales = 0
+            click_shares = []
+            for p in traffic_products:
+                revenue, sales, click = p.get("revenue"), p.get("sales"), p.get("click_share")
+                if isinstance(revenue, (int, float)):
+                    total_revenue += revenue
+                if isinstance(sales, (int, float)):
+                    total_sales += sales
+                if isinstance(click, (int, float)) and click > 0:
+                    click_shares.append(click)
+            avg_product_click_share = round(sum(click_shares) / len(click_shares), 1) if click_shares else 0
+            
+            # Volume display
+            if has_search_intel and st_terms:
+                top_kw_name = st_terms[0].get("term", "N/A")
+                top_kw_vol = st_terms[0].get("volume", 0)
+                if st_total_volume >= 1_000_000:
+                    vol_display = f"{st_total_volume/1_000_000:.1f}M"
+                elif st_total_volume >= 1_000:
+                    vol_display = f"{st_total_volume/1_000:.0f}K"
+                else:
+                    vol_display = str(st_total_volume)
+            else:
+                top_kw_name = "N/A"
+                top_kw_vol = 0
+                vol_display = "—"
+            
+            # Revenue display
+            if total_revenue >= 1_000_000:
+                rev_display = f"${total_revenue/1_000_000:.1f}M"
+            elif total_revenue >= 1_000:
+                rev_display = f"${total_revenue/1_000:.0f}K"
+            elif total_revenue > 0:
+                rev_display = f"${total_revenue:,.0f}"
+            else:
+                rev_display = "—"
+            
+            # Sales display
+            if total_sales >= 1_000:
+                sales_display = f"{total_sales/1_000:.1f}K"
+            elif total_sales > 0:
+                sales_display = f"{total_sales:,}"
+            else:
+                sales_display = "—"
+            
+            # ── Build Product Traffic Rows ──
+            product_traffic_parts = []
+            if has_product_traffic:
+                sorted_products = sorted(traffic_products, key=lambda x: x.get("revenue", 0) or x.get("sales", 0) or 0, reverse=True)
+                for i, p in enumerate(sorted_products[:15]):
+                    p_name = p.get("name", p.get("title", f"Product {i}"))[:55]
+                    p_asin = p.get("asin", "N/A")
+                    p_sales = p.get("sales", 0)
+                    p_revenue = p.get("revenue", 0)
+                    p_click = p.get("click_share", 0)
+                    p_price = p.get("price", 0)
+                    p_fees = p.get("fees", 0)
+                    p_brand = p.get("brand", "N/A")
+                    p_ful_code = _fulfillment_code(p.get("fulfillment", "N/A"))
+                    p_origin = _origin_code(p.get("seller_country", "N/A"))
+                    p_rev_vel = int(p.get("review_velocity", 0))
+                    p_weight = p.get("weight", "N/A")
+                    p_sponsored = str(p.get("sponsored", "No"))
+                    p_seller_age = int(p.get("seller_age_months", 0))
+                    p_recent = int(p.get("recent_purchases", 0))
+                    
+                    # Revenue display
+                    if isinstance(p_revenue, (int, float)) and p_revenue >= 1000:
+                        p_rev_str = f"${p_revenue/1000:.1f}K"
+                    elif isinstance(p_revenue, (int, float)) and p_revenue > 0:
+                        p_rev_str = f"${p_revenue:,.0f}"
+                    else:
+                        p_rev_str = "—"
+                    
+                    # Sales display
+                    p_sales_str = f"{p_sales:,}" if isinstance(p_sales, (int, float)) and p_sales > 0 else "—"
+                    
+                    # Click share bar
+                    p_click_bar = min(100, p_click * 3) if isinstance(p_click, (int, float)) else 0
+                    p_click_str = f"{p_click:.1f}%" if isinstance(p_click, (int, float)) and p_click > 0 else "—"
+                    
+                    # Fees display
+                    p_fees_str = f"${p_fees:.2f}" if isinstance(p_fees, (int, float)) and p_fees > 0 else "—"
+                    
+                    # Fulfillment badge
+                    pf_bg = _FULFILLMENT_BG.get(p_ful_code, "#94a3b8")
+                    pf_label = p_ful_code or "—"
+                    
+                    # Country flag (esta tabla solo distingue CN / US / AMZ)
+                    pf_flag = _ORIGIN_BADGES[p_origin][0] if p_origin in ("CN", "US", "AMZ") else "🌐"
+                    
+                    # PPC badge
+                    ppc_html = ""
+                    if p_sponsored and p_sponsored not in ("No", "N/A", "", "nan"):
+                        ppc_html = _PPC_BADGE_SM
+                    
+                    # Review velocity
+                    vel_str = f"{p_rev_vel}/mo" if p_rev_vel > 0 else "—"
+                    vel_color = "#059669" if p_rev_vel >= 100 else ("#d97706" if p_rev_vel >= 30 else "#64748b")
+                    
+                    product_traffic_parts.append(f'''
+                    <tr style="border-bottom:1px solid #f1f5f9;">
+                        <td style="padding:10px 12px; font-size:0.8rem;">
+                            <div style="display:flex; align-items:center; gap:8px;">
+                                <span style="background:#1e3a8a; color:white; width:22px; height:22px; border-radius:6px; display:flex; align-items:center; justify-content:center; font-size:0.6rem; font-weight:800;">{i+1}</span>
+                                <div>
+                                    <div style="font-weight:600; color:var(--primary); font-size:0.75rem;">{_t(p_name)}</div>
+                                    <div style="display:flex; gap:4px; align-items:center; margin-top:3px; flex-wrap:wrap;">
+                                        <span style="font-family:monospace; font-size:0.55rem; color:#64748b;">{p_asin}</span>
+                                        <span style="font-size:0.55rem; font-weight:700; color:#334155;">{_t(p_brand)}</span>
+                                        <span style="font-size:0.5rem;">{pf_flag}</span>
+                                        <span style="background:{pf_bg}; color:white; padding:0px 4px; border-radius:2px; font-size:0.45rem; font-weight:800;">{pf_label}</span>
+                                        {ppc_html}
+                                    </div>
+                                </div>
+                            </div>
+                        </td>
+                        <td style="padding:10px 8px; font-family:monospace; font-weight:700; color:#0f172a; font-size:0.85rem;">${p_price:.2f}</td>
+                        <td style="padding:10px 8px; font-family:monospace; font-weight:700; color:#0f172a; font-size:0.85rem;">{p_sales_str}</td>
+                        <td style="padding:10px 8px; font-family:monospace; font-weight:700; color:#059669; font-size:0.85rem;">{p_rev_str}</td>
+                        <td style="padding:10px 8px;">
+                            <div style="display:flex; align-items:center; gap:6px;">
+                                <div style="flex:1; background:#e2e8f0; border-radius:4px; height:8px; max-width:50px;">
+                                    <div style="width:{p_click_bar}%; background:linear-gradient(90deg, #f59e0b, #ef4444); height:100%; border-radius:4px;"></div>
+                                </div>
+                                <span style="font-size:0.7rem; color:#475569; font-weight:600;">{p_click_str}</span>
+                            </div>
+                        </td>
+                        <td style="padding:10px 8px; font-family:monospace; font-size:0.75rem; color:{vel_color}; font-weight:600;">{vel_str}</td>
+                        <td style="padding:10px 8px; font-family:monospace; font-size:0.75rem; color:#64748b;">{p_fees_str}</td>
+                    </tr>''')
+            product_traffic_rows = "".join(product_traffic_parts)
             
-            # Colors based on demand level
-            if demand >= 95:
-                bg_color, border_color, badge_color = "#fef2f2", "#fecaca", "#dc2626"
-            elif demand >= 80:
-                bg_color, border_color, badge_color = "#fff7ed", "#fed7aa", "#f97316"
-            elif demand >= 65:
-                bg_color, border_color, badge_color = "#f0fdf4", "#bbf7d0", "#22c55e"
-            else:
-                bg_color, border_color, badge_color = "#f8fafc", "#e2e8f0", "#64748b"
+            # ── Build Keyword Rows (existing logic) ──
+            kw_row_parts = []
+            if has_search_intel and st_terms:
+                for i, term in enumerate(st_terms):
+                    t_name = term.get("term", "N/A")
+                    t_vol = term.get("volume", 0)
+                    t_growth = term.get("growth_90d", "N/A")
+                    t_click = term.get("click_share", 0)
+                    t_conv = term.get("conversion_rate", 0)
+                    
+                    growth_str = str(t_growth)
+                    if isinstance(t_growth, (int, float)):
+                        growth_color = "#166534" if t_growth > 0 else "#dc2626"
+                        growth_str = f"+{t_growth}%" if t_growth > 0 else f"{t_growth}%"
+                    else:
+                        growth_color = "#64748b"
+                    
+                    if isinstance(t_conv, (int, float)):
+                        conv_color = "#166534" if t_conv >= 15 else ("#f59e0b" if t_conv >= 8 else "#dc2626")
+                        conv_str = f"{t_conv:.1f}%"
+                    else:
+                        conv_color = "#64748b"
+                        conv_str = str(t_conv)
+                    
+                    click_bar_w = min(100, t_click * 3) if isinstance(t_click, (int, float)) else 10
+                    t_vol_display = f"{t_vol/1000:.1f}K" if isinstance(t_vol, (int, float)) and t_vol >= 1000 else str(t_vol)
+                    
+                    kw_row_parts.append(f'''
+                    <tr style="border-bottom:1px solid #f1f5f9;">
+                        <td style="padding:10px 12px; font-weight:600; color:var(--primary); font-size:0.85rem;">
+                            <div style="display:flex; align-items:center; gap:8px;">
+                                <span style="background:#6366f1; color:white; width:22px; height:22px; border-radius:6px; display:flex; align-items:center; justify-content:center; font-size:0.6rem; font-weight:800;">{i+1}</span>
+                                {_t(t_name)}
+                            </div>
+                        </td>
+                        <td style="padding:10px 12px; font-family:monospace; font-weight:700; color:#0f172a; font-size:0.9rem;">{t_vol_display}</td>
+                        <td style="padding:10px 12px;"><span style="color:{growth_color}; font-weight:700; font-size:0.8rem;">{growth_str}</span></td>
+                        <td style="padding:10px 12px;">
+                            <div style="display:flex; align-items:center; gap:8px;">
+                                <div style="flex:1; background:#e2e8f0; border-radius:4px; height:8px; max-width:80px;">
+                                    <div style="width:{click_bar_w}%; background:linear-gradient(90deg, #3b82f6, #6366f1); height:100%; border-radius:4px;"></div>
+                                </div>
+                                <span style="font-size:0.75rem; color:#475569; font-weight:600;">{t_click}%</span>
+                            </div>
+                        </td>
+                        <td style="padding:10px 12px; text-align:center;"><span style="background:{'#dcfce7' if conv_color == '#166534' else '#fef9c3' if conv_color == '#f59e0b' else '#fee2e2'}; color:{conv_color}; padding:3px 10px; border-radius:8px; font-size:0.75rem; font-weight:700;">{conv_str}</span></td>
+                    </tr>''')
+            kw_rows_html = "".join(kw_row_parts)
             
-            # Show LLM event if available, otherwise commercial date
-            event_name = data.get("llm_event", data["commercial_date"])
-            strategy = data.get("llm_strategy", data["opportunity"])
-            icon = data["icon"]
+            # ── Opportunity detection ──
+            opp_section_html = ""
+            if has_search_intel and st_terms:
+                opp_terms = [t for t in st_terms if isinstance(t.get("conversion_rate"), (int, float)) and t["conversion_rate"] >= 15 and isinstance(t.get("volume"), (int, float)) and t["volume"] < st_total_volume * 0.1]
+                if opp_terms:
+                    opp_chip_parts = []
+                    for ot in opp_terms[:3]:
+                        opp_chip_parts.append(f'<span style="background:#ecfdf5; color:#065f46; padding:4px 12px; border-radius:8px; font-size:0.75rem; font-weight:600; margin:3px;">🎯 {_t(ot["term"])} ({ot["conversion_rate"]:.1f}% conv)</span>')
+                    opp_chips = "".join(opp_chip_parts)
+                    opp_section_html = f"""<div style="background:linear-gradient(135deg, #ecfdf5 0%, #f0fdf4 100%); border:2px solid #86efac; padding:20px; border-radius:16px; margin-bottom:20px;">
+                        <div style="display:flex; align-items:center; gap:10px; margin-bottom:12px;">
+                            <span style="font-size:1.2rem;">💡</span>
+                            <span style="font-weight:700; color:#065f46; font-size:0.9rem;">Oportunidades de Alta Conversión Detectadas</span>
+                        </div>
+                        <div style="font-size:0.8rem; color:#064e3b; margin-bottom:12px;">Keywords con conversión ≥15% representan oportunidades de nicho con demanda verificada:</div>
+                        <div style="display:flex; flex-wrap:wrap; gap:6px;">{opp_chips}</div>
+                    </div>"""
             
-            calendar_html += f'''
-            <div style="background:{bg_color}; padding:12px; border-radius:10px; border:1px solid {border_color}; {'box-shadow: 0 4px 12px rgba(220,38,38,0.2);' if is_peak else ''}">
-                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
-                    <span style="font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">{icon} {month}</span>
-                    <span style="background:{badge_color}; color:white; padding:2px 6px; border-radius:8px; font-size:0.55rem; font-weight:800;">{demand}%</span>
-                </div>
-                <div style="font-size:0.75rem; color:var(--primary); font-weight:700; margin-bottom:4px;">{event_name}</div>
-                <div style="font-size:0.6rem; color:#475569; line-height:1.3;">{strategy}</div>
-                {'<div style="margin-top:6px; font-size:0.55rem; color:#dc2626; font-weight:700;">⭐ DETECTADO POR IA</div>' if has_llm else ''}
-            </div>'''
-        
-        # Build peak events detail HTML from LLM data
-        peak_events_html = ""
-        if peaks:
-            for p in peaks:
-                impact = p.get("impact", "Medium")
-                month = p.get("month", "")
-                event = p.get("event", "")
-                strategy = p.get("strategy", "Optimizar presencia y stock")
-                
-                bg_gradient = "#fef2f2" if impact == "Extreme" else "#fff7ed" if impact == "High" else "#f0fdf4"
-                border_c = "#fecaca" if impact == "Extreme" else "#fed7aa" if impact == "High" else "#bbf7d0"
-                badge_c = "#dc2626" if impact == "Extreme" else "#f97316" if impact == "High" else "#22c55e"
-                
-                # Use strategy from LLM, with fallbacks based on impact
-                tactic = p.get("tactic", "Influencer UGC + Email blast" if impact == "Extreme" else "Social ads + Retargeting" if impact == "High" else "Contenido orgánico")
-                budget = p.get("budget", "40-50% del Q" if impact == "Extreme" else "25-35% del Q" if impact == "High" else "15-20% del Q")
-                inventory = p.get("inventory", "+200% vs promedio" if impact == "Extreme" else "+100% vs promedio" if impact == "High" else "+50% vs promedio")
-                promo = p.get("promo", "Bundle + 25% OFF" if impact == "Extreme" else "15% OFF + Free Ship" if impact == "High" else "10% cupón")
+            # ── Build demand vs supply cross-reference ──
+            cross_ref_html = ""
+            if has_search_intel and has_product_traffic and st_total_volume > 0 and total_sales > 0:
+                demand_supply_ratio = round(st_total_volume / max(total_sales, 1), 1)
+                if demand_supply_ratio > 5:
+                    ds_verdict = "🟢 Alta Demanda Insatisfecha"
+                    ds_color = "#059669"
+                    ds_hint = "El volumen de búsqueda supera ampliamente las ventas actuales → oportunidad de captura."
+                elif demand_supply_ratio > 2:
+                    ds_verdict = "🟡 Demanda Moderada"
+                    ds_color = "#d97706"
+                    ds_hint = "Hay espacio en el mercado, pero la competencia ya captura una parte significativa."
+                else:
+                    ds_verdict = "🔴 Mercado Saturado"
+                    ds_color = "#dc2626"
+                    ds_hint = "Las ventas están cerca del techo de búsqueda → diferenciación crítica para entrar."
                 
-                peak_events_html += f'''
-                <div style="background:linear-gradient(135deg, {bg_gradient} 0%, white 100%); padding:20px; border-radius:12px; border:1px solid {border_c};">
-                    <div style="display:flex; justify-content:space-between; align-items:flex-start; margin-bottom:12px;">
-                        <div>
-                            <div style="font-size:0.65rem; color:#64748b; font-weight:800; text-transform:uppercase;">{month}</div>
-                            <div style="font-weight:700; color:var(--primary); font-size:1rem; margin:4px 0;">{event}</div>
+                cross_ref_html = f"""
+                <div style="background:linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%); border:2px solid #e2e8f0; padding:20px; border-radius:16px; margin-bottom:20px;">
+                    <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px;">
+                        <div style="display:flex; align-items:center; gap:10px;">
+                            <span style="font-size:1.3rem;">⚡</span>
+                            <span style="font-weight:700; color:var(--primary); font-size:0.9rem;">Cruce Demanda vs. Oferta (Keywords → Ventas)</span>
                         </div>
-                        <span style="background:{badge_c}; color:white; padding:4px 10px; border-radius:6px; font-size:0.65rem; font-weight:800;">{impact}</span>
+                        <span style="color:{ds_color}; font-weight:800; font-size:0.85rem;">{ds_verdict}</span>
                     </div>
-                    <div style="display:grid; grid-template-columns: 1fr 1fr; gap:12px; margin-top:12px;">
-                        <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">📈 TÁCTICA MARKETING</div>
-                            <div style="font-size:0.75rem; color:var(--primary);">{tactic}</div>
-                        </div>
-                        <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">💰 BUDGET SUGERIDO</div>
-                            <div style="font-size:0.75rem; color:#f97316; font-weight:600;">{budget}</div>
+                    <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:15px;">
+                        <div style="text-align:center; padding:12px; background:white; border-radius:10px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase;">BÚSQUEDAS/MES</div>
+                            <div style="font-size:1.4rem; font-weight:800; color:#6366f1;">{vol_display}</div>
                         </div>
-                        <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">📦 INVENTARIO</div>
-                            <div style="font-size:0.75rem; color:var(--primary);">{inventory}</div>
+                        <div style="text-align:center; padding:12px; background:white; border-radius:10px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase;">UNIDADES VENDIDAS/MES</div>
+                            <div style="font-size:1.4rem; font-weight:800; color:#059669;">{sales_display}</div>
                         </div>
-                        <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
-                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">🏷️ PROMO SUGERIDA</div>
-                            <div style="font-size:0.75rem; color:var(--primary);">{promo}</div>
+                        <div style="text-align:center; padding:12px; background:white; border-radius:10px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase;">RATIO DEMANDA/OFERTA</div>
+                            <div style="font-size:1.4rem; font-weight:800; color:{ds_color};">{demand_supply_ratio}x</div>
                         </div>
                     </div>
-                    <div style="margin-top:12px; padding-top:12px; border-top:1px dashed #e2e8f0;">
-                        <div style="font-size:0.65rem; color:#64748b;">💡 <strong>Insight:</strong> {strategy}</div>
-                    </div>
-                </div>'''
-        else:
-            peak_events_html = '<div style="padding:20px; text-align:center; color:#64748b;">No se detectaron eventos de alto impacto.</div>'
-        
-        # Financial Data Card Construction
-        fin_data = i_data.get("financial_data", {})
-        financial_html = ""
-        if fin_data.get("has_financial_data"):
-            avg_price = fin_data.get("avg_price", 0)
-            avg_fees = fin_data.get("avg_fees", 0)
-            avg_margin = fin_data.get("net_margin_percent", 0)
-            active_sellers = fin_data.get("avg_active_sellers", 1)
-            dimensions = fin_data.get("common_dimensions", "N/A")
-            click_share = fin_data.get("avg_click_share", 0)
-            
-            # Color logic for margin
-            margin_color = "#166534" if avg_margin > 20 else ("#f59e0b" if avg_margin > 10 else "#dc2626")
+                    <div style="font-size:0.75rem; color:#475569; margin-top:12px; padding:10px; background:white; border-radius:8px; border-left:3px solid {ds_color};">{ds_hint}</div>
+                </div>"""
             
-            financial_html = f'''
-            <!-- Unit Economics & Logistics Card -->
-            <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; padding:25px; margin-top:25px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.02);">
-                 <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:20px;">
-                    <h4 style="margin:0; color:var(--primary); font-family:var(--serif); display:flex; align-items:center; gap:10px;">
-                        💰 Unit Economics & Logística Real
-                    </h4>
-                    <span style="background:#f0f9ff; color:#0369a1; padding:4px 12px; border-radius:20px; font-size:0.7rem; font-weight:800; border:1px solid #bae6fd;">DATA FINANCIERA VERIFICADA</span>
-                 </div>
-                 
-                 <div style="display:grid; grid-template-columns: repeat(4, 1fr); gap:20px;">
-                    <!-- Price Structure -->
-                    <div style="background:#f8fafc; padding:15px; border-radius:12px; border:1px solid #e2e8f0;">
-                        <div style="font-size:0.65rem; color:#64748b; font-weight:800; text-transform:uppercase; margin-bottom:8px;">ESTRUCTURA DE PRECIO</div>
-                        <div style="display:flex; justify-content:space-between; align-items:baseline; margin-bottom:4px;">
-                            <span style="font-size:0.8rem; color:#475569;">Precio Promedio</span>
-                            <span style="font-size:1rem; font-weight:700; color:var(--primary);">${avg_price}</span>
-                        </div>
-                        <div style="display:flex; justify-content:space-between; align-items:baseline;">
-                            <span style="font-size:0.8rem; color:#475569;">FBA Fees</span>
-                            <span style="font-size:0.9rem; font-weight:600; color:#dc2626;">-${avg_fees}</span>
-                        </div>
-                        <div style="margin-top:8px; padding-top:8px; border-top:1px dashed #cbd5e1; display:flex; justify-content:space-between; align-items:baseline;">
-                            <span style="font-size:0.8rem; font-weight:700; color:#1e293b;">Margen Neto Est.</span>
-                            <span style="font-size:1.1rem; font-weight:800; color:{margin_color};">{avg_margin}%</span>
-                        </div>
-                    </div>
+            # ── Build Logistics & Seller Intelligence Card ──
+            seller_intel_html = ""
+            if has_product_traffic and len(traffic_products) > 0:
+                # Seller origin distribution
+                origins = {"CN": 0, "US": 0, "AMZ": 0, "Other": 0}
+                ful_dist = {"AMZ": 0, "FBA": 0, "FBM": 0, "Other": 0}
+                total_weight = 0
+                weight_count = 0
+                total_seller_age = 0
+                age_count = 0
+                ppc_count = 0
+                total_images = 0
+                img_count = 0
+                for tp in traffic_products:
+                    origin = _origin_code(tp.get("seller_country", "N/A"), tp.get("seller_name", ""))
+                    origins[origin if origin in origins else "Other"] += 1
+                    ful_dist[_fulfillment_code(tp.get("fulfillment", "N/A")) or "Other"] += 1
                     
-                    <!-- Competition Intensity -->
-                    <div style="background:#fff7ed; padding:15px; border-radius:12px; border:1px solid #ffedd5;">
-                        <div style="font-size:0.65rem; color:#9a3412; font-weight:800; text-transform:uppercase; margin-bottom:8px;">INTENSIDAD COMPETITIVA</div>
-                        <div style="text-align:center; margin-top:10px;">
-                            <div style="font-size:2rem; font-weight:800; color:#c2410c;">{active_sellers}</div>
-                            <div style="font-size:0.7rem; color:#9a3412; font-weight:600;">Vendedores Activos Promedio</div>
-                        </div>
-                    </div>
+                    w = tp.get("weight_lbs", 0)
+                    if isinstance(w, (int, float)) and w > 0:
+                        total_weight += w
+                        weight_count += 1
                     
-                    <!-- Logistics -->
-                    <div style="background:#f0fdf4; padding:15px; border-radius:12px; border:1px solid #dcfce7;">
-                        <div style="font-size:0.65rem; color:#166534; font-weight:800; text-transform:uppercase; margin-bottom:8px;">LOGÍSTICA & DIMENSIONES</div>
-                        <div style="display:flex; align-items:center; gap:10px; margin-top:10px;">
-                            <div style="font-size:1.5rem;">📦</div>
-                            <div>
-                                <div style="font-size:0.8rem; font-weight:700; color:#15803d;">{dimensions}</div>
-                                <div style="font-size:0.65rem; color:#166534;">Tamaño Estándar Detectado</div>
-                            </div>
-                        </div>
-                    </div>
+                    sa = int(tp.get("seller_age_months", 0))
+                    if sa > 0:
+                        total_seller_age += sa
+                        age_count += 1
                     
-                    <!-- Market Attention -->
-                    <div style="background:#f5f3ff; padding:15px; border-radius:12px; border:1px solid #ede9fe;">
-                        <div style="font-size:0.65rem; color:#6b21a8; font-weight:800; text-transform:uppercase; margin-bottom:8px;">RETENCIÓN DE ATENCIÓN</div>
-                        <div style="text-align:center; margin-top:10px;">
-                            <div style="font-size:2rem; font-weight:800; color:#7c3aed;">{click_share}%</div>
-                            <div style="font-size:0.7rem; color:#6b21a8; font-weight:600;">Click Share Promedio</div>
-                        </div>
-                    </div>
-                 </div>
-            </div>
-            '''
-
-        # Build the sales section HTML with dynamic data
-        sales_section_html = f"""
-        <div style="margin-top:20px;">
-            {financial_html}
-            <!-- Charts Row -->
-            <div style="display:grid; grid-template-columns: 1fr 1.5fr; gap:30px; margin-bottom:30px; margin-top:25px;">
-                <!-- Pie Chart: Market Share with Percentages -->
-                <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; padding:30px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.02);">
-                    <h4 style="margin:0 0 20px 0; color:var(--primary); font-family:var(--serif); display:flex; align-items:center; gap:10px;">
-                        📊 Market Share por Marca
-                        <span style="background:#3b82f6; color:white; padding:2px 8px; border-radius:10px; font-size:0.6rem; font-weight:700;">TOP {len(pie_labels) if pie_labels else 5}</span>
-                    </h4>
-                    <div style="position:relative; height:280px;">
-                        <canvas id="pieChart"></canvas>
-                    </div>
-                    <!-- Legend with percentages -->
-                    <div style="display:flex; flex-wrap:wrap; gap:8px; margin-top:15px; padding-top:15px; border-top:1px solid #e2e8f0;">
-                        {(''.join([f'<span style="display:flex; align-items:center; gap:4px; font-size:0.7rem; color:#475569;"><span style="width:10px; height:10px; border-radius:50%; background:{pie_colors[i] if i < len(pie_colors) else "#6366f1"};"></span>{pie_labels[i] if i < len(pie_labels) else "N/A"}: <strong>{pie_values[i] if i < len(pie_values) else 0}%</strong></span>' for i in range(min(len(pie_labels), 5))]) if pie_labels else '<span style="color:#94a3b8; font-size:0.75rem;">Sin datos de marcas</span>')}
-                    </div>
-                </div>
+                    sp = str(tp.get("sponsored", "No"))
+                    if sp and sp not in ("No", "N/A", "", "nan"):
+                        ppc_count += 1
+                    
+                    im = int(tp.get("images_count", 0))
+                    if im > 0:
+                        total_images += im
+                        img_count += 1
+                
+                n_prods = len(traffic_products)
+                avg_weight = round(total_weight / weight_count, 2) if weight_count > 0 else 0
+                avg_age = round(total_seller_age / age_count) if age_count > 0 else 0
+                ppc_pct = round((ppc_count / n_prods) * 100) if n_prods > 0 else 0
+                avg_imgs = round(total_images / img_count, 1) if img_count > 0 else 0
+                
+                # Maturity verdict
+                if avg_age >= 48:
+                    mat_label = "Mercado Maduro"
+                    mat_color = "#059669"
+                elif avg_age >= 24:
+                    mat_label = "En Crecimiento"
+                    mat_color = "#d97706"
+                else:
+                    mat_label = "Mercado Joven"
+                    mat_color = "#3b82f6"
                 
-                <!-- Bar Chart: Seasonality with Values -->
-                <div style="background:linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%); border:1px solid #e2e8f0; border-radius:16px; padding:30px;">
-                    <h4 style="margin:0 0 20px 0; color:var(--primary); font-family:var(--serif); display:flex; align-items:center; gap:10px;">
-                        📈 Evolución de Demanda por Mes
-                        <span style="background:#22c55e; color:white; padding:2px 8px; border-radius:10px; font-size:0.6rem; font-weight:700;">ÍNDICE %</span>
-                    </h4>
-                    <div style="position:relative; height:280px;">
-                        <canvas id="lineChart"></canvas>
+                # Origin bars
+                origin_parts = []
+                for okey, ocount in sorted(origins.items(), key=lambda x: x[1], reverse=True):
+                    if ocount == 0:
+                        continue
+                    opct = round((ocount / n_prods) * 100)
+                    oflags = {"CN": "🇨🇳", "US": "🇺🇸", "AMZ": "🏢", "Other": "🌐"}
+                    ocolors = {"CN": "#ef4444", "US": "#3b82f6", "AMZ": "#1e3a8a", "Other": "#94a3b8"}
+                    origin_parts.append(f'<div style="display:flex; align-items:center; gap:6px; margin-bottom:4px;"><span style="font-size:0.7rem;">{oflags.get(okey, "🌐")}</span><span style="font-size:0.65rem; font-weight:700; min-width:35px;">{okey}</span><div style="flex:1; background:#e2e8f0; border-radius:3px; height:10px;"><div style="width:{opct}%; background:{ocolors.get(okey, "#94a3b8")}; height:100%; border-radius:3px;"></div></div><span style="font-size:0.65rem; font-weight:700; color:#334155;">{opct}%</span></div>')
+                origin_items = "".join(origin_parts)
+                
+                # Fulfillment distribution
+                ful_parts = []
+                for fkey, fcount in sorted(ful_dist.items(), key=lambda x: x[1], reverse=True):
+                    if fcount == 0:
+                        continue
+                    fpct = round((fcount / n_prods) * 100)
+                    fcolors = {"AMZ": "#1e3a8a", "FBA": "#059669", "FBM": "#d97706", "Other": "#94a3b8"}
+                    ful_parts.append(f'<div style="display:flex; align-items:center; gap:6px; margin-bottom:4px;"><span style="background:{fcolors.get(fkey, "#94a3b8")}; color:white; padding:1px 6px; border-radius:3px; font-size:0.55rem; font-weight:800; min-width:30px; text-align:center;">{fkey}</span><div style="flex:1; background:#e2e8f0; border-radius:3px; height:10px;"><div style="width:{fpct}%; background:{fcolors.get(fkey, "#94a3b8")}; height:100%; border-radius:3px;"></div></div><span style="font-size:0.65rem; font-weight:700; color:#334155;">{fpct}%</span></div>')
+                ful_items = "".join(ful_parts)
+                
+                seller_intel_html = f"""
+                <div style="background:linear-gradient(135deg, #faf5ff 0%, #ede9fe 100%); border:2px solid #c4b5fd; padding:20px; border-radius:16px; margin-bottom:20px;">
+                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
+                        <span style="font-size:1.3rem;">🏭</span>
+                        <span style="font-weight:700; color:#5b21b6; font-size:0.9rem;">Logistics & Seller Intelligence</span>
+                        <span style="background:#ede9fe; color:#7c3aed; padding:2px 8px; border-radius:8px; font-size:0.55rem; font-weight:800;">H10 Deep Data · {n_prods} productos</span>
                     </div>
-                    <!-- Key Stats -->
-                    <div style="display:flex; justify-content:space-between; margin-top:15px; padding-top:15px; border-top:1px solid #e2e8f0;">
-                        <div style="text-align:center;">
-                            <div style="font-size:0.6rem; color:#64748b;">PICO MÁXIMO</div>
-                            <div style="font-size:1.1rem; font-weight:800; color:#22c55e;">Noviembre</div>
-                            <div style="font-size:0.7rem; color:#22c55e;">100%</div>
+                    <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:15px;">
+                        <div style="background:white; padding:14px; border-radius:12px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">🌍 Origen Sellers</div>
+                            {origin_items}
                         </div>
-                        <div style="text-align:center;">
-                            <div style="font-size:0.6rem; color:#64748b;">PROMEDIO</div>
-                            <div style="font-size:1.1rem; font-weight:800; color:#3b82f6;">72%</div>
+                        <div style="background:white; padding:14px; border-radius:12px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">📦 Fulfillment</div>
+                            {ful_items}
                         </div>
-                        <div style="text-align:center;">
-                            <div style="font-size:0.6rem; color:#64748b;">PICO BAJO</div>
-                            <div style="font-size:1.1rem; font-weight:800; color:#f59e0b;">Marzo</div>
-                            <div style="font-size:0.7rem; color:#f59e0b;">50%</div>
+                        <div style="background:white; padding:14px; border-radius:12px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">📊 Métricas Clave</div>
+                            <div style="margin-bottom:6px;"><span style="font-size:0.6rem; color:#64748b;">Peso Prom:</span> <span style="font-weight:700; font-size:0.8rem; color:#334155;">{avg_weight} lbs</span></div>
+                            <div style="margin-bottom:6px;"><span style="font-size:0.6rem; color:#64748b;">Seller Age Prom:</span> <span style="font-weight:700; font-size:0.8rem; color:{mat_color};">{avg_age} meses</span> <span style="font-size:0.55rem; color:{mat_color};">({mat_label})</span></div>
+                            <div style="margin-bottom:6px;"><span style="font-size:0.6rem; color:#64748b;">PPC Competition:</span> <span style="font-weight:700; font-size:0.8rem; color:{'#ef4444' if ppc_pct > 40 else '#d97706' if ppc_pct > 20 else '#059669'};">{ppc_pct}%</span> <span style="font-size:0.55rem; color:#64748b;">patrocinados</span></div>
+                            <div><span style="font-size:0.6rem; color:#64748b;">Imgs/Listing Prom:</span> <span style="font-weight:700; font-size:0.8rem; color:#334155;">{avg_imgs}</span></div>
                         </div>
                     </div>
-                </div>
-            </div>
+                </div>"""
             
-            <!-- FULL 12-MONTH CALENDAR -->
-            <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; padding:25px;">
-                <h4 style="margin:0 0 20px 0; color:var(--primary); font-family:var(--serif);">🗓️ Calendario Comercial Anual - 12 Meses</h4>
-                <div style="display:grid; grid-template-columns: repeat(4, 1fr); gap:12px; margin-bottom:25px;">
-                    {calendar_html}
-                </div>
+            # ── Build Demographic & Niche Profile Card ──
+            demographic_profile_html = ""
+            na = s_data.get("niche_analytics", {})
+            if na and na.get("demographics"):
+                demo = na.get("demographics", {})
+                segs = demo.get("segments", {})
+                dom_seg = demo.get("dominant_segment", "N/A")
+                cls_rate = demo.get("classification_rate", 0)
                 
-                <!-- Peak Events Detail -->
-                <h5 style="margin:20px 0 15px 0; color:var(--accent); font-family:var(--serif); font-size:0.9rem;">📍 Eventos de Alto Impacto - Detalle Estratégico</h5>
-                <div style="display:grid; grid-template-columns: repeat(2, 1fr); gap:20px; margin-bottom:25px;">
-                    {peak_events_html}
-                </div>
+                seg_emojis = {"Infant": "🍼", "Toddler": "🧒", "Preschool": "📖", "Elementary": "📚", "Tween": "🎮", "Teen": "🧑", "Adult": "👔", "Family": "👨‍👩‍👧‍👦", "Unspecified": "❓"}
+                seg_colors = {"Infant": "#f472b6", "Toddler": "#fb923c", "Preschool": "#a78bfa", "Elementary": "#60a5fa", "Tween": "#34d399", "Teen": "#fbbf24", "Adult": "#6b7280", "Family": "#3b82f6", "Unspecified": "#94a3b8"}
                 
-                <!-- Overall Strategy from LLM -->
-                <div style="background:#eff6ff; padding:20px; border-radius:12px; border-left:4px solid var(--accent);">
-                    <div style="font-size:0.7rem; color:var(--accent); font-weight:800; text-transform:uppercase; margin-bottom:8px;">📌 ESTRATEGIA DE SEASONALITY</div>
-                    <div style="font-size:0.9rem; line-height:1.6; color:#1e40af;">{strategy_insight}</div>
-                </div>
-            </div>
-        </div>
-        """
-        
-        script_html = f"""
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <script src="https://cdn.jsdelivr.net/npm/chartjs-plugin-datalabels@2"></script>
-        <script>
-            document.addEventListener("DOMContentLoaded", function() {{
-                try {{
-                    // Register datalabels plugin
-                    if (typeof ChartDataLabels !== 'undefined') {{
-                        Chart.register(ChartDataLabels);
-                    }}
-                    
-                    // Pie Chart: Market Share
-                    const pieEl = document.getElementById('pieChart');
-                    if (pieEl) {{
-                        new Chart(pieEl, {{
-                            type: 'doughnut',
-                            data: {{
-                                labels: {js_pie_labels},
-                                datasets: [{{
-                                    data: {js_pie_values},
-                                    backgroundColor: {js_pie_colors},
-                                    borderWidth: 3,
-                                    borderColor: '#ffffff',
-                                    hoverBorderWidth: 4,
-                                    hoverOffset: 8
-                                }}]
-                            }},
-                            options: {{
-                                responsive: true,
-                                maintainAspectRatio: false,
-                                cutout: '55%',
-                                plugins: {{
-                                    legend: {{ display: false }},
-                                    tooltip: {{
-                                        callbacks: {{
-                                            label: function(context) {{
-                                                return context.label + ': ' + context.raw + '%';
-                                            }}
-                                        }},
-                                        backgroundColor: '#1e293b',
-                                        padding: 12,
-                                        cornerRadius: 8
-                                    }},
-                                    datalabels: {{
-                                        color: '#1e293b',
-                                        font: {{ weight: 'bold', size: 12 }},
-                                        formatter: function(value) {{
-                                            if (value >= 10) return value + '%';
-                                            return '';
-                                        }},
-                                        anchor: 'end',
-                                        align: 'end',
-                                        offset: 5
-                                    }}
-                                }}
-                            }}
-                        }});
-                    }}
-                    
-                    // Bar Chart: Seasonality
-                    const barEl = document.getElementById('lineChart');
-                    if (barEl) {{
-                        new Chart(barEl, {{
-                            type: 'bar',
-                            data: {{
-                                labels: {js_line_labels},
-                                datasets: [{{
-                                    label: 'Índice de Demanda',
-                                    data: {js_line_values},
-                                    backgroundColor: '#3b82f6',
-                                    borderWidth: 2,
-                                    borderRadius: 8
-                                }}]
-                            }},
-                            options: {{
-                                responsive: true,
-                                maintainAspectRatio: false,
-                                scales: {{
-                                    y: {{
-                                        beginAtZero: true,
-                                        max: 110,
-                                        ticks: {{ callback: function(value) {{ return value + '%'; }} }}
-                                    }}
-                                }},
-                                plugins: {{
-                                    legend: {{ display: false }},
-                                    datalabels: {{
-                                        color: '#1e293b',
-                                        font: {{ weight: 'bold', size: 10 }},
-                                        anchor: 'end',
-                                        align: 'top',
-                                        offset: 2,
-                                        formatter: function(value) {{ return value + '%'; }}
-                                    }}
-                                }}
-                            }}
-                        }});
-                    }}
-                    
-                    // Google Trends Chart
-                    const gtEl = document.getElementById('googleTrendChart');
-                    if (gtEl) {{
-                        new Chart(gtEl, {{
-                            type: 'line',
-                            data: {{
-                                labels: {js_gt_months},
-                                datasets: {js_gt_datasets}
-                            }},
-                            options: {{
-                                responsive: true,
-                                maintainAspectRatio: false,
-                                plugins: {{
-                                    legend: {{ 
-                                        display: true,
-                                        position: 'bottom',
-                                        labels: {{ boxWidth: 12, font: {{ size: 10 }} }}
-                                    }},
-                                    datalabels: {{ display: false }}
-                                }},
-                                scales: {{
-                                    y: {{ beginAtZero: true, grid: {{ color: '#f1f5f9' }} }},
-                                    x: {{ grid: {{ display: false }} }}
-                                }}
-                            }}
-                        }});
-                    }}
-                }} catch (e) {{
-                    console.error("NEXUS Chart Error:", e);
-                }} finally {{
-                    const loader = document.getElementById('gt-loader');
-                    if (loader) loader.style.display = 'none';
-                }}
-            }});
-        </script>"""
-
-        # Section V: Strategist Gaps
-        gaps = st_data.get("strategic_gaps", [])
-        strategist_grid_html = ""
-        for g in gaps:
-            strategist_grid_html += f"""
-            <div style="background:white; border:1px solid #e2e8f0; padding:25px; border-radius:16px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.03);">
-                <div style="font-size:0.65rem; color:var(--accent); font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:10px;">Gap Detectado: {g.get('niche', 'General')}</div>
-                <h4 style="margin:0 0 10px 0; color:var(--primary); font-family:var(--serif);">{g.get('gap', 'Oportunidad de Mercado')}</h4>
-                <p style="font-size:0.85rem; color:#475569; line-height:1.6; border-top:1px solid #f1f5f9; padding-top:15px; margin-top:10px;"><strong>Propuesta NEXUS:</strong> {g.get('proposal', 'N/A')}</p>
-            </div>"""
-
-        # Section VI: Financials & Stress Test
-        fba_sens = m_data.get("fba_sensitivity_analysis", {})
-        nexus_target = fba_sens.get("nexus_target", {})
-        n_fba_b = nexus_target.get("fba_breakdown", {})
-        
-        nexus_fba_card = f"""
-        <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color:white; padding:25px; border-radius:16px; box-shadow: 0 10px 20px rgba(0,0,0,0.1);">
-            <div style="font-size:0.65rem; color:#94a3b8; font-weight:800; text-transform:uppercase; letter-spacing:2px; margin-bottom:15px;">NEXUS TARGET UNIT</div>
-            <div style="font-size:1.3rem; font-weight:900; margin-bottom:20px;">{nexus_target.get('name')}</div>
-            <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:10px; text-align:center; border-top:1px solid rgba(255,255,255,0.1); padding-top:15px;">
-                <div><div style="font-size:0.6rem; color:#94a3b8;">Pick/Pack</div><div style="font-size:1rem; font-weight:700;">${n_fba_b.get('pick_pack')}</div></div>
-                <div><div style="font-size:0.6rem; color:#94a3b8;">Storage/Ref</div><div style="font-size:1rem; font-weight:700;">${round(n_fba_b.get('storage', 0) + n_fba_b.get('referral', 0), 2)}</div></div>
-                <div><div style="font-size:0.6rem; color:#94a3b8;">Impacto</div><div style="font-size:1rem; font-weight:700; color:#10b981;">{nexus_target.get('fba_impact_pct')}%</div></div>
-            </div>
-        </div>"""
-
-        comps = fba_sens.get("competitors", [])
-        bench_html = ""
-        for p in comps[:10]:
-            bench_html += f"""
-            <div style="background:white; border:1px solid #e2e8f0; padding:12px; border-radius:10px; display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
-                <div style="font-weight:700; font-size:0.75rem; color:#334155;">#{p.get('rank', 'N/A')} {p.get('name', 'Competitor')}</div>
-                <div style="display:flex; gap:10px; align-items:center;">
-                    <div style="font-size:0.75rem; color:#64748b;">${p['fba_breakdown']['total_logistics']}</div>
-                    <div style="font-size:0.7rem; font-weight:900; color:{p['tier_color']}; background:{p['tier_color']}20; padding:2px 6px; border-radius:3px;">{p['fba_impact_pct']}%</div>
-                </div>
-            </div>"""
-        bench_html = f'<div style="grid-column: span 1; background:#ffffff50; padding:10px; border-radius:12px;">{bench_html}</div>'
-
-        mra = m_data.get("multivariate_analysis", {})
-        corr = mra.get("correlations", {})
-        multivariate_panel = f"""
-        <div style="grid-column: span 1; background:white; border-radius:16px; padding:20px; border:1px solid #fdba74;">
-             <h5 style="margin:0 0 15px 0; color:#9a3412; font-size:0.8rem; text-transform:uppercase;">Dominance Analysis</h5>
-             <div style="display:grid; grid-template-columns: 1fr 1fr; gap:15px; text-align:center;">
-                <div><div style="font-size:0.6rem; color:#64748b;">Mkt FBA Avg</div><div style="font-size:1.2rem; font-weight:900; color:#dc2626;">{corr.get('avg_market_fba_impact')}%</div></div>
-                <div><div style="font-size:0.6rem; color:#64748b;">Dominance Delta</div><div style="font-size:1.2rem; font-weight:900; color:#059669;">+{corr.get('nexus_dominance_delta')}%</div></div>
-             </div>
-             <div style="margin-top:15px; font-size:0.7rem; color:#9a3412; font-style:italic; line-height:1.4;">* NEXUS desvincula la rentabilidad del costo logístico mediante el desequilibrio positivo de valor.</div>
-        </div>"""
-
-        st_test = m_data.get("stress_test", {})
-        st_impact = st_test.get("impact", {})
-        erosion_val = float(st_impact.get("profit_erosion", "0%").replace("%", ""))
-        erosion_width = min(100, max(0, erosion_val * 4))
-        stress_panel_html = f"""
-        <div style="margin-top:25px; background:#fef2f2; border:1px solid #fecaca; border-radius:16px; padding:20px; grid-column: span 3;">
-            <div style="display:flex; justify-content:space-between; align-items:center;">
-                <h4 style="margin:0; color:#991b1b; font-size:1rem;">🌩️ Stress Test: High-CAC Volatility Simulation</h4>
-                <div style="background:#dc2626; color:white; padding:4px 12px; border-radius:6px; font-weight:900; font-size:0.7rem;">{st_impact.get('resilience_status').upper()}</div>
-            </div>
-            <div style="margin-top:15px; display:grid; grid-template-columns: 2fr 1.5fr; gap:30px; align-items:center;">
-                <div>
-                     <div style="display:flex; justify-content:space-between; margin-bottom:6px; font-size:0.8rem; font-weight:700; color:#991b1b;"><span>Profit Erosion Impact</span><span>{st_impact.get('profit_erosion')}</span></div>
-                     <div style="width:100%; height:10px; background:#fee2e2; border-radius:5px; overflow:hidden;"><div style="width:{erosion_width}%; height:100%; background:#991b1b;"></div></div>
-                </div>
-                <div style="font-size:0.85rem; color:#7f1d1d; line-height:1.5;"><strong>Veredicto:</strong> {st_test.get('verdict')}</div>
-            </div>
-        </div>"""
-
-        amz_context_html = f"""
-        <div style="background:#fff7ed; border:1px solid #fdba74; padding:30px; border-radius:16px; margin-bottom:30px;">
-             <h4 style="margin-top:0; color:#9a3412; font-family:var(--serif);">⚖️ Análisis Multivariable (MRA) & Stress Test (TOP 10)</h4>
-             <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:15px;">
-                {nexus_fba_card}
-                {bench_html}
-                {multivariate_panel}
-                {stress_panel_html}
-             </div>
-        </div>"""
-
-        math_table_rows = ""
-        for key, s in scenarios.items():
-            math_table_rows += f"""
-            <tr>
-                <td><strong>{s['name']}</strong><br><span style="font-size:0.75rem; color:#64748b;">{s.get('composition', '')}</span></td>
-                <td>${s['price']}</td>
-                <td>${s['landed']}</td>
-                <td style="font-weight:bold; color:#059669;">{s['margin_pct']}%</td>
-                <td>{s.get('break_even_qty', 'N/A')} u</td>
-                <td>{s.get('payback_months', 'N/A')} m</td>
-                <td><span class="tag tag-recommended">VIABLE</span></td>
-                <td style="font-size:0.8rem; line-height:1.4;">{s.get('notes', 'Calculado')}</td>
-            </tr>"""
-
-        # Section VII: Senior Partner Summary
-        partner_raw = st_data.get("partner_summary", summary)
-        formatted_summary = f'<div style="font-size:1.05rem; line-height:1.8; color:#1e293b; white-space:pre-wrap;">{partner_raw}</div>'
-
-        # Section VIII: Roadmap
-        roadmap_data = st_data.get("dynamic_roadmap", [])
-        roadmap_html = ""
-        for idx, step in enumerate(roadmap_data):
-            roadmap_html += f"""
-            <div style="display:flex; gap:30px; margin-bottom:25px; background:white; padding:25px; border-radius:12px; border:1px solid #e2e8f0; position:relative;">
-                <div style="width:40px; height:40px; background:var(--primary); color:white; border-radius:8px; display:flex; align-items:center; justify-content:center; font-weight:bold; flex-shrink:0;">{idx+1}</div>
-                <div><h4 style="margin:0 0 10px 0; color:var(--primary);">{step[0]}</h4><p style="margin:0; font-size:0.9rem; color:#475569;">{step[1]}</p></div>
-            </div>"""
-
-        # Section IX: Compliance Audit
-        audits = g_data.get("audits", [])
-        compliance_rows = ""
-        for a in audits:
-            status_color = "#15803d" if a['status'] == "MANDATORY" else "#c2410c"
-            status_bg = "#dcfce7" if a['status'] == "MANDATORY" else "#ffedd5"
-            compliance_rows += f"""
-            <tr>
-                <td style="font-weight:800;">{a['std']}</td>
-                <td><span style="background:{status_bg}; color:{status_color}; padding:4px 10px; border-radius:4px; font-size:0.65rem; font-weight:900;">{a['status']}</span></td>
-                <td style="font-size:0.85rem; color:#475569;">{a['desc']}</td>
-            </tr>"""
+                # Build segment bars
+                seg_bar_parts = []
+                total_p = sum(v.get("count", 0) for v in segs.values())
+                for seg_name, seg_data in sorted(segs.items(), key=lambda x: x[1].get("count", 0), reverse=True):
+                    if seg_data.get("count", 0) == 0:
+                        continue
+                    pct = seg_data.get("pct", 0)
+                    emoji = seg_emojis.get(seg_name, "📊")
+                    color = seg_colors.get(seg_name, "#64748b")
+                    is_dom = " ⭐" if seg_name == dom_seg else ""
+                    seg_bar_parts.append(f'<div style="display:flex; align-items:center; gap:6px; margin-bottom:5px;"><span style="font-size:0.8rem; min-width:20px;">{emoji}</span><span style="font-size:0.6rem; font-weight:700; min-width:70px; color:#334155;">{seg_name}{is_dom}</span><div style="flex:1; background:#e2e8f0; border-radius:4px; height:12px;"><div style="width:{pct}%; background:{color}; height:100%; border-radius:4px; transition:width 0.3s;"></div></div><span style="font-size:0.65rem; font-weight:700; color:#334155; min-width:35px; text-align:right;">{pct}%</span></div>')
+                seg_bars = "".join(seg_bar_parts)
+                
+                # Price by segment
+                pbs = na.get("price_by_segment", {})
+                price_seg_parts = []
+                for ps_name, ps_data in sorted(pbs.items(), key=lambda x: x[1].get("avg_price", 0), reverse=True):
+                    if ps_name == "Unspecified":
+                        continue
+                    ps_emoji = seg_emojis.get(ps_name, "📊")
+                    price_seg_parts.append(f'<div style="display:flex; justify-content:space-between; align-items:center; padding:4px 0; border-bottom:1px solid #f1f5f9;"><span style="font-size:0.65rem;">{ps_emoji} {ps_name} ({ps_data.get("count", 0)})</span><span style="font-weight:700; font-size:0.75rem; color:#334155;">${ps_data.get("avg_price", 0):.2f}</span></div>')
+                price_seg_items = "".join(price_seg_parts)
+                
+                # Brand concentration
+                bc = na.get("brand_concentration", {})
+                hhi_html = ""
+                if bc:
+                    hhi = bc.get("hhi_index", 0)
+                    hhi_pct = min(100, hhi / 100)  # Scale 0-10000 to 0-100
+                    hhi_html = f"""
+                        <div style="background:white; padding:14px; border-radius:12px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">🏢 Concentración de Marcas</div>
+                            <div style="display:flex; align-items:center; gap:8px; margin-bottom:8px;">
+                                <span style="font-size:1.3rem; font-weight:800; color:{bc.get('hhi_color', '#64748b')};">HHI {hhi}</span>
+                                <span style="font-size:0.6rem; font-weight:700; color:{bc.get('hhi_color', '#64748b')};">{bc.get('hhi_label', 'N/A')}</span>
+                            </div>
+                            <div style="background:#e2e8f0; border-radius:4px; height:8px; margin-bottom:8px;">
+                                <div style="width:{hhi_pct}%; background:{bc.get('hhi_color', '#94a3b8')}; height:100%; border-radius:4px;"></div>
+                            </div>
+                            <div style="font-size:0.6rem; color:#64748b;">{bc.get('unique_brands', 0)} marcas únicas</div>
+                            <div style="font-size:0.55rem; color:#475569; margin-top:4px;">Top: <strong>{bc.get('top_brand', 'N/A')}</strong> ({bc.get('top_brand_share', 0)}%)</div>
+                        </div>"""
+                
+                # Revenue Pareto + Price Sweet Spot + Review Velocity
+                rp = na.get("revenue_pareto", {})
+                price_a = na.get("price", {})
+                rv = na.get("review_velocity", {})
+                
+                metrics_parts = [f"""
+                        <div style="background:white; padding:14px; border-radius:12px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">📊 Métricas de Nicho</div>"""]
+                
+                if rp:
+                    rp_color = "#ef4444" if rp.get("concentration") == "Alta" else ("#d97706" if rp.get("concentration") == "Media" else "#059669")
+                    metrics_parts.append(f"""
+                            <div style="margin-bottom:6px;"><span style="font-size:0.55rem; color:#64748b;">Revenue Pareto:</span> <span style="font-weight:700; font-size:0.75rem; color:{rp_color};">Top 20% = {rp.get('top_20pct_share', 0)}%</span></div>""")
+                
+                if price_a:
+                    metrics_parts.append(f"""
+                            <div style="margin-bottom:6px;"><span style="font-size:0.55rem; color:#64748b;">Price Sweet Spot:</span> <span style="font-weight:700; font-size:0.75rem; color:#059669;">{price_a.get('sweet_spot', 'N/A')}</span></div>""")
+                
+                if rv:
+                    metrics_parts.append(f"""
+                            <div style="margin-bottom:6px;"><span style="font-size:0.55rem; color:#64748b;">Rev. Velocity P50:</span> <span style="font-weight:700; font-size:0.75rem;">{rv.get('p50', 0)}/mo</span></div>
+                            <div><span style="font-size:0.55rem; color:#64748b;">Rev. Velocity P90:</span> <span style="font-weight:700; font-size:0.75rem; color:#059669;">{rv.get('p90', 0)}/mo</span></div>""")
+                
+                metrics_parts.append("\n                        </div>")
+                metrics_html = "".join(metrics_parts)
+                
+                demographic_profile_html = f"""
+                <div style="background:linear-gradient(135deg, #fdf2f8 0%, #fce7f3 100%); border:2px solid #f9a8d4; padding:20px; border-radius:16px; margin-bottom:20px;">
+                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
+                        <span style="font-size:1.3rem;">🎯</span>
+                        <span style="font-weight:700; color:#9d174d; font-size:0.9rem;">Demographic & Niche Profile</span>
+                        <span style="background:#fce7f3; color:#be185d; padding:2px 8px; border-radius:8px; font-size:0.55rem; font-weight:800;">Target Age Analysis · {cls_rate}% clasificado</span>
+                        <span style="background:#fce7f3; color:#9d174d; padding:2px 8px; border-radius:8px; font-size:0.55rem; font-weight:800;">Dominante: {dom_seg}</span>
+                    </div>
+                    <div style="display:grid; grid-template-columns: 1fr 1fr 1fr 1fr; gap:15px;">
+                        <div style="background:white; padding:14px; border-radius:12px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">👥 Segmentos por Edad</div>
+                            {seg_bars}
+                        </div>
+                        <div style="background:white; padding:14px; border-radius:12px;">
+                            <div style="font-size:0.6rem; color:#64748b; font-weight:700; text-transform:uppercase; margin-bottom:8px;">💰 Precio por Segmento</div>
+                            {price_seg_items}
+                        </div>
+                        {hhi_html}
+                        {metrics_html}
+                    </div>
+                </div>"""
 
-        # HTML Assembly
-        verdict = st_data.get("dynamic_verdict", {})
-        
-        # v2.6: Extract ALL personas, not just primary
-        all_personas = verdict.get("strategic_personas", [])
-        if not all_personas:
-            # Fallback to primary_persona if strategic_personas is empty
-            primary = verdict.get("primary_persona", {})
-            if primary:
-                all_personas = [primary]
-            else:
-                # Ultimate fallback
-                all_personas = [
-                    {"name": "Profesional Exigente", "title": "Manager, 28-40 años", "quote": "No tengo tiempo para productos que fallen.", "story": "Investiga antes de comprar, lee reviews de 1 estrella primero."},
-                    {"name": "Early Adopter Tech", "title": "Entusiasta tecnológico, 25-35 años", "quote": "Quiero lo último, pero que funcione.", "story": "Siempre busca innovación, dispuesto a pagar premium por tecnología de punta."},
-                    {"name": "Usuario Práctico", "title": "Usuario cotidiano, 30-50 años", "quote": "Solo necesito que haga su trabajo bien.", "story": "Prioriza confiabilidad sobre features, busca valor a largo plazo."}
-                ]
-        
-        # Primary persona for backwards compatibility
-        persona = all_personas[0] if all_personas else {}
-        persona_name = persona.get("name", "Alejandra") if isinstance(persona, dict) else "Alejandra"
-        persona_title = persona.get("title", "Product Manager en Tech Startup, 32 años") if isinstance(persona, dict) else "Product Manager, 32 años"
-        persona_quote = persona.get("quote", "No tengo tiempo para productos que me fallen. Pago más por tranquilidad.") if isinstance(persona, dict) else "Pago más por tranquilidad."
-        persona_story = persona.get("story", "Investiga obsesivamente antes de comprar, lee las reviews de 1 estrella primero, y está dispuesta a pagar 2x por calidad demostrable.") if isinstance(persona, dict) else "Investiga antes de comprar."
-        
-        # Build HTML for all personas (for later use in section)
-        personas_html = ""
-        avatar_icons = ["👩‍💼", "👨‍💻", "🎁", "👤", "🧑‍🔬"]
-        persona_colors = [
-            ("linear-gradient(135deg, #6366f1, #8b5cf6)", "#eff6ff", "#6366f1"),
-            ("linear-gradient(135deg, #10b981, #14b8a6)", "#f0fdf4", "#10b981"),
-            ("linear-gradient(135deg, #f59e0b, #fbbf24)", "#fef3c7", "#f59e0b")
-        ]
-        
-        for idx, p in enumerate(all_personas[:3]):  # Max 3 personas
-            icon = avatar_icons[idx % len(avatar_icons)]
-            gradient, bg_light, accent = persona_colors[idx % len(persona_colors)]
-            p_name = p.get("name", f"Persona {idx+1}")
-            p_title = p.get("title", "Cliente Objetivo")
-            p_quote = p.get("quote", "Busco calidad y confiabilidad.")
-            p_story = p.get("story", "Cliente potencial del segmento objetivo.")
-            p_criteria = p.get("decision_criteria", ["Calidad", "Precio", "Garantía", "Reviews"])[:4]
+            # ── Assemble source badges ──
+            source_badge_parts = ['<span style="background:#ecfdf5; color:#059669; padding:4px 12px; border-radius:20px; font-size:0.65rem; font-weight:800; border:1px solid #a7f3d0;">📁 DATOS POE</span>']
+            if has_search_intel:
+                source_badge_parts.append(f'<span style="background:#f0fdf4; color:#166534; padding:4px 12px; border-radius:20px; font-size:0.6rem; font-weight:700; border:1px solid #bbf7d0;">📄 {_t(st_source_file)}</span>')
+            if has_product_traffic:
+                source_badge_parts.append('<span style="background:#eff6ff; color:#1d4ed8; padding:4px 12px; border-radius:20px; font-size:0.6rem; font-weight:700; border:1px solid #bfdbfe;">📄 NicheDetailsProductsTab</span>')
+            source_badges = " ".join(source_badge_parts)
             
-            criteria_html = "".join([
-                f'<span style="background:{bg_light}; border:1px solid {accent}33; color:{accent}; padding:3px 8px; border-radius:12px; font-size:0.6rem;">✓ {c}</span>'
-                for c in p_criteria
-            ])
+            # ── Build product traffic table block ──
+            product_table_block = ""
+            if product_traffic_rows:
+                product_table_block = f'''
+                <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; overflow:hidden; margin-bottom:25px;">
+                    <div style="background:linear-gradient(135deg, #1e3a8a 0%, #1e40af 100%); padding:15px 20px;">
+                        <div style="display:flex; justify-content:space-between; align-items:center;">
+                            <span style="color:white; font-weight:700; font-size:0.9rem;">📊 Tráfico & Revenue por Producto (Click Share, Ventas, Ingresos)</span>
+                            <span style="color:#93c5fd; font-size:0.65rem;">Fuente: NicheDetailsProductsTab · Datos POE Verificados</span>
+                        </div>
+                    </div>
+                    <table style="width:100%; border-collapse:collapse;">
+                        <thead>
+                            <tr style="background:#f8fafc;">
+                                <th style="{_TH_STYLE}">PRODUCTO</th>
+                                <th style="{_TH_STYLE}">PRECIO</th>
+                                <th style="{_TH_STYLE}">VENTAS/MES</th>
+                                <th style="{_TH_STYLE}">REVENUE</th>
+                                <th style="{_TH_STYLE}">CLICK SHARE</th>
+                                <th style="{_TH_STYLE}">REV. VEL</th>
+                                <th style="{_TH_STYLE}">FBA FEES</th>
+                            </tr>
+                        </thead>
+                        <tbody>{product_traffic_rows}</tbody>
+                    </table>
+                </div>'''
             
-            personas_html += f'''
-            <div style="background:#ffffff; border:2px solid #e2e8f0; border-radius:16px; padding:20px; position:relative; overflow:hidden; flex:1; min-width:280px;">
-                <div style="position:absolute; top:-10px; right:-10px; font-size:3rem; opacity:0.06;">{icon}</div>
-                <div style="display:flex; gap:12px; align-items:flex-start; margin-bottom:12px;">
-                    <div style="width:50px; height:50px; background:{gradient}; border-radius:50%; display:flex; align-items:center; justify-content:center; font-size:1.5rem; flex-shrink:0;">{icon}</div>
-                    <div style="flex:1;">
-                        <div style="font-size:1rem; font-weight:700; color:var(--primary);">{p_name}</div>
-                        <div style="font-size:0.7rem; color:#64748b;">{p_title}</div>
+            # ── Build keyword table block ──
+            keyword_table_block = ""
+            if kw_rows_html:
+                keyword_table_block = f'''
+                <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; overflow:hidden; margin-bottom:25px;">
+                    <div style="background:linear-gradient(135deg, #0f172a 0%, #1e293b 100%); padding:15px 20px;">
+                        <div style="display:flex; justify-content:space-between; align-items:center;">
+                            <span style="color:white; font-weight:700; font-size:0.9rem;">🔑 Ranking de Keywords por Demanda</span>
+                            <span style="color:#94a3b8; font-size:0.65rem;">Prioridad Alta para SEO · Fuente: NicheDetailsSearchTermsTab</span>
+                        </div>
+                    </div>
+                    <table style="width:100%; border-collapse:collapse;">
+                        <thead>
+                            <tr style="background:#f8fafc;">
+                                <th style="{_TH_STYLE}">KEYWORD</th>
+                                <th style="{_TH_STYLE}">VOLUMEN</th>
+                                <th style="{_TH_STYLE}">GROWTH 90D</th>
+                                <th style="{_TH_STYLE}">CLICK SHARE</th>
+                                <th style="text-align:center; padding:12px; font-size:0.7rem; color:#64748b; font-weight:800; text-transform:uppercase;">CONVERSIÓN</th>
+                            </tr>
+                        </thead>
+                        <tbody>{kw_rows_html}</tbody>
+                    </table>
+                </div>'''
+            
+            # ── Assemble full section ──
+            search_terms_section_html = f'''
+            <div class="page-break section-container">
+                <h2 class="section-title">II-B. Traffic, Clicks & Search Intelligence <span class="agent-badge" style="background:#059669;">POE Data · Harvester</span></h2>
+                
+                <!-- Source Header -->
+                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:20px;">
+                    <div style="display:flex; align-items:center; gap:10px;">
+                        <div style="width:40px; height:40px; background:linear-gradient(135deg, #059669, #10b981); border-radius:10px; display:flex; align-items:center; justify-content:center; font-size:1.2rem;">📈</div>
+                        <div>
+                            <div style="font-size:0.65rem; color:#047857; font-weight:800; text-transform:uppercase; letter-spacing:1px;">TRÁFICO, IMPRESIONES & DEMANDA REAL</div>
+                            <div style="font-size:1rem; font-weight:700; color:#065f46;">Clicks, Revenue por Producto + Keywords vs. Conversión</div>
+                        </div>
+                    </div>
+                    <div style="display:flex; gap:8px; align-items:center; flex-wrap:wrap;">
+                        {source_badges}
                     </div>
                 </div>
-                <div style="background:#f8fafc; padding:10px; border-radius:8px; font-style:italic; font-size:0.8rem; color:#475569; border-left:3px solid {accent}; margin-bottom:10px;">
-                    "{p_quote}"
+                
+                <!-- KPI Cards Row -->
+                <div style="display:grid; grid-template-columns: repeat(6, 1fr); gap:12px; margin-bottom:25px;">
+                    <div style="background:linear-gradient(135deg, #eff6ff 0%, #dbeafe 100%); padding:16px 12px; border-radius:14px; border:2px solid #93c5fd; text-align:center;">
+                        <div style="font-size:0.55rem; color:#1d4ed8; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">REVENUE TOTAL</div>
+                        <div style="font-size:1.5rem; font-weight:800; color:#1e40af;">{rev_display}</div>
+                        <div style="font-size:0.6rem; color:#3b82f6; margin-top:3px;">ingresos/mes nicho</div>
+                    </div>
+                    <div style="background:linear-gradient(135deg, #ecfdf5 0%, #d1fae5 100%); padding:16px 12px; border-radius:14px; border:2px solid #a7f3d0; text-align:center;">
+                        <div style="font-size:0.55rem; color:#047857; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">UNIDADES VENDIDAS</div>
+                        <div style="font-size:1.5rem; font-weight:800; color:#065f46;">{sales_display}</div>
+                        <div style="font-size:0.6rem; color:#059669; margin-top:3px;">ventas/mes total</div>
+                    </div>
+                    <div style="background:linear-gradient(135deg, #faf5ff 0%, #ede9fe 100%); padding:16px 12px; border-radius:14px; border:2px solid #c4b5fd; text-align:center;">
+                        <div style="font-size:0.55rem; color:#6d28d9; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">VOL. BÚSQUEDA</div>
+                        <div style="font-size:1.5rem; font-weight:800; color:#5b21b6;">{vol_display}</div>
+                        <div style="font-size:0.6rem; color:#7c3aed; margin-top:3px;">búsquedas/mes</div>
+                    </div>
+                    <div style="background:linear-gradient(135deg, #fff7ed 0%, #ffedd5 100%); padding:16px 12px; border-radius:14px; border:2px solid #fdba74; text-align:center;">
+                        <div style="font-size:0.55rem; color:#c2410c; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">AVG CLICK SHARE</div>
+                        <div style="font-size:1.5rem; font-weight:800; color:#9a3412;">{avg_product_click_share}%</div>
+                        <div style="font-size:0.6rem; color:#ea580c; margin-top:3px;">cuota de clics prom.</div>
+                    </div>
+                    <div style="background:linear-gradient(135deg, #fef2f2 0%, #fecaca 100%); padding:16px 12px; border-radius:14px; border:2px solid #fca5a5; text-align:center;">
+                        <div style="font-size:0.55rem; color:#991b1b; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">CONVERSIÓN</div>
+                        <div style="font-size:1.5rem; font-weight:800; color:#b91c1c;">{st_avg_conversion:.1f}%</div>
+                        <div style="font-size:0.6rem; color:#dc2626; margin-top:3px;">tasa promedio nicho</div>
+                    </div>
+                    <div style="background:linear-gradient(135deg, #f0fdf4 0%, #dcfce7 100%); padding:16px 12px; border-radius:14px; border:2px solid #86efac; text-align:center;">
+                        <div style="font-size:0.55rem; color:#166534; font-weight:800; text-transform:uppercase; letter-spacing:0.5px; margin-bottom:6px;">PRODUCTOS</div>
+                        <div style="font-size:1.5rem; font-weight:800; color:#15803d;">{len(traffic_products)}</div>
+                        <div style="font-size:0.6rem; color:#16a34a; margin-top:3px;">competidores activos</div>
+                    </div>
                 </div>
-                <div style="font-size:0.75rem; color:#4b5563; line-height:1.4; margin-bottom:12px;">{p_story}</div>
-                <div style="display:flex; gap:5px; flex-wrap:wrap;">{criteria_html}</div>
-            </div>'''
+                
+                <!-- Product Traffic Table -->
+                {product_table_block}
+                
+                <!-- Keywords Table -->
+                {keyword_table_block}
+                
+                <!-- Demand vs Supply Cross-Reference -->
+                {cross_ref_html}
+                
+                <!-- Opportunity Insights -->
+                {opp_section_html}
+                
+                <!-- Logistics & Seller Intelligence -->
+                {seller_intel_html}
+                
+                <!-- Demographic & Niche Profile -->
+                {demographic_profile_html}
+                
+                <!-- Methodology Note -->
+                <div style="background:#f8fafc; padding:12px 16px; border-radius:10px; border-left:4px solid #059669;">
+                    <div style="font-size:0.7rem; color:#475569; line-height:1.5;">
+                        <strong style="color:#059669;">📋 Metodología:</strong> Datos extraídos de <strong>NicheDetailsProductsTab</strong> (ventas, revenue, click share, fees) y <strong>NicheDetailsSearchTermsTab</strong> (keywords, volumen, conversión).
+                        Revenue = ingresos mensuales por producto. Click Share = % de clics capturados del nicho. Conversión = tasa de compra tras búsqueda.
+                        <strong>Uso recomendado:</strong> Cruzar Click Share de productos vs. Keywords de alta conversión para priorización de listing y SEO.
+                    </div>
+                </div>
+            </div>
+            '''
+        else:
+            search_terms_section_html = ""
         
-        # Extract market sizing data (now dynamic, not hardcoded)
-        market = verdict.get("market_sizing", {})
-        tam_display = market.get("tam", "PENDIENTE") if isinstance(market, dict) else "PENDIENTE"
-        sam_display = market.get("sam", "PENDIENTE") if isinstance(market, dict) else "PENDIENTE"
-        som_display = market.get("som", "PENDIENTE") if isinstance(market, dict) else "PENDIENTE"
-        market_source = market.get("source", "⚠️ Datos pendientes") if isinstance(market, dict) else "⚠️ Datos pendientes"
-        has_market_data = market.get("has_real_data", False) if isinstance(market, dict) else False
+        # Calculate price range from top_10 if not in price_tiers
+        top_10_list_for_pricing = s_data.get("top_10_products", [])
+        prices_list = [p.get("price", 0) for p in top_10_list_for_pricing if p.get("price", 0) > 0]
         
-        # Extract pricing sources - distinguish between POE (real) and LLM (estimate)
-        pricing_source = verdict.get("pricing_source", "⚠️ Datos pendientes")
-        pricing_formula = verdict.get("pricing_formula", "Requiere escaneo con datos")
-        has_real_pricing = verdict.get("has_real_pricing", False)  # From POE files
-        has_estimate_data = verdict.get("has_estimate_data", True)  # From LLM
+        if prices_list:
+            price_min = min(prices_list)
+            price_max = max(prices_list)
+            price_median = sorted(prices_list)[len(prices_list)//2]
+            price_range_display = f"${price_min:.2f} - ${price_max:.2f}"
+            price_median_display = f"${price_median:.2f}"
+        else:
+            price_min, price_max, price_median = 0, 0, 0
+            price_range_display = "N/A"
+            price_median_display = "N/A"
 
-        
-        html_report = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <title>NEXUS-360 DOSSIER</title>
-    <link href="https://fonts.googleapis.com/css2?family=Merriweather:wght@400;700&family=Inter:wght@400;700&display=swap" rel="stylesheet">
-    <style>
-        :root {{ 
-            --primary: #16213a; 
-            --accent: #28529a; 
-            --lime: #84cc16;
-            --serif: 'Montserrat', sans-serif; 
-            --sans: 'Inter', system-ui, -apple-system, sans-serif; 
-        }}
-        body {{ font-family: var(--sans); background: #f9fafb; color: #333333; padding: 40px; line-height: 1.6; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 60px; border-radius: 12px; box-shadow: 0 4px 20px rgba(0,0,0,0.05); }}
-        .section-title {{ font-family: var(--serif); font-size: 1.4rem; color: var(--primary); margin-top: 50px; background: #f5f8fc; padding: 15px; border-radius: 8px; display: flex; justify-content: space-between; align-items: center; border-left: 5px solid var(--lime); }}
-        .agent-badge {{ background: var(--accent); color: white; padding: 3px 10px; border-radius: 4px; font-size: 0.7rem; font-weight: 800; text-transform: uppercase; }}
-        table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-        th {{ text-align: left; background: #f8fafc; padding: 15px; border-bottom: 2px solid #e2e8f0; font-size: 0.75rem; text-transform: uppercase; color: var(--accent); }}
-        td {{ padding: 15px; border-bottom: 1px solid #f1f5f9; }}
-        .source-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(250px, 1fr)); gap: 15px; margin-top: 20px; }}
-        .source-card {{ background: #ffffff; border: 1px solid #e2e8f0; border-radius: 12px; padding: 15px; transition: transform 0.2s; }}
-        .source-card:hover {{ transform: translateY(-3px); border-color: var(--lime); }}
-        .verdict-banner {{ background: linear-gradient(135deg, var(--primary) 0%, var(--accent) 100%); color: white; padding: 40px; border-radius: 12px; margin-top: 40px; }}
-        @media print {{ 
-            @page {{ size: A4 portrait; margin: 15mm 12mm; }} 
-            * {{ -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }}
-            body {{ padding: 0; background: white; font-size: 10pt; }}
-            .container {{ box-shadow: none; padding: 0; max-width: 100%; }} 
-            .section-title {{ page-break-after: avoid; margin-top: 20px; padding: 10px; font-size: 12pt; }}
-            .page-break {{ page-break-before: always; }}
-            .keep-together {{ page-break-inside: avoid; }}
-            table {{ font-size: 8pt; }} th, td {{ padding: 8px; }}
-            canvas {{ max-height: 180px !important; }}
-            .print-btn {{ display: none; }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- Print/PDF Button -->
-    <button class="print-btn" onclick="window.print()" style="position:fixed; top:20px; right:20px; background:var(--accent); color:white; border:none; padding:12px 24px; border-radius:8px; font-weight:700; cursor:pointer; box-shadow:0 4px 12px rgba(0,0,0,0.15); z-index:1000;">📄 Guardar PDF</button>
-    
-    <div class="container">
-        <header style="border-bottom: 2px solid #f1f5f9; padding-bottom: 30px; margin-bottom: 40px; display: flex; justify-content: space-between; align-items: flex-end;">
-            <div><span style="color:var(--accent); font-weight:bold; letter-spacing:2px;">NEXUS-360 // {report_id}</span><h1>{niche_title}</h1></div>
-            <div style="text-align:right;"><div style="color:#b91c1c; font-weight:bold;">CONFIDENCIAL</div><div style="font-size:0.8rem; color:#64748b;">GÉNESIS: {timestamp_now().strftime('%d %B, %Y')}</div></div>
-        </header>
 
-        <!-- SECTION: Quick Navigation Index -->
-        <div class="section-container" style="background:linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%); padding:20px; margin-bottom:30px;">
-            <div style="display:flex; justify-content:space-between; align-items:center; flex-wrap:wrap; gap:10px;">
-                <div style="font-size:0.7rem; color:#64748b; font-weight:700;">📋 TABLA DE CONTENIDO</div>
-                <div style="display:flex; gap:8px; flex-wrap:wrap;">
-                    <span style="background:#6366f1; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">I. Veredicto</span>
-                    <span style="background:#3b82f6; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">II. Competencia</span>
-                    {'<span style="background:#059669; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">II-B. Traffic & SEO</span>' if has_search_intel else ''}
-                    <span style="background:#22c55e; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">III. Consumidor</span>
-                    <span style="background:#f59e0b; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">IV. Finanzas</span>
-                    <span style="background:#ef4444; color:white; padding:4px 10px; border-radius:15px; font-size:0.65rem; font-weight:600;">V. Riesgos</span>
-                </div>
-            </div>
-        </div>
+        raw_summary = p_data.get("executive_summary", "Sin resumen disponible.")
+        summary = _md_bold(raw_summary)
+
+        scenarios = m_data.get("scenarios", {})
+        
+
+        
 
-        <!-- SECTION II: Análisis Competitivo (consolidado) -->
-        <div class="page-break section-container">
-            <h2 class="section-title">II. Análisis Competitivo & Brechas <span class="agent-badge">Scout + Strategist</span></h2>
-            <table><thead><tr><th>Rank</th><th>Producto</th><th>Precio</th><th>Rating</th><th>Fortaleza</th><th>Debilidad</th><th>Oportunidad</th></tr></thead><tbody>{top_10_rows}</tbody></table>
-        </div>
+        # Section I: Source Cards
+        source_metadata = i_data.get("source_metadata", [])
+        source_cards_parts = []
+        for s in source_metadata:
+            fname = s['name']
+            summary_str = s.get("summary", "Metadatos, Estructura")
+            _, dot, tail = fname.rpartition('.')
+            ext = tail.upper() if dot else "INTEL"
+            style = _EXT_STYLE.get(ext)
+            if style is None:
+                style = _EXT_STYLE["INTEL"] if s.get("type") == "scout_intelligence" else _EXT_STYLE_DEFAULT
+            bg_color, text_color, icon = style
 
-        {search_terms_section_html}
+            source_cards_parts.append(_SOURCE_CARD_TPL.substitute(
+                icon=icon, bg=bg_color, color=text_color, ext=_t(ext), name=_t(fname), summary=_t(summary_str),
+            ))
+        source_cards_html = "".join(source_cards_parts)
 
-        <!-- SECTION III: Insights del Consumidor (consolidado) -->
-        <div class="page-break section-container">
-            <h2 class="section-title">III. Insights del Consumidor <span class="agent-badge">Consumer Intelligence</span></h2>
-            <h4 style="margin:0 0 15px 0; color:var(--primary);">📱 Social Listening & Tendencias</h4>
-            {sl_html}
-        </div>
+        # Section II: Competitive Matrix
+        top_10_list = s_data.get("top_10_products", [])
+        top_10_rows = "".join(_TOP10_ROW_TPL.substitute(_top10_row_vars(p)) for p in top_10_list)
 
-        <!-- SECTION IV: Unit Economics (consolidado) -->
-        <div class="page-break section-container">
-            <h2 class="section-title">IV. Unit Economics & Viabilidad <span class="agent-badge">Mathematician</span></h2>
-            <h4 style="margin:0 0 15px 0; color:var(--primary);">📊 Estacionalidad & Demanda</h4>
-            {sales_section_html}
-        </div>
+        # Section III: Social & Scholar
+        sl = s_data.get("social_listening", {})
+        pros_html = "".join(_PRO_ITEM_TPL.substitute(text=_t(p)) for p in sl.get('pros', []))
+        cons_html = "".join(_CON_ITEM_TPL.substitute(text=_t(c)) for c in sl.get('cons', []))
+        
+        scholar = s_data.get("scholar_audit", [])
+        
+        # v2.6 GUARANTEED FALLBACK: Scholar Audit will NEVER be empty
+        if not scholar:
+            niche_title_fallback = niche_title if niche_title else "mercado analizado"
+            scholar = [
+                {
+                    "source": f"Industry Trends Report: {niche_title_fallback[:30]}",
+                    "finding": f"El segmento de {niche_title_fallback} muestra una tendencia hacia la 'premiumización', donde los consumidores están dispuestos a pagar más por productos con transparencia de materiales y garantías extendidas.",
+                    "relevance": "Estrategia de Posicionamiento"
+                },
+                {
+                    "source": "E-commerce Consumer Behavior Study",
+                    "finding": "El 73% de los compradores en esta categoría leen al menos 5 reseñas antes de comprar. La velocidad de respuesta a quejas impacta directamente en la tasa de recompra.",
+                    "relevance": "Optimización de Conversión"
+                }
+            ]
+            logger.info("[Architect] ⚠️ Scholar Audit was empty - using fallback content for: %s", niche_title_fallback)
+        
+        scholar_parts = []
+        for item in scholar:
+            scholar_parts.append(f"""
+            <div style="background:#f0f9ff; border:1px solid #bae6fd; padding:15px; border-radius:12px; margin-bottom:12px; border-left:4px solid #0284c7;">
+                <div style="font-size:0.65rem; color:#0369a1; font-weight:800; text-transform:uppercase;">{_t(item['source'])} // {_t(item['relevance'])}</div>
+                <div style="font-size:0.9rem; color:#0c4a6e; font-style:italic; margin-top:5px;">"{_t(item['finding'])}"</div>
+            </div>""")
+        scholar_html = "".join(scholar_parts)
 
-            <!-- Financial Stress Test -->
-            <h4 style="margin:30px 0 15px 0; color:var(--primary);">💰 Stress Test Financiero</h4>
-            {amz_context_html}
-            <table><thead><tr><th>Escenario</th><th>MSRP</th><th>Landed</th><th>Net %</th><th>BEQ</th><th>Payback</th><th>Status</th><th>Notas</th></tr></thead><tbody>{math_table_rows}</tbody></table>
-        </div>
 
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <!-- APÉNDICE: Fuentes, Metodología & Senior Partner                     -->
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <div class="page-break section-container">
-            <h2 class="section-title">📎 Apéndice: Fuentes & Metodología <span class="agent-badge">Harvester + Consultancy</span></h2>
-            
-            <!-- Sources Grid -->
-            <h4 style="margin:0 0 15px 0; color:var(--primary);">📁 Fuentes de Datos Analizadas</h4>
-            <div class="source-grid">{source_cards_html}</div>
-            
-            <!-- Senior Partner Summary -->
-            <h4 style="margin:30px 0 15px 0; color:var(--primary);">👔 Informe del Senior Partner</h4>
-            <div style="background:#f1f5f9; padding:40px; border-radius:12px;">{formatted_summary}</div>
-            
-            <!-- Strategic Grid (antes en Brechas) -->
-            <h4 style="margin:30px 0 15px 0; color:var(--primary);">🎯 Propuestas Estratégicas</h4>
-            <div style="display:grid; grid-template-columns: 1fr 1fr; gap:20px;">{strategist_grid_html}</div>
-        </div>
+        # Build emotional analysis section
+        emotional = sl.get("emotional_analysis", {})
+        emotional_html = ""
+        if emotional:
+            emotions = [
+                ("😤 Frustración", emotional.get("frustration", "N/A"), "#dc2626", "#fef2f2"),
+                ("💭 Nostalgia", emotional.get("nostalgia", "N/A"), "#7c3aed", "#f5f3ff"),
+                ("😂 Humor", emotional.get("humor", "N/A"), "#0891b2", "#ecfeff"),
+                ("✨ Deseo", emotional.get("desire", "N/A"), "#059669", "#ecfdf5"),
+                ("🤨 Escepticismo", emotional.get("skepticism", "N/A"), "#d97706", "#fffbeb")
+            ]
+            emotional_html = "".join(
+                _EMO_ROW_TPL.substitute(label=label, text=_t(text), color=color, bg=bg)
+                for label, text, color, bg in emotions
+            )
+        
+        # Build pain keywords table
+        pain_keywords = [pk for pk in sl.get("pain_keywords", []) if isinstance(pk, dict)][:5]
+        pain_html = "".join(
+            f'<tr><td style="font-weight:600; color:#dc2626;">{_t(pk.get("keyword", ""))}</td><td style="font-size:0.75rem;">{_t(pk.get("search_intent", ""))}</td><td><span style="background:#fee2e2; color:#991b1b; padding:2px 6px; border-radius:3px; font-size:0.65rem; font-weight:700;">{_t(pk.get("volume", ""))}</span></td><td style="font-size:0.75rem; color:#475569;">{_t(pk.get("opportunity", ""))}</td></tr>'
+            for pk in pain_keywords
+        )
+        
+        # Build competitor gaps
+        comp_gaps = [cg for cg in sl.get("competitor_gaps", []) if isinstance(cg, dict)][:3]
+        comp_gaps_html = "".join(
+            f'<div style="background:#fff7ed; padding:15px; border-radius:8px; margin-bottom:10px; border-left:3px solid #ea580c;"><div style="font-weight:700; color:#c2410c; font-size:0.85rem;">{_t(cg.get("competitor", ""))}</div><div style="font-size:0.8rem; color:#78350f; margin-top:5px;"><strong>Ignoran:</strong> {_t(cg.get("ignored_issue", ""))}</div><div style="font-size:0.75rem; color:#9a3412; font-style:italic; margin-top:5px;">"{_t(cg.get("user_frustration", ""))}"</div></div>'
+            for cg in comp_gaps
+        )
+        
+        # Build content opportunities (GaryVee + Patel)
+        content_opps = s_data.get("content_opportunities", {})
+        # Solo entradas dict (el LLM a veces devuelve strings sueltos); filtradas una vez antes de recortar
+        gv_ideas = [idea for idea in content_opps.get("garyvee_style", []) if isinstance(idea, dict)][:3]
+        patel_ideas = [idea for idea in content_opps.get("patel_style", []) if isinstance(idea, dict)][:3]
+        
+        gv_html = "".join(
+            f'<div style="background:#fdf4ff; padding:12px; border-radius:8px; margin-bottom:8px; border-left:3px solid #a855f7;"><div style="font-weight:700; color:#7e22ce; font-size:0.85rem;">🔥 {_t(idea.get("idea", ""))}</div><div style="font-size:0.75rem; color:#6b21a8; margin-top:5px;">Formato: {_t(idea.get("format", ""))} | Hook: "{_t(idea.get("hook", ""))}" | Emoción: {_t(idea.get("emotional_trigger", ""))}</div></div>'
+            for idea in gv_ideas
+        )
+        
+        patel_html = "".join(
+            f'<div style="background:#f0fdf4; padding:12px; border-radius:8px; margin-bottom:8px; border-left:3px solid #22c55e;"><div style="font-weight:700; color:#15803d; font-size:0.85rem;">📊 {_t(idea.get("idea", ""))}</div><div style="font-size:0.75rem; color:#166534; margin-top:5px;">Keyword: {_t(idea.get("target_keyword", ""))} | Intent: {_t(idea.get("search_intent", ""))} | Gap: {_t(idea.get("content_gap", ""))}</div></div>'
+            for idea in patel_ideas
+        )
+        
+        # Build attention formats section
+        attention = sl.get("attention_formats", {})
+        attention_html = ""
+        if attention:
+            attention_html = f'''
+            <div style="background:#eff6ff; padding:15px; border-radius:8px;">
+                <div style="font-size:0.7rem; color:#1e40af; font-weight:800; text-transform:uppercase; margin-bottom:8px;">🎯 FORMATOS QUE RETIENEN ATENCIÓN</div>
+                <div style="font-size:0.85rem; color:#1e3a8a; margin-bottom:8px;"><strong>Qué funciona:</strong> {_t(attention.get("what_works", "N/A"))}</div>
+                <div style="font-size:0.85rem; color:#1e3a8a; margin-bottom:8px;"><strong>Tono:</strong> {_t(attention.get("tone", "N/A"))}</div>
+                <div style="font-size:0.85rem; color:#1e3a8a;"><strong>Elementos virales:</strong> {_t(attention.get("viral_elements", "N/A"))}</div>
+            </div>'''
+        
+        # White space topics
+        white_space = sl.get("white_space_topics", [])
+        
+        # Campos de texto libre del social listening: default compartido + escape, una sola pasada
+        sl_text = {k: _t(sl.get(k, default)) for k, default in _SL_TEXT_DEFAULTS.items()}
+        white_space_html = "".join(_WHITE_SPACE_CHIP_TPL.substitute(text=_t(t)) for t in white_space[:5])
 
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <!-- SECTION I: VEREDICTO EJECUTIVO (Ahora es lo primero)                -->
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <div class="section-container" style="margin-top:0;">
-            <!-- Main Verdict Banner -->
-            <div style="background: linear-gradient(135deg, #0f172a 0%, #1e3a8a 50%, #3730a3 100%); color: white; padding: 50px; border-radius: 16px; position:relative; overflow:hidden;">
-                <div style="position:absolute; top:0; right:0; width:200px; height:200px; background:rgba(255,255,255,0.05); border-radius:50%; transform:translate(30%, -30%);"></div>
-                <div style="position:absolute; bottom:0; left:0; width:150px; height:150px; background:rgba(255,255,255,0.03); border-radius:50%; transform:translate(-30%, 30%);"></div>
+        # Los textos libres (sl_text) van como mapping base; el resto son bloques ya renderizados
+        sl_html = _SL_SECTION_TPL.substitute(
+            sl_text,
+            emotional_html=emotional_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectó análisis emocional específico.</p>',
+            comp_gaps_html=comp_gaps_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectaron gaps específicos.</p>',
+            pain_html=pain_html or '<tr><td colspan="4" style="color:#64748b; font-size:0.8rem;">No se detectaron pain keywords.</td></tr>',
+            gv_html=gv_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectaron oportunidades GaryVee.</p>',
+            patel_html=patel_html or '<p style="font-size:0.8rem; color:#64748b;">No se detectaron oportunidades Patel.</p>',
+            white_space_html=white_space_html or '<span style="color:#64748b; font-size:0.8rem;">N/A</span>',
+            attention_html=attention_html,
+            scholar_html=scholar_html or '<p style="margin:0; font-style:italic;">No se detectaron hallazgos académicos específicos para esta categoría.</p>',
+            pros_html=pros_html or '<li style="opacity:0.6;">Sin datos de fortalezas</li>',
+            cons_html=cons_html or '<li style="opacity:0.6;">Sin datos de debilidades</li>',
+        )
+
+        # Section IV: Sales & Seasonality with Charts
+        sales_intel = s_data.get("sales_intelligence", {})
+        mkt_share = sales_intel.get("market_share_by_brand", [])
+        
+        # v2.6 GUARANTEED FALLBACK: Market Share will NEVER be empty
+        if not mkt_share:
+            top_products = s_data.get("top_10_products", [])
+            if top_products:
+                # Extract brands from top products and estimate market share
+                brand_counts = {}
+                for prod in top_products[:10]:
+                    brand = prod.get("brand", "").strip()
+                    if not brand or brand.lower() in ["n/a", "unknown", ""]:
+                        brand = prod.get("name", "Marca Genérica")[:20]
+                    brand_counts[brand] = brand_counts.get(brand, 0) + 1
                 
-                <span style="letter-spacing:3px; font-weight:bold; font-size:0.75rem; color:#60a5fa; text-transform:uppercase;">🎯 VEREDICTO NEXUS</span>
-                <h2 style="font-family:var(--serif); margin:15px 0; font-size:2.2rem; line-height:1.2;">{_clean_field(verdict.get('title'), 'PROPUESTA ESTRATÉGICA').upper()}</h2>
-                <p style="font-size:1.1rem; opacity:0.9; max-width:800px; line-height:1.6;">{_clean_field(verdict.get('text'), 'Análisis estratégico en proceso.')}</p>
-            </div>
+                # Convert counts to percentages
+                total = sum(brand_counts.values())
+                mkt_share = [
+                    {"brand": b, "share": round((c / total) * 100)}
+                    for b, c in sorted(brand_counts.items(), key=lambda x: -x[1])
+                ][:5]
+            else:
+                # Ultimate fallback with realistic placeholder brands
+                anchor = s_data.get("scout_anchor", "Mercado")
+                mkt_share = [
+                    {"brand": "Líder de Mercado", "share": 35},
+                    {"brand": "Challenger #1", "share": 25},
+                    {"brand": "Challenger #2", "share": 20},
+                    {"brand": "Nicho Premium", "share": 12},
+                    {"brand": "Otros", "share": 8}
+                ]
+            logger.info("[Architect] ⚠️ Market Share was empty - generated %d brand entries.", len(mkt_share))
+        
+        # Build pie chart data (se serializa junto al resto en chart_data)
+        pie_labels = [b.get("brand", "Unknown") for b in mkt_share]
+        pie_values = [b.get("share", 0) for b in mkt_share]
+        pie_colors = _PIE_COLORS
+        
+        # Google Trends datasets
+        gt_datasets = [
+            {
+                "label": k,
+                "data": v,
+                "borderColor": pie_colors[i % len(pie_colors)],
+                "backgroundColor": f"{pie_colors[i % len(pie_colors)]}22",
+                "borderWidth": 3,
+                "tension": 0.4,
+                "fill": True,
+                "pointRadius": 4,
+                "pointBackgroundColor": "#ffffff",
+                "pointBorderWidth": 2
+            } for i, (k, v) in enumerate(gt_series.items())
+        ]
+        
+        # Get seasonality data from LLM
+        seasonality = sales_intel.get("seasonality", {})
+        peaks = seasonality.get("peaks", [])
+        low_points = seasonality.get("low_points", [])
+        strategy_insight = seasonality.get("strategy_insight", "Análisis en progreso...")
+        
+        # FULL 12-MONTH COMMERCIAL CALENDAR
+        # Base compartida de módulo; solo se copian los meses que el LLM modifica
+        full_year_calendar = dict(_BASE_CALENDAR) if peaks else _BASE_CALENDAR
+        
+        # Un solo pase sobre los picos del LLM: fusiona el calendario base y construye las cards de detalle
+        peak_events_parts = []
+        for p in peaks:
+            month = p.get("month", "")
+            impact = p.get("impact", "Medium")
+            cal = full_year_calendar.get(month)
+            if cal is not None:
+                cal = full_year_calendar[month] = dict(cal)
+                # LLM-detected event takes priority
+                cal["llm_event"] = p.get("event", "")
+                cal["llm_strategy"] = p.get("strategy", "")
+                cal["impact"] = impact
+                # Adjust demand based on LLM impact
+                demand = _PEAK_DEMAND.get(impact)
+                if demand is not None:
+                    cal["demand"] = demand
             
-            <!-- Propuesta Concreta Grid -->
-            <div style="display:grid; grid-template-columns: repeat(3, 1fr); gap:20px; margin-top:25px;">
-                
-                <!-- Producto Propuesto -->
-                <div style="background:linear-gradient(135deg, #f0fdf4 0%, #dcfce7 100%); border:2px solid #22c55e; border-radius:16px; padding:25px;">
-                    <div style="font-size:0.7rem; color:#15803d; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:10px;">📦 PRODUCTO PROPUESTO</div>
-                    <div style="font-size:1.3rem; font-weight:800; color:#166534; margin-bottom:15px;">{_clean_field(verdict.get('product_name'), 'NEXUS Premium Edition')}</div>
-                    <div style="font-size:0.85rem; color:#166534; line-height:1.5;">{_clean_field(verdict.get('product_concept'), 'Producto premium que resuelve las brechas identificadas en el análisis competitivo.')}</div>
-                    <div style="margin-top:15px; padding-top:15px; border-top:1px dashed #22c55e;">
-                        <div style="font-size:0.7rem; color:#15803d; font-weight:700;">🏷️ POSICIONAMIENTO:</div>
-                        <div style="font-size:0.8rem; color:#166534; margin-top:5px;">{_clean_field(verdict.get('positioning'), 'Premium / Best-in-Class')}</div>
-                    </div>
-                </div>
-                
-                <!-- Diferenciadores Clave -->
-                <div style="background:linear-gradient(135deg, #eff6ff 0%, #dbeafe 100%); border:2px solid #3b82f6; border-radius:16px; padding:25px;">
-                    <div style="font-size:0.7rem; color:#1d4ed8; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:10px;">⚡ DIFERENCIADORES CLAVE</div>
-                    <ul style="margin:0; padding-left:18px; font-size:0.85rem; color:#1e40af; line-height:1.8;">
-                        <li>{verdict.get('differentiators', ['Calidad superior', 'Precio competitivo', 'Experiencia única'])[0] if isinstance(verdict.get('differentiators'), list) and len(verdict.get('differentiators', [])) > 0 else 'Calidad superior validada'}</li>
-                        <li>{verdict.get('differentiators', ['Calidad superior', 'Precio competitivo', 'Experiencia única'])[1] if isinstance(verdict.get('differentiators'), list) and len(verdict.get('differentiators', [])) > 1 else 'Precio competitivo'}</li>
-                        <li>{verdict.get('differentiators', ['Calidad superior', 'Precio competitivo', 'Experiencia única'])[2] if isinstance(verdict.get('differentiators'), list) and len(verdict.get('differentiators', [])) > 2 else 'Experiencia de usuario única'}</li>
-                    </ul>
-                    <div style="margin-top:15px; padding:12px; background:rgba(59,130,246,0.1); border-radius:8px;">
-                        <div style="font-size:0.7rem; color:#1d4ed8; font-weight:700;">🎯 MOAT DEFENSIVO:</div>
-                        <div style="font-size:0.8rem; color:#1e40af; margin-top:5px;">{validate_moat_for_low_tech(_clean_field(verdict.get('moat'), 'Barrera competitiva sostenible'), final_anchor)}</div>
-                    </div>
-                </div>
-                
-                <!-- Mercado Objetivo EXPANDIDO -->
-                <div style="background:linear-gradient(135deg, #fef3c7 0%, #fde68a 100%); border:2px solid #f59e0b; border-radius:16px; padding:25px;">
-                    <div style="font-size:0.7rem; color:#b45309; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:15px; display:flex; align-items:center; gap:8px;">
-                        👥 MERCADO OBJETIVO
-                        <span style="background:#92400e; color:white; padding:2px 8px; border-radius:10px; font-size:0.55rem;">3 SEGMENTOS VALIDADOS</span>
-                    </div>
-                    
-                    <!-- Segmentos en Mini Cards -->
-                    <div style="display:flex; flex-direction:column; gap:8px;">
-                        <!-- Segmento Primario -->
-                        <div style="background:white; border-radius:10px; padding:12px; border-left:4px solid #22c55e;">
-                            <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
-                                <span style="font-size:0.9rem; font-weight:700; color:#166534;">🎯 Early Adopters Premium</span>
-                                <span style="background:#dcfce7; color:#166534; padding:2px 8px; border-radius:8px; font-size:0.6rem; font-weight:700;">35% TAM</span>
-                            </div>
-                            <div style="font-size:0.75rem; color:#4b5563; line-height:1.4;">Tech-savvy, innovación sobre precio. Primeros en probar productos nuevos.</div>
-                            <div style="display:flex; gap:6px; margin-top:8px; flex-wrap:wrap;">
-                                <span style="background:#f0fdf4; color:#166534; padding:2px 6px; border-radius:4px; font-size:0.55rem;">25-38 años</span>
-                                <span style="background:#f0fdf4; color:#166534; padding:2px 6px; border-radius:4px; font-size:0.55rem;">$75K-$150K</span>
-                                <span style="background:#f0fdf4; color:#166534; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Urbano</span>
-                            </div>
-                        </div>
-                        
-                        <!-- Segmento Secundario -->
-                        <div style="background:white; border-radius:10px; padding:12px; border-left:4px solid #3b82f6;">
-                            <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
-                                <span style="font-size:0.9rem; font-weight:700; color:#1d4ed8;">💼 Quality-First Professionals</span>
-                                <span style="background:#dbeafe; color:#1d4ed8; padding:2px 8px; border-radius:8px; font-size:0.6rem; font-weight:700;">40% TAM</span>
-                            </div>
-                            <div style="font-size:0.75rem; color:#4b5563; line-height:1.4;">Compran calidad para evitar recompras. Valoran durabilidad y garantía.</div>
-                            <div style="display:flex; gap:6px; margin-top:8px; flex-wrap:wrap;">
-                                <span style="background:#eff6ff; color:#1d4ed8; padding:2px 6px; border-radius:4px; font-size:0.55rem;">35-50 años</span>
-                                <span style="background:#eff6ff; color:#1d4ed8; padding:2px 6px; border-radius:4px; font-size:0.55rem;">$100K-$200K</span>
-                                <span style="background:#eff6ff; color:#1d4ed8; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Suburbano</span>
-                            </div>
-                        </div>
-                        
-                        <!-- Segmento Terciario -->
-                        <div style="background:white; border-radius:10px; padding:12px; border-left:4px solid #d946ef;">
-                            <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
-                                <span style="font-size:0.9rem; font-weight:700; color:#a21caf;">🎁 Gift Buyers Ocasionales</span>
-                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 8px; border-radius:8px; font-size:0.6rem; font-weight:700;">25% TAM</span>
-                            </div>
-                            <div style="font-size:0.75rem; color:#4b5563; line-height:1.4;">Buscan regalos especiales. Priorizan presentación y valor percibido.</div>
-                            <div style="display:flex; gap:6px; margin-top:8px; flex-wrap:wrap;">
-                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 6px; border-radius:4px; font-size:0.55rem;">30-55 años</span>
-                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Estacional</span>
-                                <span style="background:#fdf4ff; color:#a21caf; padding:2px 6px; border-radius:4px; font-size:0.55rem;">Nacional</span>
-                            </div>
-                        </div>
+            event = p.get("event", "")
+            strategy = p.get("strategy", "Optimizar presencia y stock")
+            
+            (bg_gradient, border_c, badge_c), fallbacks = _PEAK_IMPACT_STYLE.get(impact, _PEAK_IMPACT_STYLE["Medium"])
+            
+            # Use strategy from LLM, with fallbacks based on impact
+            tactic = p.get("tactic", fallbacks[0])
+            budget = p.get("budget", fallbacks[1])
+            inventory = p.get("inventory", fallbacks[2])
+            promo = p.get("promo", fallbacks[3])
+            
+            peak_events_parts.append(f'''
+            <div style="background:linear-gradient(135deg, {bg_gradient} 0%, white 100%); padding:20px; border-radius:12px; border:1px solid {border_c};">
+                <div style="display:flex; justify-content:space-between; align-items:flex-start; margin-bottom:12px;">
+                    <div>
+                        <div style="font-size:0.65rem; color:#64748b; font-weight:800; text-transform:uppercase;">{_t(month)}</div>
+                        <div style="font-weight:700; color:var(--primary); font-size:1rem; margin:4px 0;">{_t(event)}</div>
                     </div>
+                    <span style="background:{badge_c}; color:white; padding:4px 10px; border-radius:6px; font-size:0.65rem; font-weight:800;">{_t(impact)}</span>
                 </div>
-            </div>
-            
-            <!-- v2.6: Multiple Buyer Personas Section -->
-            <div style="margin-top:25px;">
-                <div style="font-size:0.75rem; color:#64748b; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:15px;">🧑‍🤝‍🧑 BUYER PERSONAS ESTRATÉGICOS ({len(all_personas)} SEGMENTOS)</div>
-                <div style="display:flex; gap:15px; flex-wrap:wrap;">
-                    {personas_html}
+                <div style="display:grid; grid-template-columns: 1fr 1fr; gap:12px; margin-top:12px;">
+                    <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
+                        <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">📈 TÁCTICA MARKETING</div>
+                        <div style="font-size:0.75rem; color:var(--primary);">{_t(tactic)}</div>
+                    </div>
+                    <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
+                        <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">💰 BUDGET SUGERIDO</div>
+                        <div style="font-size:0.75rem; color:#f97316; font-weight:600;">{_t(budget)}</div>
+                    </div>
+                    <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
+                        <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">📦 INVENTARIO</div>
+                        <div style="font-size:0.75rem; color:var(--primary);">{_t(inventory)}</div>
+                    </div>
+                    <div style="background:white; padding:10px; border-radius:8px; border:1px solid #e2e8f0;">
+                        <div style="font-size:0.6rem; color:#64748b; font-weight:700; margin-bottom:4px;">🏷️ PROMO SUGERIDA</div>
+                        <div style="font-size:0.75rem; color:var(--primary);">{_t(promo)}</div>
+                    </div>
                 </div>
-            </div>
+                <div style="margin-top:12px; padding-top:12px; border-top:1px dashed #e2e8f0;">
+                    <div style="font-size:0.65rem; color:#64748b;">💡 <strong>Insight:</strong> {_t(strategy)}</div>
+                </div>
+            </div>''')
+        
+        # Line chart data - all 12 months
+        line_labels = _MONTHS_ES
+        line_values = [full_year_calendar[m]["demand"] for m in _MONTHS_ES]
+        
+        # Build FULL 12-month calendar HTML
+        calendar_html = "".join(_calendar_card(month, data) for month, data in full_year_calendar.items())
+        
+        # Peak events detail HTML (cards construidas en el mismo pase que el calendario)
+        peak_events_html = "".join(peak_events_parts) if peaks else _NO_PEAKS_HTML
+        
+        # Financial Data Card Construction
+        fin_data = i_data.get("financial_data", {})
+        financial_html = ""
+        if fin_data.get("has_financial_data"):
+            avg_price = fin_data.get("avg_price", 0)
+            avg_fees = fin_data.get("avg_fees", 0)
+            avg_margin = fin_data.get("net_margin_percent", 0)
+            active_sellers = fin_data.get("avg_active_sellers", 1)
+            dimensions = fin_data.get("common_dimensions", "N/A")
+            click_share = fin_data.get("avg_click_share", 0)
             
-            <!-- TAM/SAM/SOM Section -->
-            <div style="display:grid; grid-template-columns: 1fr; gap:20px; margin-top:20px;">
-
-                <div style="background:linear-gradient(180deg, #0f172a 0%, #1e293b 100%); border-radius:16px; padding:25px; color:white;">
-                    <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px;">
-                        <div style="font-size:0.7rem; color:#94a3b8; font-weight:800; text-transform:uppercase; letter-spacing:1px;">📊 DIMENSIONAMIENTO DE MERCADO</div>
-                        <span style="background:{'#22c55e' if has_market_data else '#f59e0b' if has_estimate_data else '#ef4444'}; color:white; padding:2px 8px; border-radius:8px; font-size:0.5rem;">{'📁 DATOS POE' if has_market_data else '⚡ ESTIMADO IA' if has_estimate_data else '⚠️ PENDIENTE'}</span>
-                    </div>
-                    
-                    <!-- TAM with source -->
-                    <div style="margin-bottom:12px;">
-                        <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:3px;">
-                            <span style="font-size:0.65rem; color:#94a3b8;">TAM (Mercado Total)</span>
-                            <span style="font-size:0.95rem; font-weight:800; color:#22c55e;">{tam_display}</span>
+            # Color logic for margin
+            margin_color = "#166534" if avg_margin > 20 else ("#f59e0b" if avg_margin > 10 else "#dc2626")
+            
+            financial_html = f'''
+            <!-- Unit Economics & Logistics Card -->
+            <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; padding:25px; margin-top:25px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.02);">
+                 <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:20px;">
+                    <h4 style="margin:0; color:var(--primary); font-family:var(--serif); display:flex; align-items:center; gap:10px;">
+                        💰 Unit Economics & Logística Real
+                    </h4>
+                    <span style="background:#f0f9ff; color:#0369a1; padding:4px 12px; border-radius:20px; font-size:0.7rem; font-weight:800; border:1px solid #bae6fd;">DATA FINANCIERA VERIFICADA</span>
+                 </div>
+                 
+                 <div style="display:grid; grid-template-columns: repeat(4, 1fr); gap:20px;">
+                    <!-- Price Structure -->
+                    <div style="background:#f8fafc; padding:15px; border-radius:12px; border:1px solid #e2e8f0;">
+                        <div style="font-size:0.65rem; color:#64748b; font-weight:800; text-transform:uppercase; margin-bottom:8px;">ESTRUCTURA DE PRECIO</div>
+                        <div style="display:flex; justify-content:space-between; align-items:baseline; margin-bottom:4px;">
+                            <span style="font-size:0.8rem; color:#475569;">Precio Promedio</span>
+                            <span style="font-size:1rem; font-weight:700; color:var(--primary);">${avg_price}</span>
                         </div>
-                        <div style="background:#334155; border-radius:4px; height:6px; overflow:hidden;">
-                            <div style="background:#22c55e; width:100%; height:100%;"></div>
+                        <div style="display:flex; justify-content:space-between; align-items:baseline;">
+                            <span style="font-size:0.8rem; color:#475569;">FBA Fees</span>
+                            <span style="font-size:0.9rem; font-weight:600; color:#dc2626;">-${avg_fees}</span>
+                        </div>
+                        <div style="margin-top:8px; padding-top:8px; border-top:1px dashed #cbd5e1; display:flex; justify-content:space-between; align-items:baseline;">
+                            <span style="font-size:0.8rem; font-weight:700; color:#1e293b;">Margen Neto Est.</span>
+                            <span style="font-size:1.1rem; font-weight:800; color:{margin_color};">{avg_margin}%</span>
                         </div>
                     </div>
                     
-                    <!-- SAM with source -->
-                    <div style="margin-bottom:12px;">
-                        <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:3px;">
-                            <span style="font-size:0.65rem; color:#94a3b8;">SAM (Alcanzable)</span>
-                            <span style="font-size:0.95rem; font-weight:800; color:#3b82f6;">{sam_display}</span>
-                        </div>
-                        <div style="background:#334155; border-radius:4px; height:6px; overflow:hidden;">
-                            <div style="background:#3b82f6; width:30%; height:100%;"></div>
+                    <!-- Competition Intensity -->
+                    <div style="background:#fff7ed; padding:15px; border-radius:12px; border:1px solid #ffedd5;">
+                        <div style="font-size:0.65rem; color:#9a3412; font-weight:800; text-transform:uppercase; margin-bottom:8px;">INTENSIDAD COMPETITIVA</div>
+                        <div style="text-align:center; margin-top:10px;">
+                            <div style="font-size:2rem; font-weight:800; color:#c2410c;">{active_sellers}</div>
+                            <div style="font-size:0.7rem; color:#9a3412; font-weight:600;">Vendedores Activos Promedio</div>
                         </div>
                     </div>
                     
-                    <!-- SOM with source -->
-                    <div style="margin-bottom:12px;">
-                        <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:3px;">
-                            <span style="font-size:0.65rem; color:#94a3b8;">SOM (Meta Año 1)</span>
-                            <span style="font-size:0.95rem; font-weight:800; color:#f59e0b;">{som_display}</span>
-                        </div>
-                        <div style="background:#334155; border-radius:4px; height:6px; overflow:hidden;">
-                            <div style="background:#f59e0b; width:5%; height:100%;"></div>
+                    <!-- Logistics -->
+                    <div style="background:#f0fdf4; padding:15px; border-radius:12px; border:1px solid #dcfce7;">
+                        <div style="font-size:0.65rem; color:#166534; font-weight:800; text-transform:uppercase; margin-bottom:8px;">LOGÍSTICA & DIMENSIONES</div>
+                        <div style="display:flex; align-items:center; gap:10px; margin-top:10px;">
+                            <div style="font-size:1.5rem;">📦</div>
+                            <div>
+                                <div style="font-size:0.8rem; font-weight:700; color:#15803d;">{dimensions}</div>
+                                <div style="font-size:0.65rem; color:#166534;">Tamaño Estándar Detectado</div>
+                            </div>
                         </div>
                     </div>
                     
-                    <!-- Methodology Note -->
-                    <div style="background:#1e293b; border:1px dashed #475569; padding:8px; border-radius:6px; margin-top:10px;">
-                        <div style="font-size:0.55rem; color:#94a3b8; line-height:1.4;">
-                            <strong style="color:#f59e0b;">📐 FUENTE:</strong> {market_source}
+                    <!-- Market Attention -->
+                    <div style="background:#f5f3ff; padding:15px; border-radius:12px; border:1px solid #ede9fe;">
+                        <div style="font-size:0.65rem; color:#6b21a8; font-weight:800; text-transform:uppercase; margin-bottom:8px;">RETENCIÓN DE ATENCIÓN</div>
+                        <div style="text-align:center; margin-top:10px;">
+                            <div style="font-size:2rem; font-weight:800; color:#7c3aed;">{click_share}%</div>
+                            <div style="font-size:0.7rem; color:#6b21a8; font-weight:600;">Click Share Promedio</div>
                         </div>
                     </div>
-                </div>
-            
-            <!-- Pricing & ROI with Sources -->
-            <div style="display:grid; grid-template-columns: 1fr 1fr; gap:20px; margin-top:20px;">
-                <div style="background:#0f172a; color:white; border-radius:16px; padding:30px;">
-                    <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px;">
-                        <div style="font-size:0.7rem; color:#94a3b8; font-weight:800; text-transform:uppercase; letter-spacing:1px;">💰 PRICING STRATEGY</div>
-                        <span style="background:{'#22c55e' if has_real_pricing else '#f59e0b' if has_estimate_data else '#ef4444'}; color:white; padding:2px 8px; border-radius:8px; font-size:0.5rem;">{'📁 DATOS POE' if has_real_pricing else '⚡ ESTIMADO IA' if has_estimate_data else '⚠️ PENDIENTE'}</span>
-                    </div>
-                    <div style="display:grid; grid-template-columns: repeat(3, 1fr); gap:15px; text-align:center;">
-                        <div>
-                            <div style="font-size:0.65rem; color:#94a3b8;">MSRP SUGERIDO</div>
-                            <div style="font-size:1.5rem; font-weight:900; color:#22c55e;">{f"${verdict.get('price_msrp', 'N/A')}" if has_estimate_data or has_real_pricing else "⏳"}</div>
-                        </div>
-                        <div>
-                            <div style="font-size:0.65rem; color:#94a3b8;">COSTO EST.</div>
-                            <div style="font-size:1.5rem; font-weight:900; color:#f97316;">{f"${verdict.get('price_cost', 'N/A')}" if has_estimate_data or has_real_pricing else "⏳"}</div>
-                        </div>
-                        <div>
-                            <div style="font-size:0.65rem; color:#94a3b8;">MARGEN BRUTO</div>
-                            <div style="font-size:1.5rem; font-weight:900; color:#3b82f6;">{f"{verdict.get('margin', 'N/A')}%" if has_estimate_data or has_real_pricing else "⏳"}</div>
-                        </div>
+                 </div>
+            </div>
+            '''
+
+        # Build the sales section HTML with dynamic data
+        sales_section_html = f"""
+        <div style="margin-top:20px;">
+            {financial_html}
+            <!-- Charts Row -->
+            <div style="display:grid; grid-template-columns: 1fr 1.5fr; gap:30px; margin-bottom:30px; margin-top:25px;">
+                <!-- Pie Chart: Market Share with Percentages -->
+                <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; padding:30px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.02);">
+                    <h4 style="margin:0 0 20px 0; color:var(--primary); font-family:var(--serif); display:flex; align-items:center; gap:10px;">
+                        📊 Market Share por Marca
+                        <span style="background:#3b82f6; color:white; padding:2px 8px; border-radius:10px; font-size:0.6rem; font-weight:700;">TOP {len(pie_labels) if pie_labels else 5}</span>
+                    </h4>
+                    <div style="position:relative; height:280px;">
+                        <canvas id="pieChart"></canvas>
                     </div>
-                    <!-- Pricing Methodology -->
-                    <div style="background:#1e293b; border:1px dashed #475569; padding:8px; border-radius:6px; margin-top:15px;">
-                        <div style="font-size:0.55rem; color:#94a3b8; line-height:1.4;">
-                            <strong style="color:#22c55e;">📐 FUENTE:</strong> {pricing_source}<br>
-                            <strong style="color:#3b82f6;">📊 FÓRMULA:</strong> {pricing_formula}
-                        </div>
+                    <!-- Legend with percentages -->
+                    <div style="display:flex; flex-wrap:wrap; gap:8px; margin-top:15px; padding-top:15px; border-top:1px solid #e2e8f0;">
+                        {(''.join([f'<span style="display:flex; align-items:center; gap:4px; font-size:0.7rem; color:#475569;"><span style="width:10px; height:10px; border-radius:50%; background:{pie_colors[i] if i < len(pie_colors) else "#6366f1"};"></span>{_t(pie_labels[i]) if i < len(pie_labels) else "N/A"}: <strong>{pie_values[i] if i < len(pie_values) else 0}%</strong></span>' for i in range(min(len(pie_labels), 5))]) if pie_labels else '<span style="color:#94a3b8; font-size:0.75rem;">Sin datos de marcas</span>')}
                     </div>
                 </div>
                 
-                <div style="background:linear-gradient(135deg, #fdf4ff 0%, #f5d0fe 100%); border:2px solid #d946ef; border-radius:16px; padding:30px;">
-                    <div style="font-size:0.7rem; color:#a21caf; font-weight:800; text-transform:uppercase; letter-spacing:1px; margin-bottom:15px;">🚀 ACCIONES INMEDIATAS</div>
-                    <div style="display:flex; flex-direction:column; gap:10px;">
-                        <div style="display:flex; align-items:center; gap:10px;">
-                            <span style="background:#d946ef; color:white; padding:4px 10px; border-radius:20px; font-size:0.7rem; font-weight:800;">1</span>
-                            <span style="font-size:0.85rem; color:#7e22ce;">{_clean_field(verdict.get('action_1'), 'Validar concepto con muestra de mercado')}</span>
+                <!-- Bar Chart: Seasonality with Values -->
+                <div style="background:linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%); border:1px solid #e2e8f0; border-radius:16px; padding:30px;">
+                    <h4 style="margin:0 0 20px 0; color:var(--primary); font-family:var(--serif); display:flex; align-items:center; gap:10px;">
+                        📈 Evolución de Demanda por Mes
+                        <span style="background:#22c55e; color:white; padding:2px 8px; border-radius:10px; font-size:0.6rem; font-weight:700;">ÍNDICE %</span>
+                    </h4>
+                    <div style="position:relative; height:280px;">
+                        <canvas id="lineChart"></canvas>
+                    </div>
+                    <!-- Key Stats -->
+                    <div style="display:flex; justify-content:space-between; margin-top:15px; padding-top:15px; border-top:1px solid #e2e8f0;">
+                        <div style="text-align:center;">
+                            <div style="font-size:0.6rem; color:#64748b;">PICO MÁXIMO</div>
+                            <div style="font-size:1.1rem; font-weight:800; color:#22c55e;">Noviembre</div>
+                            <div style="font-size:0.7rem; color:#22c55e;">100%</div>
                         </div>
-                        <div style="display:flex; align-items:center; gap:10px;">
-                            <span style="background:#d946ef; color:white; padding:4px 10px; border-radius:20px; font-size:0.7rem; font-weight:800;">2</span>
-                            <span style="font-size:0.85rem; color:#7e22ce;">{_clean_field(verdict.get('action_2'), 'Desarrollar MVP con diferenciadores clave')}</span>
+                        <div style="text-align:center;">
+                            <div style="font-size:0.6rem; color:#64748b;">PROMEDIO</div>
+                            <div style="font-size:1.1rem; font-weight:800; color:#3b82f6;">72%</div>
                         </div>
-                        <div style="display:flex; align-items:center; gap:10px;">
-                            <span style="background:#d946ef; color:white; padding:4px 10px; border-radius:20px; font-size:0.7rem; font-weight:800;">3</span>
-                            <span style="font-size:0.85rem; color:#7e22ce;">{_clean_field(verdict.get('action_3'), 'Lanzar campaña piloto en mercado objetivo')}</span>
+                        <div style="text-align:center;">
+                            <div style="font-size:0.6rem; color:#64748b;">PICO BAJO</div>
+                            <div style="font-size:1.1rem; font-weight:800; color:#f59e0b;">Marzo</div>
+                            <div style="font-size:0.7rem; color:#f59e0b;">50%</div>
                         </div>
                     </div>
                 </div>
             </div>
+            
+            <!-- FULL 12-MONTH CALENDAR -->
+            <div style="background:#ffffff; border:1px solid #e2e8f0; border-radius:16px; padding:25px;">
+                <h4 style="margin:0 0 20px 0; color:var(--primary); font-family:var(--serif);">🗓️ Calendario Comercial Anual - 12 Meses</h4>
+                <div style="display:grid; grid-template-columns: repeat(4, 1fr); gap:12px; margin-bottom:25px;">
+                    {calendar_html}
+                </div>
+                
+                <!-- Peak Events Detail -->
+                <h5 style="margin:20px 0 15px 0; color:var(--accent); font-family:var(--serif); font-size:0.9rem;">📍 Eventos de Alto Impacto - Detalle Estratégico</h5>
+                <div style="display:grid; grid-template-columns: repeat(2, 1fr); gap:20px; margin-bottom:25px;">
+                    {peak_events_html}
+                </div>
+                
+                <!-- Overall Strategy from LLM -->
+                <div style="background:#eff6ff; padding:20px; border-radius:12px; border-left:4px solid var(--accent);">
+                    <div style="font-size:0.7rem; color:var(--accent); font-weight:800; text-transform:uppercase; margin-bottom:8px;">📌 ESTRATEGIA DE SEASONALITY</div>
+                    <div style="font-size:0.9rem; line-height:1.6; color:#1e40af;">{_t(strategy_insight)}</div>
+                </div>
+            </div>
         </div>
+        """
+        
+        # Todos los datos de los gráficos viajan en un único bloque JSON (un json.dumps, un JSON.parse)
+        chart_data = {
+            "pie": {"labels": pie_labels, "values": pie_values, "colors": pie_colors[:len(pie_values)]},
+            "bar": {"labels": line_labels, "values": line_values},
+            "gt": {"labels": gt_months, "datasets": gt_datasets},
+        }
+        script_html = _CHART_JS_TPL.substitute(chart_data=_js_json(chart_data).replace("</", "<\\/"))
 
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <!-- SECCIÓN V: RIESGOS & COMPLIANCE (Consolidado)                       -->
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <div class="page-break section-container">
-            <h2 class="section-title">V. Riesgos, Compliance & Gobernanza <span class="agent-badge">Guardian</span></h2>
-            
-            <!-- Risk Matrix -->
-            <div style="margin-bottom:30px;">
-                {self._render_risk_matrix(g_data)}
+        # Section V: Strategist Gaps
+        gaps = st_data.get("strategic_gaps", [])
+        strategist_grid_html = "".join(
+            _GAP_CARD_TPL.substitute(
+                niche=_t(g.get('niche', 'General')),
+                gap=_t(g.get('gap', 'Oportunidad de Mercado')),
+                proposal=_t(g.get('proposal', 'N/A')),
+            )
+            for g in gaps
+        )
+
+        # Section VI: Financials & Stress Test
+        fba_sens = m_data.get("fba_sensitivity_analysis", {})
+        nexus_target = fba_sens.get("nexus_target", {})
+        n_fba_b = nexus_target.get("fba_breakdown", {})
+        storage_referral = n_fba_b.get('storage', 0) + n_fba_b.get('referral', 0)
+        
+        nexus_fba_card = f"""
+        <div class="fba-card">
+            <div class="fba-card-kicker">NEXUS TARGET UNIT</div>
+            <div class="fba-card-name">{_t(nexus_target.get('name'))}</div>
+            <div class="fba-card-grid">
+                <div><div class="fba-label">Pick/Pack</div><div class="fba-value">{_money(n_fba_b.get('pick_pack'))}</div></div>
+                <div><div class="fba-label">Storage/Ref</div><div class="fba-value">{_money(storage_referral)}</div></div>
+                <div><div class="fba-label">Impacto</div><div class="fba-value" style="color:#10b981;">{nexus_target.get('fba_impact_pct')}%</div></div>
             </div>
-            
-            <!-- Compliance Summary -->
-            <div style="display:grid; grid-template-columns: 2fr 1fr; gap:30px;">
-                <div>
-                    <div style="display:flex; gap:15px; margin-bottom:20px;">
-                        <div style="background:#fee2e2; color:#991b1b; padding:8px 15px; border-radius:8px; font-weight:bold; font-size:0.75rem;">RIESGO: {g_data.get('risk_level', 'MEDIUM')}</div>
-                        <div style="background:#dbeafe; color:#1e40af; padding:8px 15px; border-radius:8px; font-weight:bold; font-size:0.75rem;">COMPLIANCE: {g_data.get('compliance_score', 75)}%</div>
-                    </div>
-                    <table><thead><tr><th>Estándar</th><th>Estatus</th><th>Descripción</th></tr></thead><tbody>{compliance_rows}</tbody></table>
-                </div>
-                <div style="background:var(--primary); color:white; padding:25px; border-radius:12px; height:fit-content;">
-                    <div style="font-size:0.6rem; color:#60a5fa; letter-spacing:2px; margin-bottom:10px;">SECURITY PROTOCOL</div>
-                    <h4 style="margin:0 0 10px 0;">{g_data.get('security_protocol', 'Estándar')}</h4>
-                    <p style="font-size:0.8rem; color:#94a3b8;">Cifrado de extremo a extremo activo.</p>
+        </div>"""
+
+        comps = fba_sens.get("competitors", [])
+        bench_html = "".join(
+            _BENCH_ROW_TPL.substitute(
+                rank=_t(p.get('rank', 'N/A')),
+                name=_t(p.get('name', 'Competitor')),
+                total=_money(p['fba_breakdown']['total_logistics']),
+                color=p['tier_color'],
+                pct=p['fba_impact_pct'],
+            )
+            for p in comps[:10]
+        )
+        bench_html = f'<div style="grid-column: span 1; background:#ffffff50; padding:10px; border-radius:12px;">{bench_html}</div>'
+
+        mra = m_data.get("multivariate_analysis", {})
+        corr = mra.get("correlations", {})
+        multivariate_panel = f"""
+        <div style="grid-column: span 1; background:white; border-radius:16px; padding:20px; border:1px solid #fdba74;">
+             <h5 style="margin:0 0 15px 0; color:#9a3412; font-size:0.8rem; text-transform:uppercase;">Dominance Analysis</h5>
+             <div style="display:grid; grid-template-columns: 1fr 1fr; gap:15px; text-align:center;">
+                <div><div style="font-size:0.6rem; color:#64748b;">Mkt FBA Avg</div><div style="font-size:1.2rem; font-weight:900; color:#dc2626;">{corr.get('avg_market_fba_impact')}%</div></div>
+                <div><div style="font-size:0.6rem; color:#64748b;">Dominance Delta</div><div style="font-size:1.2rem; font-weight:900; color:#059669;">+{corr.get('nexus_dominance_delta')}%</div></div>
+             </div>
+             <div style="margin-top:15px; font-size:0.7rem; color:#9a3412; font-style:italic; line-height:1.4;">* NEXUS desvincula la rentabilidad del costo logístico mediante el desequilibrio positivo de valor.</div>
+        </div>"""
+
+        st_test = m_data.get("stress_test", {})
+        st_impact = st_test.get("impact", {})
+        # profit_erosion llega como "4.2%" desde NEXUS-5, pero se aceptan también valores numéricos
+        erosion_raw = st_impact.get("profit_erosion", 0)
+        try:
+            erosion_val = float(erosion_raw.rstrip("%")) if isinstance(erosion_raw, str) else float(erosion_raw or 0)
+        except ValueError:
+            erosion_val = 0.0
+        erosion_label = erosion_raw if isinstance(erosion_raw, str) else f"{erosion_val:.1f}%"
+        erosion_width = 0 if erosion_val <= 0 else 100 if erosion_val >= 25 else erosion_val * 4
+        resilience_status = str(st_impact.get("resilience_status") or "N/A").upper()
+        stress_panel_html = f"""
+        <div style="margin-top:25px; background:#fef2f2; border:1px solid #fecaca; border-radius:16px; padding:20px; grid-column: span 3;">
+            <div style="display:flex; justify-content:space-between; align-items:center;">
+                <h4 style="margin:0; color:#991b1b; font-size:1rem;">🌩️ Stress Test: High-CAC Volatility Simulation</h4>
+                <div style="background:#dc2626; color:white; padding:4px 12px; border-radius:6px; font-weight:900; font-size:0.7rem;">{_t(resilience_status)}</div>
+            </div>
+            <div style="margin-top:15px; display:grid; grid-template-columns: 2fr 1.5fr; gap:30px; align-items:center;">
+                <div>
+                     <div style="display:flex; justify-content:space-between; margin-bottom:6px; font-size:0.8rem; font-weight:700; color:#991b1b;"><span>Profit Erosion Impact</span><span>{_t(erosion_label)}</span></div>
+                     <div style="width:100%; height:10px; background:#fee2e2; border-radius:5px; overflow:hidden;"><div style="width:{erosion_width}%; height:100%; background:#991b1b;"></div></div>
                 </div>
+                <div style="font-size:0.85rem; color:#7f1d1d; line-height:1.5;"><strong>Veredicto:</strong> {_t(st_test.get('verdict'))}</div>
             </div>
-        </div>
+        </div>"""
 
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <!-- SECCIÓN VI: ESTRATEGIA & ROADMAP (Consolidado)                      -->
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <div class="page-break section-container">
-            <h2 class="section-title">VI. Estrategia Comercial & Roadmap <span class="agent-badge">Strategist</span></h2>
-            
-            <!-- Price Tiers -->
-            <h4 style="margin:0 0 15px 0; color:var(--primary);">💰 Rangos de Precio & Sweet Spot</h4>
-            <div style="margin-bottom:30px;">
-                {self._render_price_tiers(price_tiers, price_range_display, price_median_display, prices_list)}
-            </div>
-            
-            <!-- Pain Points & USP -->
-            <h4 style="margin:0 0 15px 0; color:var(--primary);">😤 Pain Points & USP Proposals</h4>
-            <div style="margin-bottom:30px;">
-                {self._render_pain_points(st_data)}
-            </div>
-            
-            <!-- Roadmap -->
-            <h4 style="margin:0 0 15px 0; color:var(--primary);">🗺️ Plan de Ejecución</h4>
-            {roadmap_html}
-        </div>
+        amz_context_html = f"""
+        <div style="background:#fff7ed; border:1px solid #fdba74; padding:30px; border-radius:16px; margin-bottom:30px;">
+             <h4 style="margin-top:0; color:#9a3412; font-family:var(--serif);">⚖️ Análisis Multivariable (MRA) & Stress Test (TOP 10)</h4>
+             <div style="display:grid; grid-template-columns: 1fr 1fr 1fr; gap:15px;">
+                {nexus_fba_card}
+                {bench_html}
+                {multivariate_panel}
+                {stress_panel_html}
+             </div>
+        </div>"""
 
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <!-- SECCIÓN VII: BUYER PERSONAS & CONSUMER DEEP DIVE                    -->
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <div class="page-break section-container">
-            <h2 class="section-title">VII. Buyer Personas Detallados <span class="agent-badge">Consumer Intel</span></h2>
-            
-            <!-- Detailed Personas -->
-            {self._render_detailed_buyer_personas(buyer_personas)}
-            
-            <!-- Reviews Analysis -->
-            <h4 style="margin:30px 0 15px 0; color:var(--primary);">⭐ Análisis de Reviews & Sentiment</h4>
-            {self._render_reviews_analysis(reviews_analysis, top_10_list_for_pricing)}
-        </div>
+        math_table_rows = "".join(
+            _SCENARIO_ROW_TPL.substitute(
+                name=_t(s['name']),
+                composition=_t(s.get('composition', '')),
+                price=_money(s['price']),
+                landed=_money(s['landed']),
+                margin_pct=s['margin_pct'],
+                break_even_qty=s.get('break_even_qty', 'N/A'),
+                payback_months=s.get('payback_months', 'N/A'),
+                notes=_t(s.get('notes', 'Calculado')),
+            )
+            for s in scenarios.values()
+        )
 
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <!-- SECCIÓN VIII: UNIT ECONOMICS DEEP DIVE                              -->
-        <!-- ═══════════════════════════════════════════════════════════════════ -->
-        <div class="page-break section-container">
-            <h2 class="section-title">VIII. Unit Economics Detallado <span class="agent-badge">Mathematician</span></h2>
+        # Section VII: Senior Partner Summary
+        partner_raw = st_data.get("partner_summary")
+        partner_html = _md_bold(partner_raw) if partner_raw else summary
+        formatted_summary = f'<div style="font-size:1.05rem; line-height:1.8; color:#1e293b; white-space:pre-wrap;">{partner_html}</div>'
+
+        # Section VIII: Roadmap
+        roadmap_data = st_data.get("dynamic_roadmap", [])
+        roadmap_html = "".join(
+            _ROADMAP_STEP_TPL.substitute(n=idx, title=_esc(str(step[0])), content=_esc(str(step[1])))
+            for idx, step in enumerate(roadmap_data, start=1)
+        )
+
+        # Section IX: Compliance Audit
+        audits = g_data.get("audits", [])
+        compliance_parts = []
+        for a in audits:
+            status_color, status_bg = _STATUS_COLORS.get(a['status'], _ADVISORY_STYLE)
+            compliance_parts.append(_COMPLIANCE_ROW_TPL.substitute(
+                std=_t(a['std']),
+                status=_t(a['status']),
+                desc=_t(a['desc']),
+                color=status_color,
+                bg=status_bg,
+            ))
+        compliance_rows = "".join(compliance_parts)
+
+        # HTML Assembly
+        verdict = st_data.get("dynamic_verdict", {})
+        
+        # v2.6: Extract ALL personas, not just primary
+        all_personas = verdict.get("strategic_personas", [])
+        if not all_personas:
+            # Fallback to primary_persona if strategic_personas is empty
+            primary = verdict.get("primary_persona", {})
+            if primary:
+                all_personas = [primary]
+            else:
+                # Ultimate fallback
+                all_personas = [
+                    {"name": "Profesional Exigente", "title": "Manager, 28-40 años", "quote": "No tengo tiempo para productos que fallen.", "story": "Investiga antes de comprar, lee reviews de 1 estrella primero."},
+                    {"name": "Early Adopter Tech", "title": "Entusiasta tecnológico, 25-35 años", "quote": "Quiero lo último, pero que funcione.", "story": "Siempre busca innovación, dispuesto a pagar premium por tecnología de punta."},
+                    {"name": "Usuario Práctico", "title": "Usuario cotidiano, 30-50 años", "quote": "Solo necesito que haga su trabajo bien.", "story": "Prioriza confiabilidad sobre features, busca valor a largo plazo."}
+                ]
+        
+        # Primary persona for backwards compatibility
+        persona = all_personas[0] if all_personas else {}
+        persona_name = persona.get("name", "Alejandra") if isinstance(persona, dict) else "Alejandra"
+        persona_title = persona.get("title", "Product Manager en Tech Startup, 32 años") if isinstance(persona, dict) else "Product Manager, 32 años"
+        persona_quote = persona.get("quote", "No tengo tiempo para productos que me fallen. Pago más por tranquilidad.") if isinstance(persona, dict) else "Pago más por tranquilidad."
+        persona_story = persona.get("story", "Investiga obsesivamente antes de comprar, lee las reviews de 1 estrella primero, y está dispuesta a pagar 2x por calidad demostrable.") if isinstance(persona, dict) else "Investiga antes de comprar."
+        
+        # Build HTML for all personas (for later use in section)
+        personas_parts = []
+        avatar_icons = ["👩‍💼", "👨‍💻", "🎁", "👤", "🧑‍🔬"]
+        persona_colors = [
+            ("linear-gradient(135deg, #6366f1, #8b5cf6)", "#eff6ff", "#6366f1"),
+            ("linear-gradient(135deg, #10b981, #14b8a6)", "#f0fdf4", "#10b981"),
+            ("linear-gradient(135deg, #f59e0b, #fbbf24)", "#fef3c7", "#f59e0b")
+        ]
+        
+        for idx, p in enumerate(all_personas[:3]):  # Max 3 personas
+            icon = avatar_icons[idx % len(avatar_icons)]
+            gradient, bg_light, accent = persona_colors[idx % len(persona_colors)]
+            p_name = p.get("name", f"Persona {idx+1}")
+            p_title = p.get("title", "Cliente Objetivo")
+            p_quote = p.get("quote", "Busco calidad y confiabilidad.")
+            p_story = p.get("story", "Cliente potencial del segmento objetivo.")
+            p_criteria = p.get("decision_criteria", ["Calidad", "Precio", "Garantía", "Reviews"])[:4]
             
-            <!-- Amazon FBA Fees -->
-            <h4 style="margin:0 0 15px 0; color:var(--primary);">📦 Amazon FBA Fees Structure</h4>
-            {self._render_amazon_fees(amazon_fees, price_median)}
+            criteria_html = "".join([
+                f'<span style="background:{bg_light}; border:1px solid {accent}33; color:{accent}; padding:3px 8px; border-radius:12px; font-size:0.6rem;">✓ {_t(c)}</span>'
+                for c in p_criteria
+            ])
             
-            <!-- 3 Scenarios -->
-            <h4 style="margin:30px 0 15px 0; color:var(--primary);">📊 Proyección de 3 Escenarios</h4>
-            {self._render_three_scenarios(m_data)}
-        </div>
+            personas_parts.append(f'''
+            <div style="background:#ffffff; border:2px solid #e2e8f0; border-radius:16px; padding:20px; position:relative; overflow:hidden; flex:1; min-width:280px;">
+                <div style="position:absolute; top:-10px; right:-10px; font-size:3rem; opacity:0.06;">{icon}</div>
+                <div style="display:flex; gap:12px; align-items:flex-start; margin-bottom:12px;">
+                    <div style="width:50px; height:50px; background:{gradient}; border-radius:50%; display:flex; align-items:center; justify-content:center; font-size:1.5rem; flex-shrink:0;">{icon}</div>
+                    <div style="flex:1;">
+                        <div style="font-size:1rem; font-weight:700; color:var(--primary);">{_t(p_name)}</div>
+                        <div style="font-size:0.7rem; color:#64748b;">{_t(p_title)}</div>
+                    </div>
+                </div>
+                <div style="background:#f8fafc; padding:10px; border-radius:8px; font-style:italic; font-size:0.8rem; color:#475569; border-left:3px solid {accent}; margin-bottom:10px;">
+                    "{_t(p_quote)}"
+                </div>
+                <div style="font-size:0.75rem; color:#4b5563; line-height:1.4; margin-bottom:12px;">{_t(p_story)}</div>
+                <div style="display:flex; gap:5px; flex-wrap:wrap;">{criteria_html}</div>
+            </div>''')
+        personas_html = "".join(personas_parts)
+        
+        # Extract market sizing data (now dynamic, not hardcoded)
+        market = verdict.get("market_sizing", {})
+        tam_display = market.get("tam", "PENDIENTE") if isinstance(market, dict) else "PENDIENTE"
+        sam_display = market.get("sam", "PENDIENTE") if isinstance(market, dict) else "PENDIENTE"
+        som_display = market.get("som", "PENDIENTE") if isinstance(market, dict) else "PENDIENTE"
+        market_source = market.get("source", "⚠️ Datos pendientes") if isinstance(market, dict) else "⚠️ Datos pendientes"
+        has_market_data = market.get("has_real_data", False) if isinstance(market, dict) else False
+        
+        # Diferenciadores: tres bullets fijos, completados con defaults si el strategist trae menos
+        diffs = verdict.get('differentiators')
+        diffs = diffs if isinstance(diffs, list) else []
+        differentiators_html = "\n                        ".join(
+            f"<li>{_t(diffs[i]) if i < len(diffs) else default}</li>" for i, default in enumerate(_DIFFERENTIATOR_DEFAULTS)
+        )
 
-        <footer style="margin-top:50px; text-align:center; font-size:0.7rem; color:#94a3b8; border-top:1px solid #e2e8f0; padding-top:20px;">NEXUS-360 EXECUTIVE DOSSIER v3.1 | Estructura Optimizada | {timestamp_now().strftime('%Y')}</footer>
-    </div>
-    {script_html}
-</body>
-</html>"""
+        # Extract pricing sources - distinguish between POE (real) and LLM (estimate)
+        pricing_source = verdict.get("pricing_source", "⚠️ Datos pendientes")
+        pricing_formula = verdict.get("pricing_formula", "Requiere escaneo con datos")
+        has_real_pricing = verdict.get("has_real_pricing", False)  # From POE files
+        has_estimate_data = verdict.get("has_estimate_data", True)  # From LLM
+
+        
+        report_parts = _report_chunks(dict(
+            report_id=report_id,
+            niche_title=_t(niche_title),
+            genesis_date=genesis_date,
+            traffic_seo_chip=_TRAFFIC_SEO_CHIP if has_search_intel else '',
+            top_10_rows=top_10_rows,
+            search_terms_section_html=search_terms_section_html,
+            sl_html=sl_html,
+            sales_section_html=sales_section_html,
+            amz_context_html=amz_context_html,
+            math_table_rows=math_table_rows,
+            source_cards_html=source_cards_html,
+            formatted_summary=formatted_summary,
+            strategist_grid_html=strategist_grid_html,
+            verdict_title=_t(_clean_field(verdict.get('title'), 'PROPUESTA ESTRATÉGICA').upper()),
+            verdict_text=_esc(_clean_field(verdict.get('text'), 'Análisis estratégico en proceso.')),
+            product_name=_t(_clean_field(verdict.get('product_name'), 'NEXUS Premium Edition')),
+            product_concept=_t(_clean_field(verdict.get('product_concept'), 'Producto premium que resuelve las brechas identificadas en el análisis competitivo.')),
+            positioning=_t(_clean_field(verdict.get('positioning'), 'Premium / Best-in-Class')),
+            differentiators_html=differentiators_html,
+            verdict_moat=_t(validate_moat_for_low_tech(_clean_field(verdict.get('moat'), 'Barrera competitiva sostenible'), final_anchor)),
+            personas_count=len(all_personas),
+            personas_html=personas_html,
+            market_color='#22c55e' if has_market_data else '#f59e0b' if has_estimate_data else '#ef4444',
+            market_badge='📁 DATOS POE' if has_market_data else '⚡ ESTIMADO IA' if has_estimate_data else '⚠️ PENDIENTE',
+            tam_display=_t(tam_display),
+            sam_display=_t(sam_display),
+            som_display=_t(som_display),
+            market_source=_t(market_source),
+            pricing_color='#22c55e' if has_real_pricing else '#f59e0b' if has_estimate_data else '#ef4444',
+            pricing_badge='📁 DATOS POE' if has_real_pricing else '⚡ ESTIMADO IA' if has_estimate_data else '⚠️ PENDIENTE',
+            price_msrp=_t(_money(verdict.get('price_msrp', 'N/A'))) if has_estimate_data or has_real_pricing else "⏳",
+            price_cost=_t(_money(verdict.get('price_cost', 'N/A'))) if has_estimate_data or has_real_pricing else "⏳",
+            margin_display=f"{_t(verdict.get('margin', 'N/A'))}%" if has_estimate_data or has_real_pricing else "⏳",
+            pricing_source=_t(pricing_source),
+            pricing_formula=_t(pricing_formula),
+            action_1=_t(_clean_field(verdict.get('action_1'), 'Validar concepto con muestra de mercado')),
+            action_2=_t(_clean_field(verdict.get('action_2'), 'Desarrollar MVP con diferenciadores clave')),
+            action_3=_t(_clean_field(verdict.get('action_3'), 'Lanzar campaña piloto en mercado objetivo')),
+            risk_matrix_html=self._render_risk_matrix(g_data),
+            risk_level=_t(g_data.get('risk_level', 'MEDIUM')),
+            compliance_score=_t(g_data.get('compliance_score', 75)),
+            compliance_rows=compliance_rows,
+            security_protocol=_t(g_data.get('security_protocol', 'Estándar')),
+            price_tiers_html=self._render_price_tiers(price_tiers, price_range_display, price_median_display, prices_list),
+            pain_points_html=self._render_pain_points(st_data),
+            roadmap_html=roadmap_html,
+            buyer_personas_html=self._render_detailed_buyer_personas(buyer_personas),
+            reviews_analysis_html=self._render_reviews_analysis(reviews_analysis, top_10_list_for_pricing),
+            amazon_fees_html=self._render_amazon_fees(amazon_fees, price_median),
+            three_scenarios_html=self._render_three_scenarios(m_data),
+            year=now.year,
+            script_html=script_html,
+        ))
 
-        static_reports_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "reports")
-        os.makedirs(static_reports_dir, exist_ok=True)
         filename = f"report_{report_id}.html"
-        filepath = os.path.join(static_reports_dir, filename)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html_report)
+        gz_path = str(_STATIC_REPORTS_DIR / f"{filename}.gz")
+        # Se guarda comprimido (el HTML repite estilos inline y comprime ~10x);
+        # el gateway lo sirve con Content-Encoding: gzip bajo la misma URL .html
+        # Se escribe por fragmentos (literales del template y secciones ya renderizadas):
+        # el cuerpo nunca se une en un único string antes de comprimirse.
+        # Modo binario: cada bloque se codifica una vez, sin pasar por el TextIOWrapper
+        _write_gz_atomic(gz_path, report_parts)
         
         # PERSISTENCE
-        report_record = {
+        report_record = self._report_record(report_id, niche_title, verdict, now, f"/dashboard/reports/{filename}")
+        _io_pool.submit(self._save_report, report_record)
+
+        # El cache guarda solo metadatos; el HTML vive en el .gz y se materializa bajo demanda
+        result = { "id": report_id, "pdf_url": report_record["metadata"]["report_url"], "html_content": None }
+        _report_cache_put(cache_key, gz_path, result)
+        if include_html:
+            result["html_content"] = "".join(report_parts)
+        return result
+
+    def _report_record(self, report_id: str, niche_title: str, verdict: dict, now, report_url) -> dict:
+        """Registro de Firestore del dossier (report_url es None en dry run)."""
+        return {
             "id": report_id,
             "type": "nexus_final_report",
-            "metadata": { "title": niche_title, "report_url": f"/dashboard/reports/{filename}" },
-            "intel_summary": { "verdict": verdict }, # Added for recursive intelligence
-            "timestamp": timestamp_now()
+            "metadata": { "title": niche_title, "report_url": report_url },
+            # Added for recursive intelligence. Round-trip JSON: snapshot independiente del dict
+            # del strategist (el write corre en otro hilo) y solo tipos nativos para Firestore.
+            "intel_summary": json.loads(json.dumps({ "verdict": verdict }, default=str)),
+            "timestamp": now
         }
-        self._save_report(report_record)
-
-        return { "id": report_id, "pdf_url": report_record["metadata"]["report_url"], "html_content": html_report }
 
     def _save_report(self, data: dict):
         if not self.db: return
-        try: self.db.collection("reports").document(data["id"]).set(data)
-        except: pass
+        try:
+            _FIRESTORE_RETRY(self.db.collection("reports").document(data["id"]).set)(data)
+        except gapi_exceptions.RetryError as e:
+            logger.error("[NEXUS-7] Firestore no disponible tras reintentos; reporte %s no persistido: %s", data.get('id'), e.cause)
+        except gapi_exceptions.GoogleAPIError as e:
+            logger.error("[NEXUS-7] Firestore rechazó el reporte %s: %s", data.get('id'), e)
+        except Exception:
+            # Corre en _io_pool: nadie espera el future, así que el traceback va al log
+            logger.exception("[NEXUS-7] No se pudo persistir el reporte %s", data.get('id'))
 
     def _render_risk_matrix(self, g_data: dict) -> str:
         """Render Risk Matrix section from Guardian v2.0 data."""
@@ -2382,21 +2985,22 @@ class Nexus7Architect:
                     <div style="color:#991b1b; font-weight:700;">Este producto tiene bloqueadores críticos que impiden proceder sin acción.</div>
                 </div>
                 <ul style="margin-top:15px; color:#7f1d1d;">
-                    {"".join(f"<li>{r}</li>" for r in veto_reasons)}
+                    {"".join(f"<li>{_t(r)}</li>" for r in veto_reasons)}
                 </ul>
             </div>'''
         
-        rows = ""
+        row_parts = []
         for risk in risk_matrix:
-            impact_color = "#dc2626" if risk.get("impact") == "CRÍTICO" else ("#f59e0b" if risk.get("impact") == "ALTO" else "#3b82f6")
-            rows += f'''
+            impact_color = _RISK_IMPACT_COLORS.get(risk.get("impact"), "#3b82f6")
+            row_parts.append(f'''
             <tr>
                 <td style="font-weight:700;">{risk.get("risk", "")}</td>
                 <td>{risk.get("description", "")}</td>
                 <td><span style="background:{impact_color}; color:white; padding:4px 10px; border-radius:4px; font-size:0.7rem; font-weight:700;">{risk.get("impact", "")}</span></td>
                 <td style="font-size:0.85rem;">{risk.get("mitigation", "")}</td>
                 <td><span style="background:#e2e8f0; padding:4px 8px; border-radius:4px; font-size:0.7rem;">{risk.get("status", "")}</span></td>
-            </tr>'''
+            </tr>''')
+        rows = "".join(row_parts)
         
         return f'''{veto_banner}
         <table>
@@ -2419,12 +3023,11 @@ class Nexus7Architect:
         thresholds = m_data.get("success_thresholds", {})
         q4 = m_data.get("q4_logistics", {})
         
-        scenario_cards = ""
+        scenario_card_parts = []
         for key, s in scenarios.items():
-            bg_color = "#fef2f2" if key == "conservative" else ("#f0fdf4" if key == "aggressive" else "#eff6ff")
-            border_color = "#fca5a5" if key == "conservative" else ("#86efac" if key == "aggressive" else "#93c5fd")
+            bg_color, border_color = _SCENARIO_STYLE.get(key, _SCENARIO_STYLE_DEFAULT)
             proj = s.get("projections", {})
-            scenario_cards += f'''
+            scenario_card_parts.append(f'''
             <div style="background:{bg_color}; border:1px solid {border_color}; border-radius:12px; padding:20px;">
                 <h4 style="margin:0 0 10px 0; color:#1e293b;">{s.get("name", key)}</h4>
                 <p style="font-size:0.8rem; color:#64748b; margin-bottom:15px;">{s.get("description", "")}</p>
@@ -2437,7 +3040,8 @@ class Nexus7Architect:
                 <div style="margin-top:15px; text-align:right;">
                     <span style="background:#1e293b; color:white; padding:4px 10px; border-radius:6px; font-size:0.7rem;">{s.get("viability", "")}</span>
                 </div>
-            </div>'''
+            </div>''')
+        scenario_cards = "".join(scenario_card_parts)
         
         # TACoS Card
         tacos_status_color = "#22c55e" if "Saludable" in tacos.get("status", "") else ("#f59e0b" if "Monitorear" in tacos.get("status", "") else "#dc2626")
@@ -2454,16 +3058,17 @@ class Nexus7Architect:
         </div>'''
         
         # Success Thresholds
-        metrics_html = ""
+        metrics_parts = []
         for m in thresholds.get("metrics", []):
             status_color = "#22c55e" if "PASS" in m.get("status", "") else "#f59e0b"
-            metrics_html += f'''
+            metrics_parts.append(f'''
             <div style="display:flex; justify-content:space-between; padding:10px; border-bottom:1px solid #e2e8f0;">
                 <span>{m.get("metric", "")}</span>
                 <span>{m.get("threshold", "")}</span>
                 <span><strong>{m.get("current", "")}</strong></span>
                 <span style="color:{status_color}; font-weight:700;">{m.get("status", "")}</span>
-            </div>'''
+            </div>''')
+        metrics_html = "".join(metrics_parts)
         
         verdict_color = "#22c55e" if thresholds.get("overall_verdict") == "GO" else "#f59e0b"
         thresholds_card = f'''
@@ -2492,10 +3097,10 @@ class Nexus7Architect:
         
         # Pain Points bars
         categories = pain_data.get("categories", [])
-        pain_bars = ""
+        pain_bar_parts = []
         for cat in categories:
-            severity_color = "#dc2626" if cat.get("severity") == "ALTO" else ("#f59e0b" if cat.get("severity") == "MEDIO" else "#3b82f6")
-            pain_bars += f'''
+            severity_color = _PAIN_SEVERITY_COLORS.get(cat.get("severity"), "#3b82f6")
+            pain_bar_parts.append(f'''
             <div style="margin-bottom:15px;">
                 <div style="display:flex; justify-content:space-between; margin-bottom:5px;">
                     <span>{cat.get("icon", "")} {cat.get("category", "")}</span>
@@ -2505,10 +3110,11 @@ class Nexus7Architect:
                     <div style="background:{severity_color}; width:{cat.get('gap_percentage', 0)}%; height:100%;"></div>
                 </div>
                 <div style="font-size:0.7rem; color:#64748b; margin-top:3px;">{", ".join(cat.get("complaints", []))}</div>
-            </div>'''
+            </div>''')
+        pain_bars = "".join(pain_bar_parts)
         
         # USP Cards
-        usp_cards = ""
+        usp_card_parts = []
         for i, usp in enumerate(usp_data):
             # v2.1: Mapping from Strategist Schema (title, substance, pain_attack, details)
             # to Architect UI or handling native fields directly.
@@ -2519,14 +3125,15 @@ class Nexus7Architect:
             gap_addressed = usp.get("pain_attack") or usp.get("gap_addressed", "")
             icon = usp.get("icon", "🎯")
             
-            usp_cards += f'''
+            usp_card_parts.append(f'''
             <div style="background:white; border:1px solid #e2e8f0; border-radius:12px; padding:20px; text-align:center;">
                 <div style="background:#6366f1; color:white; width:35px; height:35px; border-radius:50%; display:flex; align-items:center; justify-content:center; margin:0 auto 12px; font-weight:800; font-size:1.1rem; box-shadow:0 4px 6px -1px rgba(99,102,241,0.3);">{icon if icon != "🎯" else angle}</div>
                 <h4 style="margin:0 0 8px 0; color:#1e293b; font-size:1rem;">{theme}</h4>
                 <p style="font-size:0.85rem; color:#6366f1; font-style:italic; margin-bottom:10px; font-weight:600;">"{headline}"</p>
                 <p style="font-size:0.75rem; color:#64748b; line-height:1.5;">{value_prop}</p>
                 <div style="margin-top:12px; font-size:0.65rem; background:#f0fdf4; color:#166534; padding:6px 12px; border-radius:8px; display:inline-block; font-weight:700; border:1px solid #bbf7d0;">🎯 ATACA: {gap_addressed}</div>
-            </div>'''
+            </div>''')
+        usp_cards = "".join(usp_card_parts)
         
         # Gap Check Banner
         gap_color = "#22c55e" if gap_check.get("threshold_met", False) else "#f59e0b"
@@ -2691,26 +3298,28 @@ class Nexus7Architect:
             rating_dist = {"5_star_pct": 65, "4_star_pct": 20, "3_star_pct": 8, "2_star_pct": 4, "1_star_pct": 3}
         
         # Build praises HTML
-        praises_html = ""
+        praise_parts = []
         for praise in top_praises[:5]:
-            praises_html += f'''
+            praise_parts.append(f'''
             <div style="background:#f0fdf4; border-left:4px solid #22c55e; padding:12px; border-radius:0 8px 8px 0; margin-bottom:10px;">
                 <div style="font-weight:700; color:#166534; margin-bottom:4px;">✅ {praise.get("theme", "N/A")}</div>
                 <div style="font-size:0.8rem; color:#15803d; font-style:italic;">"{praise.get("example_quote", "")}"</div>
                 <div style="font-size:0.65rem; color:#4ade80; margin-top:4px;">{praise.get("frequency", "Común")}</div>
             </div>
-            '''
+            ''')
+        praises_html = "".join(praise_parts)
         
         # Build complaints HTML
-        complaints_html = ""
+        complaint_parts = []
         for complaint in top_complaints[:5]:
-            complaints_html += f'''
+            complaint_parts.append(f'''
             <div style="background:#fef2f2; border-left:4px solid #dc2626; padding:12px; border-radius:0 8px 8px 0; margin-bottom:10px;">
                 <div style="font-weight:700; color:#991b1b; margin-bottom:4px;">⚠️ {complaint.get("theme", "N/A")}</div>
                 <div style="font-size:0.8rem; color:#dc2626; font-style:italic;">"{complaint.get("example_quote", "")}"</div>
                 <div style="background:#dcfce7; color:#166534; padding:4px 8px; border-radius:6px; display:inline-block; margin-top:8px; font-size:0.7rem; font-weight:600;">💡 {complaint.get("opportunity", "Oportunidad de mejora")}</div>
             </div>
-            '''
+            ''')
+        complaints_html = "".join(complaint_parts)
         
         # Fallback content if no data
         if not praises_html:
@@ -2790,9 +3399,10 @@ class Nexus7Architect:
             referral_fee_usd = total_fees_usd = net_after_fees = net_margin_actual = 0
         
         # Fee optimization tips HTML
-        tips_html = ""
+        tip_parts = []
         for i, tip in enumerate(fee_tips[:5]):
-            tips_html += f'<div style="display:flex; align-items:center; gap:10px; margin-bottom:8px;"><span style="background:#3b82f6; color:white; width:24px; height:24px; border-radius:50%; display:flex; align-items:center; justify-content:center; font-size:0.7rem; font-weight:700;">{i+1}</span><span style="font-size:0.85rem; color:#1e293b;">{tip}</span></div>'
+            tip_parts.append(f'<div style="display:flex; align-items:center; gap:10px; margin-bottom:8px;"><span style="background:#3b82f6; color:white; width:24px; height:24px; border-radius:50%; display:flex; align-items:center; justify-content:center; font-size:0.7rem; font-weight:700;">{i+1}</span><span style="font-size:0.85rem; color:#1e293b;">{tip}</span></div>')
+        tips_html = "".join(tip_parts)
         
         if not tips_html:
             tips_html = '''
@@ -2905,7 +3515,7 @@ class Nexus7Architect:
                 }
             ]
         
-        personas_html = ""
+        personas_parts = []
         colors = [
             ("#6366f1", "#eff6ff", "#4f46e5"),  # Indigo
             ("#22c55e", "#f0fdf4", "#16a34a"),  # Green
@@ -2922,19 +3532,21 @@ class Nexus7Architect:
             buying_behavior = persona.get("buying_behavior", {})
             
             # Build pain points chips
-            pain_chips = ""
+            pain_chip_parts = []
             for pain in psychographics.get("pain_points", [])[:3]:
-                pain_chips += f'<span style="background:{color_bg}; color:{color_dark}; padding:4px 10px; border-radius:20px; font-size:0.7rem; margin-right:5px; display:inline-block; margin-bottom:5px;">⚠️ {pain}</span>'
+                pain_chip_parts.append(f'<span style="background:{color_bg}; color:{color_dark}; padding:4px 10px; border-radius:20px; font-size:0.7rem; margin-right:5px; display:inline-block; margin-bottom:5px;">⚠️ {_t(pain)}</span>')
+            pain_chips = "".join(pain_chip_parts)
             
             # Build decision criteria chips
-            criteria_chips = ""
+            criteria_chip_parts = []
             for criteria in buying_behavior.get("decision_criteria", [])[:4]:
-                criteria_chips += f'<span style="background:{color_bg}; border:1px solid {color_main}33; color:{color_dark}; padding:4px 10px; border-radius:20px; font-size:0.65rem; margin-right:5px; display:inline-block; margin-bottom:5px;">✓ {criteria}</span>'
+                criteria_chip_parts.append(f'<span style="background:{color_bg}; border:1px solid {color_main}33; color:{color_dark}; padding:4px 10px; border-radius:20px; font-size:0.65rem; margin-right:5px; display:inline-block; margin-bottom:5px;">✓ {_t(criteria)}</span>')
+            criteria_chips = "".join(criteria_chip_parts)
             
             # Build research sources
-            research_sources = ", ".join(buying_behavior.get("research_sources", [])[:4])
+            research_sources = _t(", ".join(map(str, buying_behavior.get("research_sources", [])[:4])))
             
-            personas_html += f'''
+            personas_parts.append(f'''
             <div style="background:white; border:2px solid {color_main}33; border-radius:16px; padding:25px; margin-bottom:20px; position:relative; overflow:hidden;">
                 <!-- Decorative background -->
                 <div style="position:absolute; top:-20px; right:-20px; width:100px; height:100px; background:{color_main}08; border-radius:50%;"></div>
@@ -2943,18 +3555,18 @@ class Nexus7Architect:
                 <div style="display:flex; gap:20px; align-items:flex-start; margin-bottom:20px;">
                     <div style="width:70px; height:70px; background:linear-gradient(135deg, {color_main}, {color_dark}); border-radius:50%; display:flex; align-items:center; justify-content:center; font-size:2rem; flex-shrink:0;">{icon}</div>
                     <div style="flex:1;">
-                        <h3 style="margin:0 0 5px 0; color:{color_dark}; font-size:1.3rem;">{persona.get("name", f"Persona {i+1}")}</h3>
+                        <h3 style="margin:0 0 5px 0; color:{color_dark}; font-size:1.3rem;">{_t(persona.get("name", f"Persona {i+1}"))}</h3>
                         <div style="display:flex; gap:10px; flex-wrap:wrap;">
-                            <span style="background:{color_bg}; color:{color_dark}; padding:3px 10px; border-radius:12px; font-size:0.7rem; font-weight:600;">📅 {demographics.get("age_range", "25-45")}</span>
-                            <span style="background:{color_bg}; color:{color_dark}; padding:3px 10px; border-radius:12px; font-size:0.7rem; font-weight:600;">👤 {demographics.get("gender", "Equilibrado")}</span>
-                            <span style="background:{color_bg}; color:{color_dark}; padding:3px 10px; border-radius:12px; font-size:0.7rem; font-weight:600;">💰 {demographics.get("income_level", "Variable")}</span>
+                            <span style="background:{color_bg}; color:{color_dark}; padding:3px 10px; border-radius:12px; font-size:0.7rem; font-weight:600;">📅 {_t(demographics.get("age_range", "25-45"))}</span>
+                            <span style="background:{color_bg}; color:{color_dark}; padding:3px 10px; border-radius:12px; font-size:0.7rem; font-weight:600;">👤 {_t(demographics.get("gender", "Equilibrado"))}</span>
+                            <span style="background:{color_bg}; color:{color_dark}; padding:3px 10px; border-radius:12px; font-size:0.7rem; font-weight:600;">💰 {_t(demographics.get("income_level", "Variable"))}</span>
                         </div>
                     </div>
                 </div>
                 
                 <!-- Quote -->
                 <div style="background:{color_bg}; border-left:4px solid {color_main}; padding:15px; border-radius:0 12px 12px 0; margin-bottom:20px;">
-                    <div style="font-size:1rem; color:{color_dark}; font-style:italic; line-height:1.5;">"{persona.get("representative_quote", "")}"</div>
+                    <div style="font-size:1rem; color:{color_dark}; font-style:italic; line-height:1.5;">"{_t(persona.get("representative_quote", ""))}"</div>
                 </div>
                 
                 <!-- Two Column Layout -->
@@ -2963,10 +3575,10 @@ class Nexus7Architect:
                     <div>
                         <h4 style="margin:0 0 10px 0; color:#1e293b; font-size:0.85rem;">🧠 Psicografía</h4>
                         <div style="font-size:0.8rem; color:#475569; line-height:1.6; margin-bottom:10px;">
-                            <strong>Motivaciones:</strong> {psychographics.get("motivations", "N/A")}
+                            <strong>Motivaciones:</strong> {_t(psychographics.get("motivations", "N/A"))}
                         </div>
                         <div style="font-size:0.8rem; color:#475569; line-height:1.6; margin-bottom:10px;">
-                            <strong>Valora:</strong> {psychographics.get("values", "N/A")}
+                            <strong>Valora:</strong> {_t(psychographics.get("values", "N/A"))}
                         </div>
                         <div style="margin-top:12px;">
                             <div style="font-size:0.7rem; color:#64748b; font-weight:700; margin-bottom:6px;">PAIN POINTS:</div>
@@ -2981,10 +3593,10 @@ class Nexus7Architect:
                             <strong>Investiga en:</strong> {research_sources}
                         </div>
                         <div style="font-size:0.8rem; color:#475569; line-height:1.6; margin-bottom:5px;">
-                            <strong>Frecuencia:</strong> {buying_behavior.get("purchase_frequency", "Variable")}
+                            <strong>Frecuencia:</strong> {_t(buying_behavior.get("purchase_frequency", "Variable"))}
                         </div>
                         <div style="font-size:0.8rem; color:#475569; line-height:1.6; margin-bottom:10px;">
-                            <strong>Sensibilidad al precio:</strong> {buying_behavior.get("price_sensitivity", "Media")}
+                            <strong>Sensibilidad al precio:</strong> {_t(buying_behavior.get("price_sensitivity", "Media"))}
                         </div>
                         <div style="margin-top:12px;">
                             <div style="font-size:0.7rem; color:#64748b; font-weight:700; margin-bottom:6px;">CRITERIOS DE DECISIÓN:</div>
@@ -2993,7 +3605,8 @@ class Nexus7Architect:
                     </div>
                 </div>
             </div>
-            '''
+            ''')
+        personas_html = "".join(personas_parts)
         
         return personas_html
 
@@ -3088,17 +3701,28 @@ class Nexus7Architect:
         Generates a 2-page Executive Decision Brief.
         MARKET-FIRST APPROACH: Opportunity → Space → Differentiator → Risks → Financials
         """
-        logger.info(f"[{self.role}] Generating Executive Brief (2-Page Market-First)...")
+        # Igual que el dossier: render + escritura en un hilo, fuera del event loop
+        return await asyncio.to_thread(self._render_brief, full_data, full_report_id)
+
+    def _render_brief(self, full_data: dict, full_report_id: str = None) -> dict:
+        logger.info("[%s] Generating Executive Brief (2-Page Market-First)...", self.role)
+
+        # Mismo cache que el dossier: mismo full_data + mismo dossier enlazado -> mismo brief
+        cache_key = _report_cache_key(full_data)
+        if cache_key is not None:
+            cache_key = f"brief:{full_report_id}:{cache_key}"
+        cached = _report_cache_get(cache_key)
+        if cached is not None:
+            _, result = cached
+            logger.info("[%s] Cache hit — reutilizando brief %s", self.role, result['brief_id'])
+            return result
         
         brief_id = generate_id()
+        # Sello de tiempo formateado una sola vez (cabecera de página 2 y footer)
+        now = str(timestamp_now())
         
         # Extract data from all agents
-        i_data = full_data.get("integrator", {})
-        s_data = full_data.get("scout", {})
-        st_data = full_data.get("strategist", {})
-        m_data = full_data.get("mathematician", {})
-        p_data = full_data.get("senior_partner", {})
-        g_data = full_data.get("guardian", {})
+        s_data, i_data, st_data, m_data, p_data, g_data = _agent_sections(full_data)
         
         # Calculate Confidence Score
         confidence = self._calculate_confidence_score(full_data)
@@ -3285,12 +3909,7 @@ class Nexus7Architect:
         exec_summary = p_data.get("executive_summary", "Oportunidad de mercado en evaluación.")
         
         # Convert markdown **bold** to HTML <strong> and newlines to <br>
-        _parts = exec_summary.split("**")
-        exec_summary = "".join(
-            f"<strong>{_p}</strong>" if _i % 2 == 1 else _p
-            for _i, _p in enumerate(_parts)
-        )
-        exec_summary = exec_summary.replace("\n", "<br>")
+        exec_summary = _md_bold(exec_summary).replace("\n", "<br>")
         
         # ═══════════════════════════════════════════════════════════════════
         # SECTION 4: RISK ANALYSIS
@@ -3450,14 +4069,14 @@ class Nexus7Architect:
         # ═══════════════════════════════════════════════════════════════════
         
         # Pain Points Cards (expanded)
-        pain_html = ""
+        pain_parts = []
         for pp in top_pains[:5]:
             importance = pp.get("importance", 8)
             satisfaction = pp.get("satisfaction", 4)
             gap = importance - satisfaction
             gap_color = "#dc2626" if gap > 5 else "#f59e0b" if gap > 3 else "#16a34a"
             bar_width = min(100, gap * 10)
-            pain_html += f'''
+            pain_parts.append(f'''
             <div style="background:white; border:1px solid #e2e8f0; border-radius:10px; padding:12px; margin-bottom:8px;">
                 <div style="display:flex; justify-content:space-between; align-items:center;">
                     <div style="font-weight:600; color:#1e293b; font-size:0.85rem; flex:1;">😤 {pp.get("pain", "")}</div>
@@ -3469,20 +4088,22 @@ class Nexus7Architect:
                     </div>
                     <span style="font-size:0.65rem; color:#64748b;">Imp: {importance} | Sat: {satisfaction}</span>
                 </div>
-            </div>'''
+            </div>''')
+        pain_html = "".join(pain_parts)
         
         # Pain Keywords
-        keywords_html = ""
+        keywords_parts = []
         for kw in pain_keywords[:4]:
             if isinstance(kw, dict):
-                keywords_html += f'''
+                keywords_parts.append(f'''
                 <div style="background:#eff6ff; padding:6px 10px; border-radius:6px; font-size:0.7rem;">
                     <span style="font-weight:600; color:#1e40af;">{kw.get("keyword", "")}</span>
                     <span style="color:#64748b; margin-left:5px;">({kw.get("volume", "Med")})</span>
-                </div>'''
+                </div>''')
+        keywords_html = "".join(keywords_parts)
         
         # Competitors Table (expanded with ASIN)
-        comp_rows = ""
+        comp_row_parts = []
         for i, c in enumerate(top_competitors[:5], 1):
             rating = c.get("rating", 4.0)
             reviews = c.get("reviews", 0)
@@ -3492,7 +4113,7 @@ class Nexus7Architect:
             # Get ASIN/SKU and full product name from CSV data
             asin = c.get("asin", c.get("sku", "N/A"))
             product_name = c.get("title", c.get("name", ""))
-            comp_rows += f'''
+            comp_row_parts.append(f'''
             <tr style="border-bottom:1px solid #e2e8f0;">
                 <td style="padding:8px; font-weight:600; color:#1e293b; font-size:0.75rem;">
                     {i}. {product_name}
@@ -3503,21 +4124,23 @@ class Nexus7Architect:
                 <td style="padding:8px; text-align:center; font-size:0.75rem; font-weight:600;">${price}</td>
                 <td style="padding:8px; font-size:0.7rem; color:#dc2626;">⚠️ {vuln}</td>
                 <td style="padding:8px; font-size:0.7rem; color:#16a34a;">🎯 {gap}</td>
-            </tr>'''
+            </tr>''')
+        comp_rows = "".join(comp_row_parts)
 
         
         # Market Share Chart (simplified bars)
-        market_bars = ""
+        market_bar_parts = []
         for ms in market_share[:4]:
             share = ms.get("share", 0)
-            market_bars += f'''
+            market_bar_parts.append(f'''
             <div style="display:flex; align-items:center; gap:8px; margin-bottom:4px;">
                 <span style="width:80px; font-size:0.7rem; color:#64748b; text-align:right; overflow-wrap:break-word;">{ms.get("brand", "")}</span>
                 <div style="flex:1; height:12px; background:#e2e8f0; border-radius:6px; overflow:hidden;">
                     <div style="width:{share}%; height:100%; background:linear-gradient(90deg, #3b82f6, #8b5cf6);"></div>
                 </div>
                 <span style="font-size:0.7rem; font-weight:700; color:#1e293b; width:35px;">{share}%</span>
-            </div>'''
+            </div>''')
+        market_bars = "".join(market_bar_parts)
         
         # ERRC Grid (full)
         errc_html = ""
@@ -3543,17 +4166,18 @@ class Nexus7Architect:
             </div>'''
         
         # Risk Cards
-        risk_html = ""
+        risk_parts = []
         for r in risk_factors[:4]:
             rc = risk_color(r.get("severity", "Bajo"))
-            risk_html += f'''
+            risk_parts.append(f'''
             <div style="display:flex; align-items:flex-start; gap:10px; padding:10px; background:{rc["bg"]}; border-radius:8px; margin-bottom:6px;">
                 <span style="font-size:1rem;">{rc["icon"]}</span>
                 <div style="flex:1;">
                     <div style="font-weight:600; color:{rc["color"]}; font-size:0.8rem;">{r.get("factor", "")[:60]}</div>
                     <div style="font-size:0.7rem; color:#64748b; margin-top:2px;">💡 {r.get("mitigation", "En evaluación")[:50]}</div>
                 </div>
-            </div>'''
+            </div>''')
+        risk_html = "".join(risk_parts)
         
         # Scenario Cards
         def scenario_card(name, data, icon, color):
@@ -3578,29 +4202,28 @@ class Nexus7Architect:
         </div>'''
         
         # Sources
-        sources_html = ""
+        sources_parts = []
         for src in source_metadata[:4]:
             src_type = src.get("type", "doc")
             icon = "📄" if src_type == "pdf" else "📊" if src_type == "csv" else "🔬"
-            sources_html += f'''
+            sources_parts.append(f'''
             <div style="display:flex; align-items:center; gap:6px; padding:4px 8px; background:#f8fafc; border-radius:4px; font-size:0.65rem; color:#64748b;">
                 {icon} {src.get("name", "Fuente")[:25]}
-            </div>'''
+            </div>''')
+        sources_html = "".join(sources_parts)
         
         # Next Steps
-        steps_html = ""
+        steps_parts = []
         for i, step in enumerate(next_steps[:4], 1):
-            steps_html += f'''
+            steps_parts.append(f'''
             <div style="display:flex; align-items:center; gap:8px; padding:8px 0; border-bottom:1px dashed #e2e8f0;">
                 <span style="background:#0f172a; color:white; width:20px; height:20px; border-radius:50%; display:flex; align-items:center; justify-content:center; font-size:0.65rem; font-weight:700;">{i}</span>
                 <span style="font-size:0.8rem; color:#334155;">{step}</span>
-            </div>'''
+            </div>''')
+        steps_html = "".join(steps_parts)
         
         # White Space Topics HTML
-        white_space_html = ""
-        for topic in white_space_topics[:5]:
-            white_space_html += f'''
-            <span style="background:#fef3c7; color:#92400e; padding:5px 10px; border-radius:12px; font-size:0.7rem; font-weight:600; margin:3px; display:inline-block;">🔍 {topic}</span>'''
+        white_space_html = "".join(_BRIEF_WHITE_SPACE_CHIP_TPL.substitute(text=_t(topic)) for topic in white_space_topics[:5])
         
         # Cultural Vibe HTML
         cultural_vibe_html = ""
@@ -3612,34 +4235,37 @@ class Nexus7Architect:
             </div>'''
         
         # Competitor Gaps HTML
-        comp_gaps_html = ""
+        comp_gaps_parts = []
         for gap in competitor_gaps[:3]:
-            comp_gaps_html += f'''
+            comp_gaps_parts.append(f'''
             <div style="background:#fef2f2; border-left:3px solid #dc2626; padding:8px 10px; margin-bottom:6px; border-radius:0 6px 6px 0;">
-                <div style="font-size:0.7rem; font-weight:700; color:#dc2626;">⚠️ {gap.get("competitor", "")} ignora:</div>
-                <div style="font-size:0.7rem; color:#7f1d1d;">{gap.get("ignored_issue", "")}</div>
-                <div style="font-size:0.65rem; color:#64748b; margin-top:2px;">"—{gap.get("user_frustration", "")}"</div>
-            </div>'''
+                <div style="font-size:0.7rem; font-weight:700; color:#dc2626;">⚠️ {_t(gap.get("competitor", ""))} ignora:</div>
+                <div style="font-size:0.7rem; color:#7f1d1d;">{_t(gap.get("ignored_issue", ""))}</div>
+                <div style="font-size:0.65rem; color:#64748b; margin-top:2px;">"—{_t(gap.get("user_frustration", ""))}"</div>
+            </div>''')
+        comp_gaps_html = "".join(comp_gaps_parts)
         
         # GaryVee Content HTML
-        garyvee_html = ""
+        garyvee_parts = []
         for g in garyvee_content[:3]:
-            garyvee_html += f'''
+            garyvee_parts.append(f'''
             <div style="background:#fef3c7; border:1px solid #fcd34d; padding:10px; border-radius:8px; margin-bottom:6px;">
                 <div style="font-size:0.7rem; font-weight:700; color:#b45309;">🔥 {g.get("idea", "")}</div>
                 <div style="font-size:0.65rem; color:#78350f; margin-top:3px;">📺 {g.get("format", "")} | Hook: "{g.get("hook", "")}"</div>
                 <div style="font-size:0.6rem; color:#92400e; margin-top:2px;">💢 Trigger: {g.get("emotional_trigger", "")}</div>
-            </div>'''
+            </div>''')
+        garyvee_html = "".join(garyvee_parts)
         
         # Patel Content HTML
-        patel_html = ""
+        patel_parts = []
         for p in patel_content[:3]:
-            patel_html += f'''
+            patel_parts.append(f'''
             <div style="background:#eff6ff; border:1px solid #bfdbfe; padding:10px; border-radius:8px; margin-bottom:6px;">
                 <div style="font-size:0.7rem; font-weight:700; color:#1e40af;">📈 {p.get("idea", "")}</div>
                 <div style="font-size:0.65rem; color:#1d4ed8; margin-top:3px;">🎯 KW: {p.get("target_keyword", "")} ({p.get("search_intent", "")})</div>
                 <div style="font-size:0.6rem; color:#3b82f6; margin-top:2px;">📊 Gap: {p.get("content_gap", "")}</div>
-            </div>'''
+            </div>''')
+        patel_html = "".join(patel_parts)
         
         # Social Insights HTML (TikTok, Reddit, YouTube)
         social_insights_html = ""
@@ -3665,95 +4291,12 @@ class Nexus7Architect:
         # ═══════════════════════════════════════════════════════════════════
 
         
-        brief_html = f'''<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Executive Brief: {anchor}</title>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap" rel="stylesheet">
-    <style>
-        :root {{ --primary: #0f172a; --accent: #3b82f6; }}
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Inter', sans-serif; background: #f1f5f9; padding: 20px; color: var(--primary); -webkit-font-smoothing: antialiased; }}
-        
-        /* Container setup for A4 at 96dpi (approx 794px) */
-        .brief {{ width: 794px; margin: 0 auto; background: none; }}
-        
-        .page {{ 
-            width: 794px;
-            min-height: 1122px; /* A4 Height */
-            background: white; 
-            border-radius: 0; 
-            box-shadow: 0 10px 40px -10px rgba(0,0,0,0.1); 
-            overflow: visible; 
-            margin-bottom: 30px; 
-            position: relative;
-        }}
-        
-        .header {{ background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: white; padding: 20px 30px; position: relative; }}
-        .header::after {{ content: ''; position: absolute; bottom: 0; left: 0; right: 0; height: 3px; background: linear-gradient(90deg, #3b82f6, #8b5cf6, #ec4899); }}
-        
-        .content {{ padding: 25px 30px; }}
-        
-        /* Layout Utilities */
-        .section {{ margin-bottom: 25px; page-break-inside: avoid; }}
-        .section-title {{ font-size: 0.7rem; font-weight: 800; color: #64748b; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 12px; display: flex; align-items: center; gap: 6px; border-bottom: 2px solid #f1f5f9; padding-bottom: 6px; }}
-        .two-col {{ display: grid; grid-template-columns: 1.25fr 1fr; gap: 25px; }}
-        .three-col {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px; }}
-        
-        /* Components */
-        .card {{ background: #f8fafc; border: 1px solid #e2e8f0; border-radius: 12px; padding: 16px; page-break-inside: avoid; }}
-        
-        .verdict-card {{ background: {verdict["bg"]}; border: 2px solid {verdict["border"]}; border-radius: 12px; padding: 20px; display: flex; align-items: center; gap: 20px; margin-bottom: 25px; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.05); page-break-inside: avoid; }}
-        .verdict-icon {{ font-size: 2.5rem; }}
-        .verdict-status {{ font-size: 1.5rem; font-weight: 800; color: {verdict["color"]}; letter-spacing: -0.5px; }}
-        .verdict-summary {{ font-size: 0.85rem; color: #475569; margin-top: 4px; line-height: 1.4; }}
-        
-        .confidence {{ background: white; border: 1px solid #e2e8f0; border-radius: 8px; padding: 10px 18px; text-align: center; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }}
-        .confidence-value {{ font-size: 1.4rem; font-weight: 800; color: var(--accent); }}
-        .confidence-label {{ font-size: 0.6rem; color: #64748b; text-transform: uppercase; font-weight: 700; }}
-        
-        .stat-card {{ text-align: center; padding: 15px; background: white; border: 1px solid #e2e8f0; border-radius: 12px; box-shadow: 0 2px 4px rgba(0,0,0,0.02); page-break-inside: avoid; }}
-        .stat-value {{ font-size: 1.6rem; font-weight: 800; letter-spacing: -0.5px; }}
-        .stat-label {{ font-size: 0.6rem; color: #64748b; text-transform: uppercase; font-weight: 700; margin-top: 4px; }}
-    
-        .consumer-quote {{ background: linear-gradient(135deg, #fef3c7 0%, #fef9c3 100%); border-left: 4px solid #f59e0b; padding: 12px 16px; border-radius: 0 8px 8px 0; font-style: italic; font-size: 0.85rem; color: #92400e; margin: 12px 0; line-height: 1.5; page-break-inside: avoid; }}
-        .lightning {{ background: linear-gradient(135deg, #fff7ed 0%, #ffedd5 100%); border: 1px solid #fed7aa; border-radius: 12px; padding: 14px; margin-top: 15px; page-break-inside: avoid; }}
-        .lightning-title {{ font-size: 0.75rem; font-weight: 800; color: #ea580c; display: flex; align-items: center; gap: 6px; }}
-        
-        .table {{ width: 100%; border-collapse: separate; border-spacing: 0; font-size: 0.8rem; }}
-        .table th {{ background: #f8fafc; padding: 10px; text-align: left; font-size: 0.65rem; font-weight: 700; color: #64748b; text-transform: uppercase; border-bottom: 2px solid #e2e8f0; }}
-        .table td {{ padding: 10px; border-bottom: 1px solid #f1f5f9; vertical-align: middle; }}
-        .table tr:last-child td {{ border-bottom: none; }}
-        
-        .page-break {{ page-break-before: always; }}
-        
-        .footer {{ background: #f8fafc; border-top: 1px solid #e2e8f0; padding: 15px 30px; display: flex; justify-content: space-between; align-items: center; height: 60px; }}
-        .footer-link {{ display: inline-flex; align-items: center; gap: 6px; background: var(--accent); color: white; padding: 8px 16px; border-radius: 8px; text-decoration: none; font-size: 0.8rem; font-weight: 600; transition: all 0.2s; box-shadow: 0 4px 6px -1px rgba(59, 130, 246, 0.3); }}
-        .footer-link:hover {{ transform: translateY(-1px); box-shadow: 0 6px 8px -1px rgba(59, 130, 246, 0.4); }}
-
-        /* Print Override */
-        @media print {{ 
-            body {{ padding: 0; background: white; -webkit-print-color-adjust: exact; print-color-adjust: exact; }} 
-            .brief {{ width: 100%; margin: 0; box-shadow: none; }}
-            .page {{ 
-                box-shadow: none; 
-                margin: 0; 
-                border: none;
-                border-radius: 0;
-                width: 100%; 
-                min-height: 297mm; 
-                height: 297mm;
-                page-break-after: always;
-            }}
-            .page:last-child {{ page-break-after: avoid; }}
-            .footer-link {{ display: none !important; }}
-            ::-webkit-scrollbar {{ display: none; }}
-        }}
-    </style>
-</head>
-<body>
+        brief_html = _BRIEF_HEAD.substitute(
+            anchor=anchor,
+            verdict_bg=verdict["bg"],
+            verdict_border=verdict["border"],
+            verdict_color=verdict["color"],
+        ) + f'''<body>
     <div class="brief">
         <!-- ═══════════════ PAGE 1 ═══════════════ -->
         <div class="page">
@@ -3765,7 +4308,7 @@ class Nexus7Architect:
                         <div style="font-size: 0.7rem; color: #cbd5e1; margin-top: 4px; font-style: italic;">Análisis Integral de Mercado, Competencia y Oportunidad Estratégica</div>
                     </div>
                     <div style="text-align:right;">
-                        <div style="font-size: 0.65rem; color: #94a3b8;">{timestamp_now()}</div>
+                        <div style="font-size: 0.65rem; color: #94a3b8;">{now}</div>
                         <div style="font-size: 0.6rem; color: #64748b;">{source_count} fuentes • Página 1/2</div>
                     </div>
                 </div>
@@ -3984,7 +4527,7 @@ class Nexus7Architect:
             </div>
             
             <div class="footer">
-                <div style="font-size: 0.65rem; color: #94a3b8;">NEXUS-360 Intelligence Platform • {timestamp_now()}</div>
+                <div style="font-size: 0.65rem; color: #94a3b8;">NEXUS-360 Intelligence Platform • {now}</div>
                 <div style="display:flex; gap:10px; align-items:center;">
                     <button id="pdfDownloadBtn" onclick="downloadPDF()" class="footer-link" style="background:#8b5cf6; border:none; cursor:pointer;">
                         📥 Descargar PDF
@@ -3995,83 +4538,18 @@ class Nexus7Architect:
         </div>
     </div>
     
-    <!-- PDF Generation Script -->
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.10.1/html2pdf.bundle.min.js"></script>
-    <script>
-        async function downloadPDF() {{
-            const btn = document.querySelector('#pdfDownloadBtn');
-            if (!btn) return;
-            const originalText = btn.innerHTML;
-            btn.innerHTML = '⏳ Generando PDF...';
-            btn.disabled = true;
-            btn.style.opacity = '0.7';
-            
-            const element = document.querySelector('.brief');
-            const briefTitle = document.title.replace('Executive Brief: ', '').trim();
-            // Sanitize title: remove special chars, replace spaces with underscores
-            const safeTitle = briefTitle.replace(/[^a-zA-Z0-9 ]/g, '').replace(/ +/g, '_').substring(0, 50) || 'Reporte';
-            const timestamp = new Date().toISOString().slice(0,10);
-            const filename = 'Executive_Brief_' + safeTitle + '_' + timestamp + '.pdf';
-            
-            // Hide buttons during PDF generation
-            const buttons = document.querySelectorAll('.footer-link');
-            buttons.forEach(b => b.style.visibility = 'hidden');
-            
-            try {{
-                const opt = {{
-                    margin: 0,
-                    filename: filename,
-                    image: {{ type: 'jpeg', quality: 0.98 }},
-                    html2canvas: {{ 
-                        scale: 2,
-                        useCORS: true, 
-                        logging: false,
-                        letterRendering: true,
-                        scrollY: 0
-                    }},
-                    jsPDF: {{ 
-                        unit: 'mm', 
-                        format: 'a4', 
-                        orientation: 'portrait',
-                        compress: true
-                    }},
-                    pagebreak: {{ 
-                        mode: ['css', 'legacy'],
-                        before: '.page-break'
-                    }}
-                }};
-                
-                await html2pdf().set(opt).from(element).save();
-                
-                btn.innerHTML = '✅ Descargado!';
-                setTimeout(() => {{ btn.innerHTML = originalText; }}, 2000);
-            }} catch (error) {{
-                console.error('PDF Error:', error);
-                btn.innerHTML = '❌ Error - Usa Ctrl+P';
-                alert('Error al generar PDF automáticamente. Usa Ctrl+P (o Cmd+P en Mac) para imprimir a PDF.');
-                setTimeout(() => {{ btn.innerHTML = originalText; }}, 3000);
-            }} finally {{
-                buttons.forEach(b => b.style.visibility = 'visible');
-                btn.disabled = false;
-                btn.style.opacity = '1';
-            }}
-        }}
-    </script>
-</body>
-</html>'''
+''' + _BRIEF_TAIL
 
 
         # Save the brief
         brief_path = f"/dashboard/reports/brief_{brief_id}.html"
-        output_dir = os.path.join(os.path.dirname(__file__), '..', 'static', 'reports')
-        os.makedirs(output_dir, exist_ok=True)
+        # Igual que el dossier: se guarda pre-comprimido y el gateway lo sirve bajo la URL .html
+        gz_path = str(_STATIC_REPORTS_DIR / f"brief_{brief_id}.html.gz")
+        _write_gz_atomic(gz_path, (brief_html,))
         
-        with open(os.path.join(output_dir, f"brief_{brief_id}.html"), 'w', encoding='utf-8') as f:
-            f.write(brief_html)
+        logger.info("[%s] ✅ Executive Brief Generated (2-Page): %s", self.role, brief_path)
         
-        logger.info(f"[{self.role}] ✅ Executive Brief Generated (2-Page): {brief_path}")
-        
-        return {
+        result = {
             "brief_id": brief_id,
             "brief_path": brief_path,
             "pdf_url": brief_path,  # Added to satisfy main.py expectation
@@ -4079,3 +4557,5 @@ class Nexus7Architect:
             "confidence": confidence,
             "full_report_id": full_report_id
         }
+        _report_cache_put(cache_key, gz_path, result)
+        return result